@@ -0,0 +1,80 @@
+"""Bytes-on-wire and CPU cost of response compression per endpoint.
+
+Fetches each endpoint uncompressed from a running API, then measures the
+compressed size and compressor CPU time for every supported encoding.
+
+    cd api
+    python -m benchmarks.compression --base-url http://localhost:8000 --room-id 1 --user-id 1
+"""
+import argparse
+import json
+import time
+
+import httpx
+
+from src.services.compression import compress_body, supported_encodings
+
+ENDPOINTS = [
+    "/api/expenses/room/{room_id}",
+    "/api/chores/by-user/{user_id}",
+    "/api/chores/by-room/{room_id}",
+    "/api/chores/room/{room_id}/with-completion-status",
+    "/api/announcements/room/{room_id}",
+]
+
+
+def measure(body: bytes, encoding: str, iterations: int):
+    start = time.process_time()
+    for _ in range(iterations):
+        compressed = compress_body(body, encoding)
+    cpu_us = (time.process_time() - start) / iterations * 1_000_000
+    return len(compressed), cpu_us
+
+
+def run(base_url: str, room_id: int, user_id: int, iterations: int):
+    results = []
+    with httpx.Client(base_url=base_url, headers={"accept-encoding": "identity"}) as client:
+        for template in ENDPOINTS:
+            path = template.format(room_id=room_id, user_id=user_id)
+            response = client.get(path)
+            body = response.content
+            row = {"endpoint": template, "status": response.status_code, "identity_bytes": len(body)}
+            for encoding in supported_encodings():
+                size, cpu_us = measure(body, encoding, iterations)
+                row[f"{encoding}_bytes"] = size
+                row[f"{encoding}_ratio"] = round(size / len(body), 3) if body else None
+                row[f"{encoding}_cpu_us"] = round(cpu_us, 1)
+            results.append(row)
+    return results
+
+
+def print_table(results):
+    encodings = supported_encodings()
+    header = f"{'endpoint':<52} {'identity':>10}" + "".join(f" {enc + ' bytes':>12} {enc + ' us':>10}" for enc in encodings)
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        line = f"{row['endpoint']:<52} {row['identity_bytes']:>10}"
+        for enc in encodings:
+            line += f" {row[enc + '_bytes']:>12} {row[enc + '_cpu_us']:>10}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--room-id", type=int, default=1)
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.base_url, args.room_id, args.user_id, args.iterations)
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,566 @@
+"""Synthetic DormDuty database generator, streamed into Postgres with COPY.
+
+Fills every table in schema.sql with statistically shaped data: mostly
+small rooms with a long tail, a per-room activity level (lognormal) that
+drives completions, expenses and announcements, chores whose completion
+rate follows their frequency, activity weighted towards recent months,
+approval flows with pending, approved and rejected completions, expense
+splits that are mostly settled after a month, and daily cleaning checks.
+
+Rooms are generated in shards by a pool of worker processes. Each worker
+builds one shard in memory, then streams it with one COPY per table in
+foreign-key order inside a single transaction, so memory stays bounded by
+the shard size and foreign keys are enforced as rows arrive. Row ids are
+assigned from counters shared between the workers, and secondary indexes
+are dropped during the load and rebuilt in parallel afterwards.
+
+Loading drops and recreates the public schema, so it refuses any database
+that already holds tables unless an earlier run marked it as a benchmark
+database (see benchmarks.postgres.claim_scratch_database).
+
+    cd api
+    python -m benchmarks.datagen postgresql://localhost/dormduty_bench --scale 10 --workers 8
+"""
+import argparse
+import multiprocessing
+import random
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import psycopg
+
+from benchmarks.postgres import claim_scratch_database
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "schema.sql"
+
+
+@dataclass
+class DatasetSize:
+    users: int = 50_000
+    rooms: int = 10_000
+    chores_per_room: int = 8
+    completions: int = 1_000_000
+    expenses: int = 200_000
+    announcements: int = 100_000
+    cleaning_days: int = 30
+
+    def scaled(self, factor: float) -> "DatasetSize":
+        """Multiply the population and activity counts by ``factor``; rooms keep the same shape."""
+        counts = {f.name: max(1, int(getattr(self, f.name) * factor)) for f in fields(self)}
+        counts["chores_per_room"] = self.chores_per_room
+        counts["cleaning_days"] = self.cleaning_days
+        return DatasetSize(**counts)
+
+
+# (label, share of chores, expected completions per week)
+FREQUENCIES = [
+    ("Daily", 20, 7.0),
+    ("Every Other Day", 8, 3.5),
+    ("Every 3 Days", 8, 2.3),
+    ("Weekly", 30, 1.0),
+    ("Every Other Week", 10, 0.5),
+    ("Every 4 Weeks", 6, 0.25),
+    ("Every 2 Months", 4, 0.12),
+    ("As Needed", 10, 0.5),
+    ("One Time", 4, 0.0),
+]
+ROOM_SIZES = [(2, 30), (3, 25), (4, 20), (5, 10), (6, 6), (8, 5), (12, 3), (20, 1)]
+CHORE_NAMES = ["Dishes", "Take out trash", "Vacuum", "Clean bathroom", "Laundry", "Groceries", "Recycling",
+               "Mop floors", "Wipe counters", "Water plants", "Clean fridge", "Dust shelves"]
+CHECKLIST_ITEMS = ["Make bed", "Clear desk", "Empty bin", "Sweep floor", "Tidy closet", "Wipe mirror",
+                   "Put away laundry", "Air out room"]
+EXPENSE_CATEGORIES = [("Groceries", 40), ("Utilities", 15), ("Household", 20), ("Internet", 5),
+                      ("Rent", 5), ("Takeout", 10), ("Other", 5)]
+EMOJIS = ["👍", "❤️", "😂", "🎉", "🙏", "😮"]
+SWAP_STATUSES = [("pending", 30), ("accepted", 40), ("rejected", 20), ("cancelled", 10)]
+INVITATION_STATUSES = [("pending", 30), ("accepted", 50), ("rejected", 10), ("expired", 10)]
+
+HISTORY_DAYS = 540
+
+# Column name -> table whose shard-local id the column holds (None: stored as-is).
+# Tables are listed in foreign-key order; the first column is the table's own id.
+TABLES: List[Tuple[str, List[Tuple[str, Optional[str]]]]] = [
+    ("room", [("room_id", "room"), ("room_code", None), ("created_by", None), ("name", None),
+              ("created_at", None), ("updated_at", None)]),
+    ("room_membership", [("membership_id", "room_membership"), ("user_id", None), ("room_id", "room"),
+                         ("role", None), ("joined_at", None), ("is_active", None)]),
+    ("chore", [("chore_id", "chore"), ("room_id", "room"), ("name", None), ("frequency", None),
+               ("day_of_week", None), ("timing", None), ("description", None), ("start_date", None),
+               ("last_completed", None), ("assigned_to", "room_membership"), ("approval_required", None),
+               ("photo_required", None), ("is_active", None), ("created_at", None), ("updated_at", None)]),
+    ("chore_assignment", [("assignment_id", "chore_assignment"), ("chore_id", "chore"),
+                          ("membership_id", "room_membership"), ("is_active", None), ("assigned_at", None)]),
+    ("chore_assignment_history", [("assignment_id", "chore_assignment_history"), ("chore_id", "chore"),
+                                  ("membership_id", "room_membership"), ("assigned_at", None),
+                                  ("completed_at", None), ("status", None)]),
+    ("chore_completion", [("completion_id", "chore_completion"), ("chore_id", "chore"),
+                          ("membership_id", "room_membership"), ("completed_at", None), ("photo_url", None),
+                          ("status", None), ("created_at", None)]),
+    ("chore_verification", [("verification_id", "chore_verification"), ("completion_id", "chore_completion"),
+                            ("verified_by", "room_membership"), ("verification_type", None), ("comment", None),
+                            ("verified_at", None)]),
+    ("chore_swap_request", [("swap_id", "chore_swap_request"), ("chore_id", "chore"),
+                            ("from_membership", "room_membership"), ("to_membership", "room_membership"),
+                            ("status", None), ("message", None), ("requested_at", None), ("responded_at", None)]),
+    ("expense", [("expense_id", "expense"), ("room_id", "room"), ("payer_membership_id", "room_membership"),
+                 ("amount", None), ("description", None), ("category", None), ("expense_date", None),
+                 ("created_at", None)]),
+    ("expense_split", [("split_id", "expense_split"), ("expense_id", "expense"),
+                       ("membership_id", "room_membership"), ("amount_owed", None), ("is_paid", None),
+                       ("paid_at", None)]),
+    ("announcement", [("announcement_id", "announcement"), ("room_id", "room"),
+                      ("created_by", "room_membership"), ("message", None), ("can_reply", None),
+                      ("created_at", None)]),
+    ("announcement_reaction", [("reaction_id", "announcement_reaction"), ("announcement_id", "announcement"),
+                               ("membership_id", "room_membership"), ("emoji", None), ("reacted_at", None)]),
+    ("announcement_reply", [("reply_id", "announcement_reply"), ("announcement_id", "announcement"),
+                            ("membership_id", "room_membership"), ("message", None), ("replied_at", None)]),
+    ("announcement_reply_reaction", [("reaction_id", "announcement_reply_reaction"),
+                                     ("reply_id", "announcement_reply"), ("membership_id", "room_membership"),
+                                     ("emoji", None), ("reacted_at", None)]),
+    ("announcement_read", [("announcement_id", "announcement"), ("membership_id", "room_membership"),
+                           ("read_at", None)]),
+    ("cleaning_checklist", [("checklist_item_id", "cleaning_checklist"), ("room_id", "room"), ("title", None),
+                            ("description", None), ("is_default", None)]),
+    ("cleaning_check_status", [("status_id", "cleaning_check_status"), ("checklist_item_id", "cleaning_checklist"),
+                               ("membership_id", "room_membership"), ("marked_date", None),
+                               ("is_completed", None), ("is_assigned", None), ("updated_at", None)]),
+    ("room_invitation", [("invitation_id", "room_invitation"), ("room_id", "room"), ("invited_by", None),
+                         ("invited_user_id", None), ("invited_email", None), ("invited_name", None),
+                         ("status", None), ("invitation_token", None), ("message", None), ("expires_at", None),
+                         ("created_at", None), ("responded_at", None)]),
+]
+# announcement_read has a composite key and no sequence
+SERIAL_TABLES = [table for table, columns in TABLES if table != "announcement_read"]
+
+
+def _text(value) -> str:
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _weighted(choices: Sequence[Tuple[object, float]]):
+    values = [value for value, _ in choices]
+    weights = [weight for _, weight in choices]
+    return values, weights
+
+
+_FREQUENCY_LABELS, _FREQUENCY_WEIGHTS = _weighted([(f, share) for f, share, _ in FREQUENCIES])
+_ROOM_SIZE_VALUES, _ROOM_SIZE_WEIGHTS = _weighted(ROOM_SIZES)
+_CATEGORY_VALUES, _CATEGORY_WEIGHTS = _weighted(EXPENSE_CATEGORIES)
+_SWAP_VALUES, _SWAP_WEIGHTS = _weighted(SWAP_STATUSES)
+_INVITATION_VALUES, _INVITATION_WEIGHTS = _weighted(INVITATION_STATUSES)
+
+
+class Shard:
+    """Rows for a range of rooms, with ids local to the shard (1..n per table)."""
+
+    def __init__(self):
+        self.rows: Dict[str, list] = {table: [] for table, _ in TABLES}
+
+    def add(self, table: str, *values) -> int:
+        rows = self.rows[table]
+        rows.append(values)
+        return len(rows)
+
+    def add_keyed(self, table: str, *values) -> int:
+        """Add a row whose first column is its own id, filled in from the local row number."""
+        rows = self.rows[table]
+        rows.append((len(rows) + 1,) + values)
+        return len(rows)
+
+
+def _recent(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    """A moment between start and end, weighted towards end."""
+    span = (end - start).total_seconds()
+    return end - timedelta(seconds=span * rng.random() ** 2)
+
+
+def _count(rng: random.Random, expected: float) -> int:
+    whole = int(expected)
+    return whole + (rng.random() < expected - whole)
+
+
+class RoomGenerator:
+    def __init__(self, size: DatasetSize, seed: int, now: datetime):
+        self.size = size
+        self.seed = seed
+        self.now = now
+        self.today = now.date()
+        # Per-room means; each room scales them by its activity level
+        self.completions_per_room = size.completions / size.rooms
+        self.expenses_per_room = size.expenses / size.rooms
+        self.announcements_per_room = size.announcements / size.rooms
+
+    def build(self, shard: Shard, room_number: int):
+        rng = random.Random(self.seed * 1_000_003 + room_number)
+        now = self.now
+        # lognormal(0, 1) has mean e^0.5: normalize so the totals match the targets
+        activity = rng.lognormvariate(0, 1) / 1.6487
+
+        room_size = rng.choices(_ROOM_SIZE_VALUES, _ROOM_SIZE_WEIGHTS)[0]
+        user_ids = rng.sample(range(1, self.size.users + 1), min(room_size, self.size.users))
+        created_at = now - timedelta(days=HISTORY_DAYS * rng.random() ** 1.5, seconds=rng.randrange(86400))
+
+        room = shard.add_keyed("room", f"R{room_number}", user_ids[0], f"Room {room_number}", created_at, created_at)
+
+        members = []  # (local membership id, joined_at, is_active)
+        for position, user_id in enumerate(user_ids):
+            joined_at = created_at if position == 0 else _recent(rng, created_at, now)
+            is_active = position == 0 or rng.random() > 0.05
+            membership = shard.add_keyed("room_membership", user_id, room, "admin" if position == 0 else "member",
+                                         joined_at, is_active)
+            members.append((membership, joined_at, is_active))
+        admin = members[0][0]
+        active = [m for m in members if m[2]]
+        active_ids = [m[0] for m in active]
+
+        chores = self._chores(shard, rng, room, created_at, active_ids)
+        self._completions(shard, rng, room, chores, active, admin, activity)
+        self._swaps(shard, rng, chores, active_ids)
+        self._expenses(shard, rng, room, created_at, active, activity)
+        self._announcements(shard, rng, room, created_at, active, activity)
+        self._cleaning(shard, rng, room, created_at, active_ids)
+        self._invitations(shard, rng, room, user_ids[0], created_at)
+
+    def _chores(self, shard: Shard, rng, room: int, created_at: datetime, active_ids: List[int]):
+        chores = []
+        count = max(1, round(rng.gauss(self.size.chores_per_room, self.size.chores_per_room / 3)))
+        for _ in range(count):
+            frequency = rng.choices(_FREQUENCY_LABELS, _FREQUENCY_WEIGHTS)[0]
+            chore_created = _recent(rng, created_at, created_at + (self.now - created_at) / 3)
+            assignees = rng.sample(active_ids, min(len(active_ids), rng.choice((1, 1, 1, 2))))
+            chores.append({
+                "created_at": chore_created,
+                "frequency": frequency,
+                "name": rng.choice(CHORE_NAMES),
+                "approval_required": rng.random() < 0.4,
+                "photo_required": rng.random() < 0.15,
+                "is_active": rng.random() > 0.05,
+                "assignees": assignees,
+                "last_completed": None,
+            })
+        # Chore rows are added after completions so last_completed is known
+        return chores
+
+    def _completions(self, shard: Shard, rng, room: int, chores: List[dict], active: list, admin: int,
+                     activity: float):
+        weights = [next(rate for label, _, rate in FREQUENCIES if label == chore["frequency"]) or 0.05
+                   for chore in chores]
+        total = _count(rng, self.completions_per_room * activity)
+        pending_window = self.now - timedelta(days=3)
+        completions = []
+        for index in rng.choices(range(len(chores)), weights, k=total) if chores else ():
+            chore = chores[index]
+            completed_by = rng.choice(chore["assignees"] or [m[0] for m in active])
+            completed_at = _recent(rng, chore["created_at"], self.now)
+            if chore["approval_required"] and completed_at > pending_window and rng.random() < 0.6:
+                status = "pending"
+            elif chore["approval_required"] and rng.random() < 0.05:
+                status = "rejected"
+            else:
+                status = "approved"
+            if status == "approved" and (chore["last_completed"] is None or completed_at > chore["last_completed"]):
+                chore["last_completed"] = completed_at
+            completions.append((index, completed_by, completed_at, status))
+
+        for chore in chores:
+            timing = f"{rng.randrange(7, 23):02d}:{rng.choice((0, 15, 30, 45)):02d}:00"
+            day_of_week = rng.randrange(7) if "Week" in chore["frequency"] else None
+            assigned_to = chore["assignees"][0] if chore["assignees"] else None
+            chore["id"] = shard.add_keyed(
+                "chore", room, chore["name"], chore["frequency"], day_of_week, timing, None,
+                chore["created_at"].date(), chore["last_completed"], assigned_to, chore["approval_required"],
+                chore["photo_required"], chore["is_active"], chore["created_at"], chore["created_at"],
+            )
+            for membership in chore["assignees"]:
+                shard.add_keyed("chore_assignment", chore["id"], membership, True, chore["created_at"])
+            assigned_at = chore["created_at"]
+            for _ in range(rng.randrange(4)):
+                membership = rng.choice(chore["assignees"] or [m[0] for m in active])
+                done_at = _recent(rng, assigned_at, self.now)
+                shard.add_keyed("chore_assignment_history", chore["id"], membership, assigned_at, done_at, "completed")
+                assigned_at = done_at
+
+        for index, completed_by, completed_at, status in completions:
+            chore = chores[index]
+            photo_url = f"https://photos.example.test/{rng.getrandbits(64):016x}.jpg" if chore["photo_required"] else None
+            completion = shard.add_keyed("chore_completion", chore["id"], completed_by, completed_at.replace(tzinfo=None),
+                                         photo_url, status, completed_at)
+            if status != "pending" and chore["approval_required"]:
+                verified_at = completed_at + timedelta(minutes=rng.randrange(5, 2880))
+                comment = "Please redo" if status == "rejected" else None
+                shard.add_keyed("chore_verification", completion, admin, status, comment, min(verified_at, self.now))
+
+    def _swaps(self, shard: Shard, rng, chores: List[dict], active_ids: List[int]):
+        if len(active_ids) < 2 or not chores:
+            return
+        for _ in range(rng.randrange(4)):
+            chore = rng.choice(chores)
+            from_membership, to_membership = rng.sample(active_ids, 2)
+            status = rng.choices(_SWAP_VALUES, _SWAP_WEIGHTS)[0]
+            requested_at = _recent(rng, chore["created_at"], self.now)
+            responded_at = None if status == "pending" else min(self.now, requested_at + timedelta(hours=rng.randrange(1, 72)))
+            shard.add_keyed("chore_swap_request", chore["id"], from_membership, to_membership, status,
+                            "Can you take this one?", requested_at, responded_at)
+
+    def _expenses(self, shard: Shard, rng, room: int, created_at: datetime, active: list, activity: float):
+        active_ids = [m[0] for m in active]
+        settle_before = self.now - timedelta(days=30)
+        for number in range(_count(rng, self.expenses_per_room * activity)):
+            payer = rng.choice(active_ids)
+            category = rng.choices(_CATEGORY_VALUES, _CATEGORY_WEIGHTS)[0]
+            amount = round(5 + rng.paretovariate(2.5) * 20, 2)
+            spent_at = _recent(rng, created_at, self.now)
+            if len(active_ids) > 2 and rng.random() < 0.3:
+                others = [m for m in active_ids if m != payer]
+                split_with = [payer] + rng.sample(others, rng.randrange(1, len(others) + 1))
+            else:
+                split_with = active_ids
+            expense = shard.add_keyed("expense", room, payer, f"{amount:.2f}", f"{category} #{number + 1}", category,
+                                      spent_at.date(), spent_at)
+            share = round(amount / len(split_with), 2)
+            for membership in split_with:
+                paid_probability = 0.9 if spent_at < settle_before else 0.3
+                is_paid = membership == payer or rng.random() < paid_probability
+                paid_at = min(self.now, spent_at + timedelta(hours=rng.randrange(1, 24 * 21))) if is_paid else None
+                shard.add_keyed("expense_split", expense, membership, f"{share:.2f}", is_paid, paid_at)
+
+    def _announcements(self, shard: Shard, rng, room: int, created_at: datetime, active: list, activity: float):
+        active_ids = [m[0] for m in active]
+        recent = self.now - timedelta(days=3)
+        for number in range(_count(rng, self.announcements_per_room * activity)):
+            author = rng.choice(active_ids)
+            posted_at = _recent(rng, created_at, self.now)
+            can_reply = rng.random() < 0.3
+            announcement = shard.add_keyed("announcement", room, author, f"Announcement {number + 1}", can_reply,
+                                           posted_at)
+            read_probability = 0.85 if posted_at < recent else 0.45
+            for membership in active_ids:
+                if membership != author and rng.random() < read_probability:
+                    read_at = min(self.now, posted_at + timedelta(minutes=rng.randrange(1, 4320)))
+                    shard.add("announcement_read", announcement, membership, read_at)
+                if rng.random() < 0.25:
+                    reacted_at = min(self.now, posted_at + timedelta(minutes=rng.randrange(1, 4320)))
+                    shard.add_keyed("announcement_reaction", announcement, membership, rng.choice(EMOJIS), reacted_at)
+            if not can_reply:
+                continue
+            for _ in range(rng.randrange(4)):
+                replied_at = min(self.now, posted_at + timedelta(minutes=rng.randrange(1, 2880)))
+                reply = shard.add_keyed("announcement_reply", announcement, rng.choice(active_ids), "Sounds good",
+                                        replied_at)
+                for membership in active_ids:
+                    if rng.random() < 0.15:
+                        shard.add_keyed("announcement_reply_reaction", reply, membership, rng.choice(EMOJIS),
+                                        replied_at)
+
+    def _cleaning(self, shard: Shard, rng, room: int, created_at: datetime, active_ids: List[int]):
+        titles = rng.sample(CHECKLIST_ITEMS, rng.randrange(4, len(CHECKLIST_ITEMS) + 1))
+        items = [shard.add_keyed("cleaning_checklist", room, title, None, position < 4)
+                 for position, title in enumerate(titles)]
+        first_day = max(created_at.date(), self.today - timedelta(days=self.size.cleaning_days - 1))
+        day = first_day
+        while day <= self.today:
+            completion_rate = 0.3 if day == self.today else 0.7
+            for offset, item in enumerate(items):
+                membership = active_ids[(day.toordinal() + offset) % len(active_ids)]
+                shard.add_keyed("cleaning_check_status", item, membership, day, rng.random() < completion_rate, True,
+                                datetime.combine(day, datetime.min.time(), self.now.tzinfo) + timedelta(hours=rng.randrange(8, 23)))
+            day += timedelta(days=1)
+
+    def _invitations(self, shard: Shard, rng, room: int, invited_by: int, created_at: datetime):
+        for _ in range(rng.randrange(3)):
+            sent_at = _recent(rng, created_at, self.now).replace(tzinfo=None)
+            status = rng.choices(_INVITATION_VALUES, _INVITATION_WEIGHTS)[0]
+            if rng.random() < 0.5:
+                invited_user, invited_email = rng.randrange(1, self.size.users + 1), None
+            else:
+                invited_user, invited_email = None, f"guest{rng.getrandbits(40)}@example.test"
+            responded_at = sent_at + timedelta(hours=rng.randrange(1, 96)) if status in ("accepted", "rejected") else None
+            shard.add_keyed("room_invitation", room, invited_by, invited_user, invited_email, "Roommate", status,
+                            f"{rng.getrandbits(128):032x}", None, sent_at + timedelta(days=7), sent_at, responded_at)
+
+
+# Worker process state, set by _init_worker
+_connection: Optional[psycopg.Connection] = None
+_counters: Dict[str, "multiprocessing.sharedctypes.Synchronized"] = {}
+_generator: Optional[RoomGenerator] = None
+
+
+def _init_worker(url: str, counters: dict, size: DatasetSize, seed: int, now: datetime):
+    global _connection, _counters, _generator
+    _connection = psycopg.connect(url, autocommit=True)
+    _counters = counters
+    _generator = RoomGenerator(size, seed, now)
+
+
+def _reserve(table: str, count: int) -> int:
+    """Reserve ``count`` ids for ``table``; returns the offset to add to shard-local ids."""
+    counter = _counters[table]
+    with counter.get_lock():
+        base = counter.value
+        counter.value += count
+    return base
+
+
+def _copy_rows(cursor, table: str, columns: List[str], lines: List[str]):
+    with cursor.copy(f'COPY "{table}" ({", ".join(columns)}) FROM STDIN') as copy:
+        for start in range(0, len(lines), 5000):
+            copy.write("".join(lines[start:start + 5000]))
+
+
+def _load_users(bounds: Tuple[int, int]) -> Dict[str, int]:
+    start, end = bounds
+    rng = random.Random(_generator.seed * 7919 + start)
+    now = _generator.now
+    lines = []
+    for user_id in range(start, end):
+        created_at = now - timedelta(days=HISTORY_DAYS * 1.5 * rng.random(), seconds=rng.randrange(86400))
+        avatar = f"https://avatars.example.test/{user_id}.png" if rng.random() < 0.6 else None
+        lines.append(f"{user_id}\tgen-{user_id:010d}\tUser {user_id}\tuser{user_id}@example.test\t"
+                     f"{_text(avatar)}\t{_text(created_at)}\t{_text(created_at)}\n")
+    with _connection.transaction(), _connection.cursor() as cursor:
+        _copy_rows(cursor, "user", ["user_id", "fb_uid", "name", "email", "avatar_url", "created_at", "updated_at"], lines)
+    return {"user": len(lines)}
+
+
+def _load_rooms(bounds: Tuple[int, int]) -> Dict[str, int]:
+    shard = Shard()
+    for room_number in range(*bounds):
+        _generator.build(shard, room_number)
+
+    bases = {table: _reserve(table, len(shard.rows[table])) for table in SERIAL_TABLES}
+    counts = {}
+    with _connection.transaction(), _connection.cursor() as cursor:
+        for table, columns in TABLES:
+            rows = shard.rows[table]
+            if not rows:
+                continue
+            offsets = [bases[ref] if ref else None for _, ref in columns]
+            lines = []
+            for row in rows:
+                lines.append("\t".join(
+                    _text(value + offset if offset is not None and value is not None else value)
+                    for value, offset in zip(row, offsets)
+                ) + "\n")
+            _copy_rows(cursor, table, [name for name, _ in columns], lines)
+            counts[table] = len(rows)
+    return counts
+
+
+def _run_statement(sql: str) -> str:
+    _connection.execute(sql)
+    return sql
+
+
+def _secondary_indexes(connection: psycopg.Connection) -> List[Tuple[str, str]]:
+    """Indexes in public that do not back a primary key or unique constraint."""
+    return connection.execute("""
+        SELECT i.indexname, i.indexdef
+        FROM pg_indexes i
+        WHERE i.schemaname = 'public'
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname)
+    """).fetchall()
+
+
+def _ranges(total: int, step: int, start: int = 1) -> List[Tuple[int, int]]:
+    return [(low, min(low + step, total + start)) for low in range(start, total + start, step)]
+
+
+def generate(url: str, size: DatasetSize, workers: int = 0, seed: int = 42, rooms_per_shard: int = 0):
+    """Reset the schema at ``url`` and fill it; returns row counts per table.
+
+    Raises SystemExit, before dropping anything, if ``url`` holds tables and is
+    not marked as a benchmark database.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    # Aim for roughly 50k rows per shard so memory stays flat at any scale
+    rows_per_room = 40 + (size.completions + size.expenses * 4 + size.announcements * 6) / size.rooms
+    rooms_per_shard = rooms_per_shard or max(1, int(50_000 / rows_per_room))
+    now = datetime.now().astimezone()
+
+    claim_scratch_database(url)
+    with psycopg.connect(url, autocommit=True) as connection:
+        connection.execute("DROP SCHEMA public CASCADE")
+        connection.execute("CREATE SCHEMA public")
+        connection.execute(SCHEMA_PATH.read_text())
+        indexes = _secondary_indexes(connection)
+        for name, _ in indexes:
+            connection.execute(f'DROP INDEX "{name}"')
+
+    context = multiprocessing.get_context("spawn")
+    counters = {table: context.Value("q", 0) for table in SERIAL_TABLES}
+    totals: Dict[str, int] = {}
+    with context.Pool(workers, _init_worker, (url, counters, size, seed, now)) as pool:
+        for phase, task, bounds in (
+            ("users", _load_users, _ranges(size.users, 20_000)),
+            ("rooms", _load_rooms, _ranges(size.rooms, rooms_per_shard)),
+        ):
+            start = time.perf_counter()
+            done = 0
+            for counts in pool.imap_unordered(task, bounds):
+                for table, count in counts.items():
+                    totals[table] = totals.get(table, 0) + count
+                done += 1
+                print(f"\r  {phase}: {done}/{len(bounds)} shards, {sum(totals.values()):,} rows", end="", flush=True)
+            print(f"  ({time.perf_counter() - start:.1f}s)")
+
+        start = time.perf_counter()
+        for _ in pool.imap_unordered(_run_statement, [definition for _, definition in indexes]):
+            pass
+        print(f"  rebuilt {len(indexes)} indexes ({time.perf_counter() - start:.1f}s)")
+
+    with psycopg.connect(url, autocommit=True) as connection:
+        for table in ["user"] + SERIAL_TABLES:
+            id_column = "user_id" if table == "user" else next(columns for name, columns in TABLES if name == table)[0][0]
+            connection.execute(
+                f"SELECT setval(pg_get_serial_sequence('\"{table}\"', '{id_column}'), "
+                f"coalesce((SELECT max({id_column}) FROM \"{table}\"), 0) + 1, false)"
+            )
+        start = time.perf_counter()
+        connection.execute("VACUUM ANALYZE")
+        print(f"  vacuum analyze ({time.perf_counter() - start:.1f}s)")
+    return totals
+
+
+def apply_overrides(size: DatasetSize, args: argparse.Namespace) -> DatasetSize:
+    for field in fields(DatasetSize):
+        override = getattr(args, field.name, None)
+        if override is not None:
+            setattr(size, field.name, override)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url", help="Connection URL of an empty or benchmark-marked database")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every default size")
+    for field in fields(DatasetSize):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, help=f"Override {field.name}")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--rooms-per-shard", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    size = apply_overrides(DatasetSize().scaled(args.scale), args)
+    print(f"Generating {asdict(size)}")
+    start = time.perf_counter()
+    totals = generate(args.url, size, args.workers, args.seed, args.rooms_per_shard)
+    elapsed = time.perf_counter() - start
+    for table, count in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f"  {table:<30} {count:>12,}")
+    print(f"{sum(totals.values()):,} rows in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Throughput and latency of the API under a scripted mix of user sessions.
+
+Starts a disposable Postgres (or uses BENCHMARK_DATABASE_URL), fills it with the
+benchmarks.datagen generator, then drives the real FastAPI app in-process
+through httpx's ASGI transport with concurrent virtual users. Each user repeatedly picks a
+session from the mix (a resident opening the app, an admin reviewing
+completions, a roommate settling expenses) and runs its requests in order.
+Results per endpoint are printed and saved as JSON tagged with the git
+commit, so runs can be compared across commits with --compare.
+
+    cd api
+    python -m benchmarks.load --scale 0.1 --duration 60 --concurrency 32
+    python -m benchmarks.load --skip-load --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from dataclasses import asdict, fields
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+import psycopg
+from psycopg.rows import dict_row
+
+from benchmarks.datagen import DatasetSize, apply_overrides, generate
+from benchmarks.postgres import claim_scratch_database, local_postgres
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.enabled = False
+
+    async def request(self, client: httpx.AsyncClient, method: str, template: str, path_params: dict, **kwargs):
+        path = template.format(**path_params)
+        start = time.perf_counter()
+        response = await client.request(method, path, **kwargs)
+        elapsed = time.perf_counter() - start
+        if self.enabled:
+            key = f"{method} {template}"
+            self.latencies.setdefault(key, []).append(elapsed)
+            if response.status_code >= 400:
+                self.errors[key] = self.errors.get(key, 0) + 1
+        return response
+
+
+async def resident_session(client, recorder: Recorder, actor: dict, rng: random.Random):
+    """Opening the app: rooms, chores, announcements, and sometimes completing a chore."""
+    await recorder.request(client, "GET", "/api/rooms/by-user/{user_id}", actor)
+    await recorder.request(client, "GET", "/api/chores/room/{room_id}/with-completion-status", actor,
+                           params={"user_id": actor["user_id"]})
+    await recorder.request(client, "GET", "/api/chores/assigned-to-user/{user_id}", actor)
+    await recorder.request(client, "GET", "/api/announcements/room/{room_id}", actor)
+    await recorder.request(client, "GET", "/api/rooms/{room_id}/unread-announcements", actor,
+                           params={"user_id": actor["user_id"]})
+    if actor["chore_ids"] and rng.random() < 0.3:
+        chore_id = rng.choice(actor["chore_ids"])
+        await recorder.request(client, "POST", "/api/chores/{chore_id}/complete", {"chore_id": chore_id},
+                               params={"membership_id": actor["membership_id"]}, json={"chore_id": chore_id})
+
+
+async def admin_session(client, recorder: Recorder, actor: dict, rng: random.Random):
+    """Reviewing the room: pending completions, members, and verifying one."""
+    response = await recorder.request(client, "GET", "/api/chores/room/{room_id}/pending-completions", actor)
+    await recorder.request(client, "GET", "/api/membership/{room_id}/members", actor)
+    pending = response.json() if response.status_code == 200 else []
+    if pending and rng.random() < 0.5:
+        completion_id = pending[0]["completionId"]
+        await recorder.request(client, "POST", "/api/chores/completions/{completion_id}/verify",
+                               {"completion_id": completion_id},
+                               params={"verified_by_membership_id": actor["membership_id"]},
+                               json={"completion_id": completion_id, "verification_type": "approved"})
+
+
+async def expenses_session(client, recorder: Recorder, actor: dict, rng: random.Random):
+    """Checking balances, and sometimes adding an expense split with the room."""
+    await recorder.request(client, "GET", "/api/expenses/room/{room_id}", actor)
+    await recorder.request(client, "GET", "/api/expenses/summary/user/{membership_id}/room/{room_id}", actor)
+    if rng.random() < 0.2:
+        await recorder.request(client, "POST", "/api/expenses/create", actor, json={
+            "room_id": actor["room_id"],
+            "payer_membership_id": actor["membership_id"],
+            "amount": f"{rng.uniform(5, 120):.2f}",
+            "description": "Benchmark expense",
+            "category": "Groceries",
+            "expense_date": date.today().isoformat(),
+            "split_with": actor["member_ids"],
+        })
+
+
+SESSIONS = {
+    "resident": resident_session,
+    "admin": admin_session,
+    "expenses": expenses_session,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SESSIONS:
+            raise argparse.ArgumentTypeError(f"Unknown session {name!r}, expected one of {', '.join(SESSIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def sample_actors(url: str, count: int) -> List[dict]:
+    sql = """
+        SELECT rm.user_id, rm.room_id, rm.membership_id, rm.role,
+               coalesce((SELECT array_agg(c.chore_id) FROM chore c WHERE c.room_id = rm.room_id), '{}') AS chore_ids,
+               (SELECT array_agg(m.membership_id) FROM room_membership m
+                 WHERE m.room_id = rm.room_id AND m.is_active) AS member_ids
+        FROM room_membership rm
+        WHERE rm.is_active
+        ORDER BY random()
+        LIMIT %s
+    """
+    with psycopg.connect(url, row_factory=dict_row) as connection:
+        return connection.execute(sql, (count,)).fetchall()
+
+
+async def virtual_user(client, recorder: Recorder, actors: List[dict], admins: List[dict], mix: Dict[str, float],
+                       deadline: float, think: float, rng: random.Random):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        actor = rng.choice(admins if name == "admin" and admins else actors)
+        await SESSIONS[name](client, recorder, actor, rng)
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+
+
+async def drive(app, actors: List[dict], mix: Dict[str, float], concurrency: int, duration: float,
+                warmup: float, think: float, seed: int) -> Recorder:
+    recorder = Recorder()
+    admins = [actor for actor in actors if actor["role"] == "admin"]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+        deadline = time.perf_counter() + warmup + duration
+        users = [
+            asyncio.create_task(virtual_user(client, recorder, actors, admins, mix, deadline, think,
+                                             random.Random(seed + i)))
+            for i in range(concurrency)
+        ]
+        await asyncio.sleep(warmup)
+        recorder.enabled = True
+        await asyncio.gather(*users)
+    return recorder
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def summarize(latencies: List[float], errors: int, duration: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / duration, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+def git_revision() -> dict:
+    def git(*args):
+        return subprocess.run(["git", *args], capture_output=True, text=True).stdout.strip()
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def print_report(report: dict, baseline: dict = None):
+    previous = {row["endpoint"]: row for row in baseline["endpoints"]} if baseline else {}
+    header = f"{'endpoint':<70} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    if previous:
+        header += f" {'p95 vs base':>12}"
+    print(header)
+    print("-" * len(header))
+    for row in report["endpoints"] + [report["total"]]:
+        line = (f"{row['endpoint']:<70} {row['requests']:>7} {row['errors']:>5} {row['throughput_rps']:>8} "
+                f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}")
+        base = previous.get(row["endpoint"]) or (baseline["total"] if baseline and row is report["total"] else None)
+        if base and base["p95_ms"]:
+            line += f" {(row['p95_ms'] / base['p95_ms'] - 1) * 100:>+11.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every default dataset size")
+    for field in fields(DatasetSize):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, help=f"Override the {field.name} count")
+    parser.add_argument("--skip-load", action="store_true", help="Reuse the data already in BENCHMARK_DATABASE_URL")
+    parser.add_argument("--workers", type=int, default=0, help="Data generator processes (default: CPU count)")
+    parser.add_argument("--keep-db", action="store_true", help="Leave the disposable Postgres running")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("resident=6,admin=1,expenses=3"))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before the run")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between sessions")
+    parser.add_argument("--actors", type=int, default=5000, help="Memberships sampled to act as users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare p95 latencies against")
+    args = parser.parse_args()
+
+    size = apply_overrides(DatasetSize().scaled(args.scale), args)
+
+    with local_postgres(keep=args.keep_db) as url:
+        claim_scratch_database(url)
+        if not args.skip_load:
+            print(f"Generating dataset: {asdict(size)}")
+            generate(url, size, args.workers, args.seed)
+
+        # The app reads its configuration at import time
+        os.environ["DATABASE_URL"] = url
+        os.environ.setdefault("QUERY_TRACE_ENABLED", "false")
+        from src.main import app
+
+        actors = sample_actors(url, args.actors)
+        print(f"Running {args.concurrency} virtual users for {args.duration:.0f}s (+{args.warmup:.0f}s warmup)")
+        recorder = asyncio.run(drive(app, actors, args.mix, args.concurrency, args.duration, args.warmup,
+                                     args.think_ms / 1000, args.seed))
+
+    endpoints = [
+        {"endpoint": key, **summarize(latencies, recorder.errors.get(key, 0), args.duration)}
+        for key, latencies in sorted(recorder.latencies.items())
+    ]
+    all_latencies = [value for latencies in recorder.latencies.values() for value in latencies]
+    report = {
+        **git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "dataset": None if args.skip_load else asdict(size),
+        "config": {
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+        },
+        "endpoints": endpoints,
+        "total": {"endpoint": "TOTAL", **summarize(all_latencies, sum(recorder.errors.values()), args.duration)},
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    json_path = args.json_path
+    if json_path is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        json_path = RESULTS_DIR / f"{stamp}-{report['commit'][:8] or 'nogit'}.json"
+    with open(json_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {json_path}")
+
+
+if __name__ == "__main__":
+    main()
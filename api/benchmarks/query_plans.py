@@ -0,0 +1,349 @@
+"""Query-plan regression check for every repository SQL statement.
+
+Calls every public method of every class in src/repository with ids taken
+from the busiest room of a generated dataset (each call runs in its own
+transaction that is rolled back), records the statements through a
+run_sql query hook, then runs EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) on
+each distinct statement, again inside a rolled-back transaction.
+
+A statement fails when it
+  * sequentially scans a table with more than --large-table-rows rows,
+  * touches more than --max-buffers shared buffers, or
+  * touches more than --buffer-tolerance times its baseline buffers,
+    in which case the baseline and current plan shapes are diffed.
+
+    cd api
+    python -m benchmarks.query_plans --scale 0.2
+    python -m benchmarks.query_plans --skip-load --update-baseline
+"""
+import argparse
+import difflib
+import enum
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import typing
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psycopg
+from psycopg import ClientCursor
+from psycopg.rows import dict_row
+
+from benchmarks.datagen import DatasetSize, apply_overrides, generate
+from benchmarks.postgres import claim_scratch_database, local_postgres
+
+BASELINE_PATH = Path(__file__).resolve().parent / "query_plans_baseline.json"
+REPOSITORY_DIR = Path(__file__).resolve().parents[1] / "src" / "repository"
+EXPLAINABLE = ("select", "insert", "update", "delete", "with", "values")
+
+# Values of the busiest room, filled in by sample_values()
+SAMPLE_SQL = """
+    WITH busiest AS (
+        SELECT c.room_id FROM chore_completion cc JOIN chore c USING (chore_id)
+        GROUP BY c.room_id ORDER BY count(*) DESC LIMIT 1
+    )
+    SELECT
+        r.room_id, r.room_code,
+        admin.membership_id AS admin_membership_id, admin.user_id AS admin_user_id,
+        member.membership_id AS member_membership_id, member.user_id AS member_user_id,
+        u.fb_uid, u.email,
+        (SELECT chore_id FROM chore WHERE room_id = r.room_id ORDER BY chore_id LIMIT 1) AS chore_id,
+        (SELECT cc.completion_id FROM chore_completion cc JOIN chore c USING (chore_id)
+          WHERE c.room_id = r.room_id ORDER BY cc.status = 'pending' DESC, cc.completion_id LIMIT 1) AS completion_id,
+        (SELECT expense_id FROM expense WHERE room_id = r.room_id ORDER BY expense_id LIMIT 1) AS expense_id,
+        (SELECT es.split_id FROM expense_split es JOIN expense e USING (expense_id)
+          WHERE e.room_id = r.room_id ORDER BY es.split_id LIMIT 1) AS split_id,
+        (SELECT announcement_id FROM announcement WHERE room_id = r.room_id ORDER BY announcement_id LIMIT 1) AS announcement_id,
+        (SELECT ar.reply_id FROM announcement_reply ar JOIN announcement a USING (announcement_id)
+          WHERE a.room_id = r.room_id ORDER BY ar.reply_id LIMIT 1) AS reply_id,
+        (SELECT ar.reaction_id FROM announcement_reaction ar JOIN announcement a USING (announcement_id)
+          WHERE a.room_id = r.room_id ORDER BY ar.reaction_id LIMIT 1) AS reaction_id,
+        (SELECT s.swap_id FROM chore_swap_request s JOIN chore c USING (chore_id)
+          WHERE c.room_id = r.room_id ORDER BY s.swap_id LIMIT 1) AS swap_id,
+        (SELECT checklist_item_id FROM cleaning_checklist WHERE room_id = r.room_id
+          ORDER BY checklist_item_id LIMIT 1) AS checklist_item_id,
+        (SELECT array_agg(membership_id) FROM room_membership WHERE room_id = r.room_id AND is_active) AS membership_ids
+    FROM busiest b
+    JOIN room r USING (room_id)
+    JOIN LATERAL (SELECT * FROM room_membership WHERE room_id = r.room_id AND role = 'admin' LIMIT 1) admin ON TRUE
+    JOIN LATERAL (SELECT * FROM room_membership WHERE room_id = r.room_id AND role = 'member' AND is_active
+                  LIMIT 1) member ON TRUE
+    JOIN "user" u ON u.user_id = admin.user_id
+"""
+
+
+def sample_values(url: str) -> dict:
+    with psycopg.connect(url, row_factory=dict_row) as connection:
+        row = connection.execute(SAMPLE_SQL).fetchone()
+    if row is None:
+        raise SystemExit("The database has no completions to pick a sample room from; load a dataset first")
+    today = date.today()
+    admin, member = row["admin_membership_id"], row["member_membership_id"]
+    return {
+        **row,
+        "user_id": row["admin_user_id"],
+        "created_by": row["admin_user_id"],
+        "membership_id": admin,
+        "admin_membership_id": admin,
+        "verified_by_membership_id": admin,
+        "payer_membership_id": admin,
+        "from_membership_id": member,
+        "target_membership_id": member,
+        "to_membership": admin,
+        "membership_ids": row["membership_ids"],
+        "split_with": row["membership_ids"],
+        "new_fb_uid": f"{row['fb_uid']}-plan",
+        "avatar_url": None,
+        "marked_date": today.isoformat(),
+        "date_filter": today.isoformat(),
+        "start_date": (today - timedelta(days=7)).isoformat(),
+        "end_date": today.isoformat(),
+        "expense_date": today,
+        "amount": Decimal("12.50"),
+        "status": "accepted",
+        "verification_type": "approved",
+        "frequency": "Weekly",
+        "emoji": "👍",
+        "limit": 50,
+        "user_scope": "plan-check",
+        "route": "plan-check",
+        "idempotency_key": "plan-check",
+        "request_hash": "0" * 64,
+        "status_code": 200,
+        "response_body": {},
+        "ttl_seconds": 60,
+    }
+
+
+def _resolve(name: str, annotation, samples: dict):
+    """Build an argument from the sample values by parameter name, type, or model fields."""
+    if inspect.isclass(annotation) and hasattr(annotation, "model_fields"):
+        values = {}
+        for field_name, field in annotation.model_fields.items():
+            if field_name in samples or field.is_required():
+                values[field_name] = _resolve(field_name, field.annotation, samples)
+        return annotation(**values)
+    if name in samples:
+        return samples[name]
+    if inspect.isclass(annotation) and issubclass(annotation, enum.Enum):
+        return next(iter(annotation))
+    for base in (typing.get_args(annotation) or (annotation,)):
+        if base is str:
+            return "Plan check"
+        if base is int:
+            return 1
+        if base is bool:
+            return False
+    raise LookupError(f"no sample value for {name}: {annotation}")
+
+
+def repository_methods():
+    for path in sorted(REPOSITORY_DIR.glob("*.py")):
+        module = importlib.import_module(f"src.repository.{path.stem}")
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__ or not class_name.endswith("Repository"):
+                continue
+            instance = cls()
+            for method_name, method in inspect.getmembers(instance, inspect.ismethod):
+                if not method_name.startswith("_"):
+                    yield f"{class_name}.{method_name}", method
+
+
+class _Rollback(Exception):
+    pass
+
+
+def capture_statements(samples: dict) -> Dict[str, dict]:
+    """Run every repository method once and return distinct statements keyed by caller and fingerprint."""
+    from src.services.database.helper import add_query_hook, transaction
+    from src.services.query_trace import fingerprint
+
+    statements: Dict[str, dict] = {}
+    current: List = []
+
+    def record(sql, params, caller, duration, rows, error):
+        if error is None:
+            current.append((sql, params, caller))
+
+    add_query_hook(record)
+    skipped = []
+    for qualified_name, method in repository_methods():
+        try:
+            arguments = {
+                name: _resolve(name, parameter.annotation, samples)
+                for name, parameter in inspect.signature(method).parameters.items()
+                if parameter.default is inspect.Parameter.empty or name in samples
+            }
+        except (LookupError, ValueError) as e:
+            skipped.append(f"{qualified_name} ({e})")
+            continue
+
+        current.clear()
+        try:
+            with transaction():
+                try:
+                    method(**arguments)
+                except Exception as e:
+                    # Statements that ran before the failure are still checked
+                    skipped.append(f"{qualified_name} (raised {type(e).__name__}: {e})")
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        for sql, params, caller in current:
+            normalized = fingerprint(sql)
+            if not normalized.startswith(EXPLAINABLE):
+                continue
+            key = f"{caller} {hashlib.blake2b(normalized.encode(), digest_size=5).hexdigest()}"
+            statements.setdefault(key, {"caller": caller, "fingerprint": normalized, "sql": sql, "params": params})
+
+    for line in skipped:
+        print(f"  not fully exercised: {line}")
+    return statements
+
+
+def plan_shape(node: dict, depth: int = 0) -> List[str]:
+    """Node types, relations and indexes of a plan, without costs or values."""
+    label = node["Node Type"]
+    if node.get("Join Type") and "Join" in label or label == "Nested Loop":
+        label = f"{node.get('Join Type', '')} {label}".strip()
+    if node.get("Relation Name"):
+        label += f" on {node['Relation Name']}"
+    if node.get("Index Name"):
+        label += f" using {node['Index Name']}"
+    lines = ["  " * depth + label]
+    for child in node.get("Plans", []):
+        lines.extend(plan_shape(child, depth + 1))
+    return lines
+
+
+def seq_scans(node: dict) -> List[str]:
+    found = [node["Relation Name"]] if node["Node Type"] == "Seq Scan" else []
+    for child in node.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def explain(url: str, statements: Dict[str, dict]) -> Dict[str, dict]:
+    results = {}
+    with psycopg.connect(url) as connection:
+        cursor = ClientCursor(connection)
+        for key, statement in sorted(statements.items()):
+            query = cursor.mogrify(statement["sql"], statement["params"])
+            try:
+                with connection.transaction():
+                    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}")
+                    output = cursor.fetchone()[0][0]
+                    raise _Rollback()
+            except _Rollback:
+                pass
+            except psycopg.Error as e:
+                print(f"  could not explain {key}: {e}")
+                continue
+            plan = output["Plan"]
+            results[key] = {
+                "caller": statement["caller"],
+                "fingerprint": statement["fingerprint"],
+                "plan": plan_shape(plan),
+                "seq_scans": seq_scans(plan),
+                "buffers": plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+                "time_ms": round(output.get("Execution Time", 0.0), 3),
+            }
+    return results
+
+
+def large_tables(url: str, min_rows: int) -> Dict[str, int]:
+    with psycopg.connect(url) as connection:
+        rows = connection.execute("""
+            SELECT c.relname, c.reltuples::bigint FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relkind = 'r' AND c.reltuples >= %s
+        """, (min_rows,)).fetchall()
+    return dict(rows)
+
+
+def check(results: Dict[str, dict], baseline: Optional[Dict[str, dict]], large: Dict[str, int],
+          max_buffers: int, tolerance: float) -> List[str]:
+    failures = []
+    for key, result in sorted(results.items()):
+        problems = []
+        for table in result["seq_scans"]:
+            if table in large:
+                problems.append(f"sequential scan on {table} (~{large[table]:,} rows)")
+        if result["buffers"] > max_buffers:
+            problems.append(f"{result['buffers']:,} buffers, budget is {max_buffers:,}")
+        previous = (baseline or {}).get(key)
+        if previous and result["buffers"] > max(previous["buffers"] * tolerance, previous["buffers"] + 50):
+            problems.append(f"{result['buffers']:,} buffers, baseline was {previous['buffers']:,}")
+        if problems:
+            report = [f"FAIL {key}", f"     {result['fingerprint'][:160]}"]
+            report += [f"     - {problem}" for problem in problems]
+            if previous and previous["plan"] != result["plan"]:
+                diff = difflib.unified_diff(previous["plan"], result["plan"], "baseline", "current", lineterm="")
+                report += ["     " + line for line in diff]
+            else:
+                report += ["     " + line for line in result["plan"]]
+            failures.append("\n".join(report))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every default dataset size")
+    for field in ("users", "rooms", "completions", "expenses", "announcements"):
+        parser.add_argument(f"--{field}", type=int, help=f"Override the {field} count")
+    parser.add_argument("--skip-load", action="store_true", help="Reuse the data already in BENCHMARK_DATABASE_URL")
+    parser.add_argument("--workers", type=int, default=0, help="Data generator processes (default: CPU count)")
+    parser.add_argument("--keep-db", action="store_true", help="Leave the disposable Postgres running")
+    parser.add_argument("--large-table-rows", type=int, default=10_000,
+                        help="Sequential scans are allowed on tables smaller than this")
+    parser.add_argument("--max-buffers", type=int, default=5_000, help="Shared buffers allowed per statement")
+    parser.add_argument("--buffer-tolerance", type=float, default=1.5,
+                        help="Allowed growth in buffers relative to the baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Record this run as the new baseline")
+    args = parser.parse_args()
+
+    with local_postgres(keep=args.keep_db) as url:
+        claim_scratch_database(url)
+        if not args.skip_load:
+            size = apply_overrides(DatasetSize().scaled(args.scale), args)
+            generate(url, size, args.workers)
+
+        # The repositories connect at import time
+        os.environ["DATABASE_URL"] = url
+        samples = sample_values(url)
+        statements = capture_statements(samples)
+        results = explain(url, statements)
+        large = large_tables(url, args.large_table_rows)
+
+    baseline = None
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())
+
+    failures = check(results, baseline, large, args.max_buffers, args.buffer_tolerance)
+    for key, result in sorted(results.items()):
+        status = "FAIL" if any(failure.startswith(f"FAIL {key}\n") for failure in failures) else "ok"
+        print(f"  {status:<4} {result['buffers']:>8,} buf {result['time_ms']:>9.2f} ms  {key}")
+    for failure in failures:
+        print()
+        print(failure)
+    if baseline is not None:
+        for key in sorted(set(baseline) - set(results)):
+            print(f"  missing from this run (was in baseline): {key}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Wrote baseline for {len(results)} statements to {args.baseline}")
+    print(f"\n{len(results)} statements checked, {len(failures)} failing")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+-- Databases created before idempotent creation endpoints were added
+CREATE TABLE IF NOT EXISTS
+  "idempotency_key" (
+    "idempotency_key" VARCHAR(255) NOT NULL,
+    "user_scope" VARCHAR(64) NOT NULL, -- Caller identity the key belongs to
+    "route" VARCHAR(255) NOT NULL,
+    "request_hash" CHAR(64) NOT NULL, -- sha256 of the request parameters
+    "status_code" INTEGER NOT NULL,
+    "response_body" JSONB,
+    "created_at" TIMESTAMPTZ DEFAULT now (),
+    "expires_at" TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY ("user_scope", "route", "idempotency_key")
+  );
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_key_expires_at ON "idempotency_key" ("expires_at");
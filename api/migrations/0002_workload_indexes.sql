@@ -0,0 +1,20 @@
+-- migrate: no-transaction
+-- Chores assigned to a member (assigned-to-user, member removal)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_assignment_membership_id ON "chore_assignment" ("membership_id", "is_active");
+
+-- Pending completions of a room's chores
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_completion_chore_id_status ON "chore_completion" ("chore_id", "status");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_verification_completion_id ON "chore_verification" ("completion_id");
+
+-- Incoming and outgoing swap requests of a member
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_swap_request_to_membership ON "chore_swap_request" ("to_membership", "status");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_swap_request_from_membership ON "chore_swap_request" ("from_membership", "status");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_swap_request_chore_id ON "chore_swap_request" ("chore_id");
+
+-- Expense balances: what a member owes, and what is owed to a payer
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_expense_split_membership_unpaid ON "expense_split" ("membership_id", "is_paid");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_expense_payer_membership_id ON "expense" ("payer_membership_id", "room_id");
@@ -0,0 +1,23 @@
+CREATE TABLE IF NOT EXISTS
+  "job" (
+    "job_id" BIGSERIAL PRIMARY KEY,
+    "queue" VARCHAR(64) NOT NULL DEFAULT 'default',
+    "name" VARCHAR(128) NOT NULL,
+    "payload" JSONB NOT NULL DEFAULT '{}',
+    "status" VARCHAR(20) NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "max_attempts" INTEGER NOT NULL DEFAULT 5,
+    "run_at" TIMESTAMPTZ NOT NULL DEFAULT now (),
+    "locked_by" VARCHAR(128), -- Worker running the job
+    "locked_at" TIMESTAMPTZ,
+    "last_error" TEXT,
+    "created_at" TIMESTAMPTZ DEFAULT now (),
+    "finished_at" TIMESTAMPTZ
+  );
+
+-- Due jobs per queue; finished jobs stay out of the index
+CREATE INDEX IF NOT EXISTS idx_job_queue_run_at ON "job" ("queue", "run_at") WHERE "status" = 'queued';
+
+CREATE INDEX IF NOT EXISTS idx_job_running_locked_at ON "job" ("locked_at") WHERE "status" = 'running';
+
+CREATE INDEX IF NOT EXISTS idx_job_finished_at ON "job" ("finished_at") WHERE "status" = 'succeeded';
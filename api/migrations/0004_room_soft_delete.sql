@@ -0,0 +1,45 @@
+-- Rooms are soft-deleted and purged by the room.purge job
+ALTER TABLE "room" ADD COLUMN IF NOT EXISTS "deleted_at" TIMESTAMPTZ;
+
+ALTER TABLE "job" ADD COLUMN IF NOT EXISTS "progress" JSONB;
+
+CREATE OR REPLACE VIEW
+  "user_rooms" AS
+SELECT
+  u.user_id,
+  u.name as user_name,
+  u.email,
+  rm.membership_id,
+  r.room_id,
+  r.name as room_name,
+  r.room_code,
+  rm.role,
+  rm.joined_at,
+  rm.is_active
+FROM
+  "user" u
+  JOIN "room_membership" rm ON u.user_id = rm.user_id
+  JOIN "room" r ON rm.room_id = r.room_id
+WHERE
+  rm.is_active = TRUE
+  AND r.deleted_at IS NULL;
+
+CREATE OR REPLACE VIEW
+  "room_members" AS
+SELECT
+  r.room_id,
+  r.name as room_name,
+  u.user_id,
+  u.name as user_name,
+  u.email,
+  u.avatar_url,
+  rm.membership_id,
+  rm.role,
+  rm.joined_at
+FROM
+  "room" r
+  JOIN "room_membership" rm ON r.room_id = rm.room_id
+  JOIN "user" u ON rm.user_id = u.user_id
+WHERE
+  rm.is_active = TRUE
+  AND r.deleted_at IS NULL;
\ No newline at end of file
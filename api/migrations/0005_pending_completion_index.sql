@@ -0,0 +1,3 @@
+-- migrate: no-transaction
+-- Pending completions per chore in completed_at order (verification inbox)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_completion_pending ON "chore_completion" ("chore_id", "completed_at") WHERE "status" = 'pending';
@@ -0,0 +1,10 @@
+-- migrate: no-transaction
+-- Completion history per member and per chore, newest first. These cover
+-- the single-column indexes they replace.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_completion_membership_completed_at ON "chore_completion" ("membership_id", "completed_at");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chore_completion_chore_completed_at ON "chore_completion" ("chore_id", "completed_at");
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_chore_completion_membership_id;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_chore_completion_chore_id;
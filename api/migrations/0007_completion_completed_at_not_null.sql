@@ -0,0 +1,9 @@
+-- Completions are paged by (completed_at, completion_id); a NULL completed_at
+-- falls outside every keyset comparison and would end paging early. Backfill
+-- the few rows written without one from created_at, then forbid NULLs. SET NOT
+-- NULL scans the table once while holding its lock.
+UPDATE "chore_completion"
+SET "completed_at" = COALESCE("created_at"::TIMESTAMP, LOCALTIMESTAMP)
+WHERE "completed_at" IS NULL;
+
+ALTER TABLE "chore_completion" ALTER COLUMN "completed_at" SET NOT NULL;
@@ -18,6 +18,7 @@ CREATE TABLE
     "name" VARCHAR(255) NOT NULL,
     "created_at" TIMESTAMPTZ DEFAULT now (),
     "updated_at" TIMESTAMPTZ DEFAULT now (),
+    "deleted_at" TIMESTAMPTZ, -- Set when the last member leaves; rows are purged in the background
     CONSTRAINT "FK_room_created_by" FOREIGN KEY ("created_by") REFERENCES "user" ("user_id")
   );
 
@@ -187,7 +188,7 @@ CREATE TABLE
     "completion_id" SERIAL PRIMARY KEY,
     "chore_id" INTEGER NOT NULL,
     "membership_id" INTEGER NOT NULL,
-    "completed_at" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    "completed_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     "photo_url" TEXT,
     "status" VARCHAR(50) DEFAULT 'pending',
     "created_at" TIMESTAMPTZ DEFAULT now (),
@@ -261,6 +262,37 @@ CREATE TABLE
     CONSTRAINT "FK_expense_split_membership_id" FOREIGN KEY ("membership_id") REFERENCES "room_membership" ("membership_id")
   );
 
+CREATE TABLE
+  "idempotency_key" (
+    "idempotency_key" VARCHAR(255) NOT NULL,
+    "user_scope" VARCHAR(64) NOT NULL, -- Caller identity the key belongs to
+    "route" VARCHAR(255) NOT NULL,
+    "request_hash" CHAR(64) NOT NULL, -- sha256 of the request parameters
+    "status_code" INTEGER NOT NULL,
+    "response_body" JSONB,
+    "created_at" TIMESTAMPTZ DEFAULT now (),
+    "expires_at" TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY ("user_scope", "route", "idempotency_key")
+  );
+
+CREATE TABLE
+  "job" (
+    "job_id" BIGSERIAL PRIMARY KEY,
+    "queue" VARCHAR(64) NOT NULL DEFAULT 'default',
+    "name" VARCHAR(128) NOT NULL,
+    "payload" JSONB NOT NULL DEFAULT '{}',
+    "status" VARCHAR(20) NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "max_attempts" INTEGER NOT NULL DEFAULT 5,
+    "run_at" TIMESTAMPTZ NOT NULL DEFAULT now (),
+    "locked_by" VARCHAR(128), -- Worker running the job
+    "locked_at" TIMESTAMPTZ,
+    "last_error" TEXT,
+    "progress" JSONB, -- Reported by long-running jobs
+    "created_at" TIMESTAMPTZ DEFAULT now (),
+    "finished_at" TIMESTAMPTZ
+  );
+
 -- INDEXES for better performance
 CREATE INDEX "idx_user_fb_uid" ON "user" ("fb_uid");
 
@@ -276,9 +308,9 @@ CREATE INDEX "idx_chore_room_id" ON "chore" ("room_id");
 
 CREATE INDEX "idx_chore_assigned_to" ON "chore" ("assigned_to");
 
-CREATE INDEX "idx_chore_completion_chore_id" ON "chore_completion" ("chore_id");
+CREATE INDEX "idx_chore_completion_chore_completed_at" ON "chore_completion" ("chore_id", "completed_at");
 
-CREATE INDEX "idx_chore_completion_membership_id" ON "chore_completion" ("membership_id");
+CREATE INDEX "idx_chore_completion_membership_completed_at" ON "chore_completion" ("membership_id", "completed_at");
 
 CREATE INDEX "idx_expense_room_id" ON "expense" ("room_id");
 
@@ -310,6 +342,32 @@ CREATE INDEX idx_announcement_reply_announcement_id ON "announcement_reply" ("an
 
 CREATE INDEX idx_announcement_reply_membership_id ON "announcement_reply" ("membership_id");
 
+CREATE INDEX idx_idempotency_key_expires_at ON "idempotency_key" ("expires_at");
+
+CREATE INDEX idx_chore_assignment_membership_id ON "chore_assignment" ("membership_id", "is_active");
+
+CREATE INDEX idx_chore_completion_chore_id_status ON "chore_completion" ("chore_id", "status");
+
+CREATE INDEX idx_chore_verification_completion_id ON "chore_verification" ("completion_id");
+
+CREATE INDEX idx_chore_swap_request_to_membership ON "chore_swap_request" ("to_membership", "status");
+
+CREATE INDEX idx_chore_swap_request_from_membership ON "chore_swap_request" ("from_membership", "status");
+
+CREATE INDEX idx_chore_swap_request_chore_id ON "chore_swap_request" ("chore_id");
+
+CREATE INDEX idx_expense_split_membership_unpaid ON "expense_split" ("membership_id", "is_paid");
+
+CREATE INDEX idx_expense_payer_membership_id ON "expense" ("payer_membership_id", "room_id");
+
+CREATE INDEX idx_chore_completion_pending ON "chore_completion" ("chore_id", "completed_at") WHERE "status" = 'pending';
+
+CREATE INDEX idx_job_queue_run_at ON "job" ("queue", "run_at") WHERE "status" = 'queued';
+
+CREATE INDEX idx_job_running_locked_at ON "job" ("locked_at") WHERE "status" = 'running';
+
+CREATE INDEX idx_job_finished_at ON "job" ("finished_at") WHERE "status" = 'succeeded';
+
 CREATE VIEW
   "user_rooms" AS
 SELECT
@@ -328,7 +386,8 @@ FROM
   JOIN "room_membership" rm ON u.user_id = rm.user_id
   JOIN "room" r ON rm.room_id = r.room_id
 WHERE
-  rm.is_active = TRUE;
+  rm.is_active = TRUE
+  AND r.deleted_at IS NULL;
 
 CREATE VIEW
   "room_members" AS
@@ -347,4 +406,5 @@ FROM
   JOIN "room_membership" rm ON r.room_id = rm.room_id
   JOIN "user" u ON rm.user_id = u.user_id
 WHERE
-  rm.is_active = TRUE;
\ No newline at end of file
+  rm.is_active = TRUE
+  AND r.deleted_at IS NULL;
\ No newline at end of file
@@ -1,2 +1,25 @@
 import os
 IS_DEV = os.getenv("IS_DEV", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+IDEMPOTENCY_PURGE_INTERVAL = int(os.getenv("IDEMPOTENCY_PURGE_INTERVAL", str(60 * 60)))
+CACHE_INVALIDATION_LISTENER = os.getenv("CACHE_INVALIDATION_LISTENER", "true").lower() == "true"
+QUERY_TRACE_ENABLED = os.getenv("QUERY_TRACE_ENABLED", "false").lower() == "true"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# Admin endpoints stay open without ADMIN_TOKEN only when IS_DEV=true is set explicitly
+ADMIN_DEV_BYPASS = os.getenv("IS_DEV", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "10s")
+RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS", "false").lower() == "true"
+JOB_QUEUES = os.getenv("JOB_QUEUES", "default=4,maintenance=1")
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", str(60 * 60)))
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", str(30 * 60)))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 60 * 60)))
+ROOM_PURGE_BATCH_SIZE = int(os.getenv("ROOM_PURGE_BATCH_SIZE", "1000"))
+ROOM_PURGE_BATCH_DELAY = float(os.getenv("ROOM_PURGE_BATCH_DELAY", "0.05"))
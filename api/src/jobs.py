@@ -0,0 +1,15 @@
+"""Background job handlers. Imported by the API (to enqueue) and by src/worker.py (to run)."""
+from src.features.settings import IDEMPOTENCY_PURGE_INTERVAL
+from src.repository.idempotency_repository import IdempotencyRepository
+from src.services.job_queue import job, set_progress
+from src.services.room_purge import purge_room
+
+
+@job("room.purge", queue="maintenance")
+def purge_deleted_room(room_id: int):
+    purge_room(room_id)
+
+
+@job("idempotency.purge_expired", queue="maintenance", every=IDEMPOTENCY_PURGE_INTERVAL)
+def purge_expired_idempotency_keys():
+    set_progress(deleted=IdempotencyRepository().purge_expired())
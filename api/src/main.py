@@ -10,6 +10,10 @@ from src.router import chore_swap_request_router
 from src.router import expense_router
 from src.router import announcement_router
 from src.router import cleaning_router
+from src.router import batch_router
+from src.router import metrics_router
+from src.router import admin_router
+import src.jobs  # noqa: F401 (registers background job handlers)
 
 env = os.getenv("ENVIRONMENT", "development")
 
@@ -21,9 +25,33 @@ elif env == "production":
     load_dotenv(".env.prod")
 
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
+from src.features.settings import COMPRESSION_MIN_SIZE, CACHE_INVALIDATION_LISTENER, QUERY_TRACE_ENABLED, RUN_MIGRATIONS
+from src.services.compression import CompressionMiddleware
+from src.services.invalidation import listener
+from src.services.metrics import MetricsMiddleware
+from src.services.query_trace import QueryTraceMiddleware
+from src.services.profiler import ProfilerMiddleware
+from src.services.database.migrations import migrate
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if RUN_MIGRATIONS:
+        migrate()
+    if CACHE_INVALIDATION_LISTENER:
+        listener.start()
+    yield
+    listener.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+app.add_middleware(MetricsMiddleware)
+if QUERY_TRACE_ENABLED:
+    app.add_middleware(QueryTraceMiddleware)
+app.add_middleware(ProfilerMiddleware)
 
 logging.getLogger("uvicorn.access").addFilter(lambda _: False)
 
@@ -46,6 +74,9 @@ router.include_router(announcement_reaction_router.router)
 router.include_router(announcement_reply_reaction_router.router)
 router.include_router(announcement_read_router.router)
 router.include_router(cleaning_router.router)
+router.include_router(batch_router.router)
+router.include_router(metrics_router.router)
+router.include_router(admin_router.router)
 
 app.include_router(router)
 
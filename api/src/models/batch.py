@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+class BatchRequestItem(BaseModel):
+    path: str = Field(..., description="Internal GET path, e.g. /api/chores/12")
+    params: Optional[Dict[str, Any]] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem]
+
+class BatchResponseItem(BaseModel):
+    path: str
+    status: int
+    body: Any = None
@@ -1,6 +1,6 @@
 from datetime import datetime, time
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 class Chore(BaseModel):
     chore_id: int
@@ -87,6 +87,25 @@ class ChoreVerificationCreateRequest(BaseModel):
     verification_type: str  # "approved" | "rejected"
     comment: Optional[str] = None
 
+class ChoreVerificationBulkItem(BaseModel):
+    completion_id: int
+    verification_type: Literal["approved", "rejected"]
+    comment: Optional[str] = None
+
+class ChoreVerificationBulkRequest(BaseModel):
+    verifications: List[ChoreVerificationBulkItem]
+
+class ChoreMemberPair(BaseModel):
+    membership_id: int
+    chore_id: int
+
+class ChoreAutoAssignRequest(BaseModel):
+    preferences: List[ChoreMemberPair] = []  # Chores a member would like to take
+    blackouts: List[ChoreMemberPair] = []  # Chores a member must not be given
+
+class ChoreAutoAssignApplyRequest(BaseModel):
+    assignments: List[ChoreMemberPair]
+
 class ChoreWithCompletionStatus(BaseModel):
     chore_id: int
     room_id: int
@@ -107,4 +126,26 @@ class ChoreWithCompletionStatus(BaseModel):
     pending_completion: Optional[ChoreCompletion] = None
     is_due: bool = False
     is_overdue: bool = False
-    days_until_due: Optional[int] = None
\ No newline at end of file
+    days_until_due: Optional[int] = None
+class ChoreAssignedToUser(BaseModel):
+    chore_id: int
+    room_id: int
+    room_name: str
+    membership_id: int  # The user's membership in the chore's room
+    name: str
+    frequency: str
+    frequency_value: int | None = None
+    day_of_week: int | None = None
+    timing: time | None = None
+    description: str | None = None
+    start_date: datetime | None = None
+    last_completed: datetime | None = None
+    approval_required: bool = False
+    photo_required: bool = False
+    assigned_member_ids: List[int] = []
+    assigned_member_names: List[str] = []
+    pending_completion: Optional[ChoreCompletion] = None
+    due_at: datetime | None = None
+    is_due: bool = False
+    is_overdue: bool = False
+    days_until_due: Optional[int] = None
@@ -76,6 +76,7 @@ class AnnouncementReadRepository:
             FROM announcement a
             LEFT JOIN announcement_read ar ON a.announcement_id = ar.announcement_id 
                 AND ar.membership_id = %s
+            JOIN room r ON a.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE a.room_id = %s AND ar.announcement_id IS NULL
             ORDER BY a.created_at DESC
         """
@@ -1,9 +1,11 @@
 from src.models.announcement import AnnouncementCreateRequest, AnnouncementResponse
 from src.services.database.helper import run_sql
+from src.services.singleflight import coalesce
 from typing import List, Optional
 
 
 class AnnouncementRepository:
+    @coalesce
     def get_announcements_by_room(self, room_id: int, limit: int = 50) -> List[AnnouncementResponse]:
         sql = """
             SELECT 
@@ -17,6 +19,7 @@ class AnnouncementRepository:
             FROM announcement a
             JOIN room_membership rm ON a.created_by = rm.membership_id
             JOIN "user" u ON rm.user_id = u.user_id
+            JOIN room r ON a.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE a.room_id = %s
             ORDER BY a.created_at DESC
             LIMIT %s
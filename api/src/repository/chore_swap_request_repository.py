@@ -4,6 +4,7 @@ from src.models.chore_swap_request import (
     ChoreSwapRequestResponseRequest
 )
 from src.services.database.helper import run_sql
+from src.services.invalidation import invalidate
 
 class ChoreSwapRequestRepository:
     
@@ -87,6 +88,7 @@ class ChoreSwapRequestRepository:
             JOIN "user" u_from ON rm_from.user_id = u_from.user_id
             JOIN room_membership rm_to ON csr.to_membership = rm_to.membership_id
             JOIN "user" u_to ON rm_to.user_id = u_to.user_id
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE c.room_id = %s
             ORDER BY csr.requested_at DESC
         """
@@ -112,15 +114,16 @@ class ChoreSwapRequestRepository:
     def _execute_chore_swap(self, swap_id: int):
         """Execute the actual chore assignment swap"""
         swap_sql = """
-            SELECT chore_id, from_membership, to_membership
-            FROM chore_swap_request
-            WHERE swap_id = %s
+            SELECT csr.chore_id, csr.from_membership, csr.to_membership, c.room_id
+            FROM chore_swap_request csr
+            JOIN chore c ON csr.chore_id = c.chore_id
+            WHERE csr.swap_id = %s
         """
         swap_result = run_sql(swap_sql, (swap_id,))
         if not swap_result:
             return
         
-        chore_id, from_membership, to_membership = swap_result[0]
+        chore_id, from_membership, to_membership, room_id = swap_result[0]
         
         remove_sql = """
             DELETE FROM chore_assignment 
@@ -135,6 +138,7 @@ class ChoreSwapRequestRepository:
             DO UPDATE SET is_active = TRUE, assigned_at = NOW()
         """
         run_sql(add_sql, (chore_id, to_membership))
+        invalidate("chore", room_id=room_id, ids=[chore_id])
     
     def _cancel_redundant_swap_requests(self, accepted_swap_id: int):
         """Cancel other pending swap requests for the same chore from the same requester 
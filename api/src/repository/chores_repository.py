@@ -1,9 +1,21 @@
-from src.models.chore import Chore, ChoreCreateRequest, ChoreWithAssignments, ChoreCompletion, ChoreCompletionCreateRequest, ChoreVerification, ChoreVerificationCreateRequest, ChoreWithCompletionStatus
-from src.services.database.helper import run_sql
+from src.models.chore import Chore, ChoreCreateRequest, ChoreWithAssignments, ChoreCompletion, ChoreCompletionCreateRequest, ChoreVerification, ChoreVerificationCreateRequest, ChoreVerificationBulkItem, ChoreWithCompletionStatus, ChoreAssignedToUser
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from src.services.database.helper import run_sql, transaction
+from src.services.singleflight import coalesce
+from src.services.cache import cached, room_tag
+from src.services.invalidation import invalidate
+from src.services.fairness import compute_fairness
+from src.services.auto_assign import propose_assignment
+from src.utils.chore_frequency import period_interval_sql
 
 class ChoreRepository:
     def get_all_chores(self):
-        sql = "SELECT * FROM chore"
+        sql = """
+            SELECT c.*
+            FROM chore c
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
+        """
         return run_sql(sql, output_class=Chore)
     
     def get_chores_by_user_id(self, user_id: int):
@@ -12,6 +24,7 @@ class ChoreRepository:
                    STRING_AGG(DISTINCT ca.membership_id::text, ',') as assigned_member_ids,
                    STRING_AGG(DISTINCT u.name, ', ') as assigned_member_names
             FROM chore c
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
             JOIN room_membership rm ON c.room_id = rm.room_id
             LEFT JOIN chore_assignment ca ON c.chore_id = ca.chore_id AND ca.is_active = TRUE
             LEFT JOIN room_membership rm_assigned ON ca.membership_id = rm_assigned.membership_id
@@ -30,6 +43,7 @@ class ChoreRepository:
                    STRING_AGG(DISTINCT ca.membership_id::text, ',') as assigned_member_ids,
                    STRING_AGG(DISTINCT u.name, ', ') as assigned_member_names
             FROM chore c
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
             JOIN chore_assignment ca ON c.chore_id = ca.chore_id
             JOIN room_membership rm ON ca.membership_id = rm.membership_id
             LEFT JOIN chore_assignment ca_all ON c.chore_id = ca_all.chore_id AND ca_all.is_active = TRUE
@@ -43,6 +57,63 @@ class ChoreRepository:
         """
         return run_sql(sql, (user_id,), output_class=ChoreWithAssignments)
     
+    def get_user_chores_across_rooms(self, user_id: int):
+        """
+        Active chores assigned to the user in every room they belong to, with
+        assignees, the latest pending completion and due state. A chore is due
+        one period after its last approved completion (from its start date when
+        it was never completed) and overdue once that day has passed.
+        """
+        sql = f"""
+            WITH me AS (
+                SELECT rm.membership_id, rm.room_id, r.name AS room_name
+                FROM room_membership rm
+                JOIN room r ON rm.room_id = r.room_id AND r.deleted_at IS NULL
+                WHERE rm.user_id = %s AND rm.is_active = TRUE
+            )
+            SELECT c.chore_id, c.room_id, me.room_name, me.membership_id, c.name, c.frequency,
+                   c.frequency_value, c.day_of_week, c.timing, c.description, c.start_date,
+                   c.last_completed, c.approval_required, c.photo_required,
+                   assignees.assigned_member_ids, assignees.assigned_member_names,
+                   pending.pending_completion,
+                   due.due_at,
+                   COALESCE(due.due_at <= LOCALTIMESTAMP, FALSE) AS is_due,
+                   COALESCE(due.due_at < CURRENT_DATE, FALSE) AS is_overdue,
+                   due.due_at::date - CURRENT_DATE AS days_until_due
+            FROM me
+            JOIN chore_assignment ca ON ca.membership_id = me.membership_id AND ca.is_active = TRUE
+            JOIN chore c ON ca.chore_id = c.chore_id AND c.is_active = TRUE
+            CROSS JOIN LATERAL (
+                SELECT array_agg(a.membership_id ORDER BY a.membership_id) AS assigned_member_ids,
+                       array_agg(u.name ORDER BY a.membership_id) AS assigned_member_names
+                FROM chore_assignment a
+                JOIN room_membership arm ON a.membership_id = arm.membership_id
+                JOIN "user" u ON arm.user_id = u.user_id
+                WHERE a.chore_id = c.chore_id AND a.is_active = TRUE
+            ) assignees
+            LEFT JOIN LATERAL (
+                SELECT json_build_object(
+                           'completion_id', cc.completion_id, 'chore_id', cc.chore_id,
+                           'membership_id', cc.membership_id, 'completed_at', cc.completed_at,
+                           'photo_url', cc.photo_url, 'status', cc.status, 'created_at', cc.created_at
+                       ) AS pending_completion
+                FROM chore_completion cc
+                WHERE cc.chore_id = c.chore_id AND cc.status = 'pending'
+                ORDER BY cc.completed_at DESC
+                LIMIT 1
+            ) pending ON TRUE
+            CROSS JOIN LATERAL (
+                SELECT CASE
+                           WHEN c.last_completed IS NULL THEN COALESCE(c.start_date::timestamp, c.created_at::timestamp)
+                           ELSE c.last_completed + {period_interval_sql("c.frequency")}
+                       END AS due_at
+            ) due
+            ORDER BY is_overdue DESC, due.due_at NULLS LAST, c.name
+        """
+        return run_sql(sql, (user_id,), output_class=ChoreAssignedToUser)
+
+    @cached(tags=lambda room_id: [room_tag(room_id)])
+    @coalesce
     def get_chores_by_room_id(self, room_id: int):
         sql = """
             SELECT c.*,
@@ -52,6 +123,7 @@ class ChoreRepository:
             LEFT JOIN chore_assignment ca ON c.chore_id = ca.chore_id AND ca.is_active = TRUE
             LEFT JOIN room_membership rm ON ca.membership_id = rm.membership_id
             LEFT JOIN "user" u ON rm.user_id = u.user_id
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE c.room_id = %s
             GROUP BY c.chore_id, c.room_id, c.name, c.frequency, c.frequency_value, 
                      c.day_of_week, c.timing, c.description, c.start_date, 
@@ -66,6 +138,7 @@ class ChoreRepository:
                    STRING_AGG(DISTINCT ca.membership_id::text, ',') as assigned_member_ids,
                    STRING_AGG(DISTINCT u.name, ', ') as assigned_member_names
             FROM chore c
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
             LEFT JOIN chore_assignment ca ON c.chore_id = ca.chore_id AND ca.is_active = TRUE
             LEFT JOIN room_membership rm ON ca.membership_id = rm.membership_id
             LEFT JOIN "user" u ON rm.user_id = u.user_id
@@ -78,6 +151,81 @@ class ChoreRepository:
         result = run_sql(sql, (chore_id,), output_class=ChoreWithAssignments)
         return result[0] if result else None
 
+    def get_chore_detail(self, chore_id: int, completions_limit: int, swaps_limit: int):
+        """
+        The chore with its assignments, latest completions (each with its
+        verification, if any) and latest swap requests, built as one JSON
+        document in a single statement
+        """
+        sql = """
+            SELECT json_build_object(
+                'chore', to_json(c),
+                'room_name', r.name,
+                'assignments', COALESCE((
+                    SELECT json_agg(json_build_object(
+                               'membership_id', ca.membership_id, 'name', u.name, 'assigned_at', ca.assigned_at
+                           ) ORDER BY ca.assigned_at)
+                    FROM chore_assignment ca
+                    JOIN room_membership rm ON ca.membership_id = rm.membership_id
+                    JOIN "user" u ON rm.user_id = u.user_id
+                    WHERE ca.chore_id = c.chore_id AND ca.is_active = TRUE
+                ), '[]'::json),
+                'completion_count', (SELECT COUNT(*) FROM chore_completion WHERE chore_id = c.chore_id),
+                'recent_completions', COALESCE((
+                    SELECT json_agg(json_build_object(
+                               'completion_id', cc.completion_id, 'membership_id', cc.membership_id,
+                               'member_name', u.name, 'completed_at', cc.completed_at, 'photo_url', cc.photo_url,
+                               'status', cc.status, 'created_at', cc.created_at,
+                               'verification', v.verification
+                           ) ORDER BY cc.completed_at DESC, cc.completion_id DESC)
+                    FROM (
+                        SELECT * FROM chore_completion
+                        WHERE chore_id = c.chore_id
+                        ORDER BY completed_at DESC, completion_id DESC
+                        LIMIT %s
+                    ) cc
+                    JOIN room_membership rm ON cc.membership_id = rm.membership_id
+                    JOIN "user" u ON rm.user_id = u.user_id
+                    LEFT JOIN LATERAL (
+                        SELECT json_build_object(
+                                   'verification_id', cv.verification_id, 'verified_by', cv.verified_by,
+                                   'verified_by_name', vu.name, 'verification_type', cv.verification_type,
+                                   'comment', cv.comment, 'verified_at', cv.verified_at
+                               ) AS verification
+                        FROM chore_verification cv
+                        JOIN room_membership vrm ON cv.verified_by = vrm.membership_id
+                        JOIN "user" vu ON vrm.user_id = vu.user_id
+                        WHERE cv.completion_id = cc.completion_id
+                        ORDER BY cv.verified_at DESC
+                        LIMIT 1
+                    ) v ON TRUE
+                ), '[]'::json),
+                'swap_requests', COALESCE((
+                    SELECT json_agg(json_build_object(
+                               'swap_id', csr.swap_id, 'from_membership', csr.from_membership,
+                               'from_user_name', u_from.name, 'to_membership', csr.to_membership,
+                               'to_user_name', u_to.name, 'status', csr.status, 'message', csr.message,
+                               'requested_at', csr.requested_at, 'responded_at', csr.responded_at
+                           ) ORDER BY csr.requested_at DESC)
+                    FROM (
+                        SELECT * FROM chore_swap_request
+                        WHERE chore_id = c.chore_id
+                        ORDER BY requested_at DESC
+                        LIMIT %s
+                    ) csr
+                    JOIN room_membership rm_from ON csr.from_membership = rm_from.membership_id
+                    JOIN "user" u_from ON rm_from.user_id = u_from.user_id
+                    JOIN room_membership rm_to ON csr.to_membership = rm_to.membership_id
+                    JOIN "user" u_to ON rm_to.user_id = u_to.user_id
+                ), '[]'::json)
+            )
+            FROM chore c
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
+            WHERE c.chore_id = %s
+        """
+        result = run_sql(sql, (completions_limit, swaps_limit, chore_id))
+        return result[0][0] if result else None
+
     def add_chore(self, chore: ChoreCreateRequest):
         sql = """
             INSERT INTO chore (
@@ -107,10 +255,11 @@ class ChoreRepository:
         chore_id = result[0][0]
         
         if chore.assigned_member_ids:
-            self.assign_multiple_members(chore_id, chore.assigned_member_ids)
+            self._assign_members(chore_id, chore.assigned_member_ids)
         elif chore.assigned_to:
-            self.assign_chore(chore_id, chore.assigned_to)
+            self._assign(chore_id, chore.assigned_to)
         
+        invalidate("chore", room_id=chore.room_id, ids=[chore_id])
         return {"chore_id": chore_id}
 
     def update_chore(self, chore_id: int, chore: ChoreCreateRequest):
@@ -139,18 +288,39 @@ class ChoreRepository:
         run_sql(sql, params)
         
         if chore.assigned_member_ids:
-            self.assign_multiple_members(chore_id, chore.assigned_member_ids)
+            self._assign_members(chore_id, chore.assigned_member_ids)
         elif chore.assigned_to:
-            self.assign_multiple_members(chore_id, [chore.assigned_to])
+            self._assign_members(chore_id, [chore.assigned_to])
         else:
-            self.unassign_chore(chore_id)
+            self._unassign(chore_id)
+
+        invalidate("chore", room_id=chore.room_id, ids=[chore_id])
 
     def delete_chore(self, chore_id: int):
         """Delete a chore (database CASCADE will handle related data)"""
-        sql = "DELETE FROM chore WHERE chore_id = %s"
-        run_sql(sql, (chore_id,))
+        sql = "DELETE FROM chore WHERE chore_id = %s RETURNING room_id"
+        result = run_sql(sql, (chore_id,))
+        if result:
+            invalidate("chore", room_id=result[0][0], ids=[chore_id])
 
     def assign_chore(self, chore_id: int, membership_id: int):
+        self._assign(chore_id, membership_id)
+        self._invalidate_chore_room(chore_id)
+
+    def unassign_chore(self, chore_id: int, membership_id: int | None = None):
+        self._unassign(chore_id, membership_id)
+        self._invalidate_chore_room(chore_id)
+
+    def assign_multiple_members(self, chore_id: int, membership_ids: list):
+        self._assign_members(chore_id, membership_ids)
+        self._invalidate_chore_room(chore_id)
+
+    def _invalidate_chore_room(self, chore_id: int):
+        result = run_sql("SELECT room_id FROM chore WHERE chore_id = %s", (chore_id,))
+        if result:
+            invalidate("chore", room_id=result[0][0], ids=[chore_id])
+
+    def _assign(self, chore_id: int, membership_id: int):
         sql = """
             INSERT INTO chore_assignment (chore_id, membership_id, is_active)
             VALUES (%s, %s, TRUE)
@@ -159,7 +329,7 @@ class ChoreRepository:
         """
         run_sql(sql, (chore_id, membership_id))
 
-    def unassign_chore(self, chore_id: int, membership_id: int | None = None):
+    def _unassign(self, chore_id: int, membership_id: int | None = None):
         if membership_id:
             sql = "UPDATE chore_assignment SET is_active = FALSE WHERE chore_id = %s AND membership_id = %s"
             run_sql(sql, (chore_id, membership_id))
@@ -167,6 +337,77 @@ class ChoreRepository:
             sql = "UPDATE chore_assignment SET is_active = FALSE WHERE chore_id = %s"
             run_sql(sql, (chore_id,))
 
+    def propose_auto_assignment(self, room_id: int, preferences: List[Tuple[int, int]],
+                                blackouts: List[Tuple[int, int]]):
+        """Balanced one-member-per-chore proposal for the room's active chores; nothing is written"""
+        chores_sql = """
+            SELECT c.chore_id, c.name, c.frequency
+            FROM chore c
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
+            WHERE c.room_id = %s AND c.is_active = TRUE
+            ORDER BY c.chore_id
+        """
+        members_sql = """
+            SELECT rm.membership_id, u.user_id, u.name
+            FROM room_membership rm
+            JOIN room r ON rm.room_id = r.room_id AND r.deleted_at IS NULL
+            JOIN "user" u ON rm.user_id = u.user_id
+            WHERE rm.room_id = %s AND rm.is_active = TRUE
+            ORDER BY rm.membership_id
+        """
+        chores = run_sql(chores_sql, (room_id,))
+        members = run_sql(members_sql, (room_id,))
+        proposal = propose_assignment(chores, members, preferences, blackouts)
+        return {"room_id": room_id, **proposal}
+
+    def apply_auto_assignment(self, room_id: int, assignments: List[Tuple[int, int]]):
+        """
+        Make each (chore_id, membership_id) pair the chore's only active
+        assignment, in one transaction. Returns None, writing nothing, when a
+        chore is not an active chore of the room or a member is not active in it.
+        """
+        chore_ids = [chore_id for chore_id, _ in assignments]
+        membership_ids = [membership_id for _, membership_id in assignments]
+        with transaction():
+            # Shares the lock member removal takes, so members cannot leave mid-apply
+            lock_sql = "SELECT room_id FROM room WHERE room_id = %s AND deleted_at IS NULL FOR SHARE"
+            if not run_sql(lock_sql, (room_id,)):
+                return None
+
+            check_sql = """
+                SELECT COUNT(*)
+                FROM unnest(%s::int[], %s::int[]) AS a(chore_id, membership_id)
+                JOIN chore c ON c.chore_id = a.chore_id AND c.room_id = %s AND c.is_active = TRUE
+                JOIN room_membership rm ON rm.membership_id = a.membership_id AND rm.room_id = %s AND rm.is_active = TRUE
+            """
+            if run_sql(check_sql, (chore_ids, membership_ids, room_id, room_id))[0][0] != len(assignments):
+                return None
+
+            sql = """
+                WITH proposed AS (
+                    SELECT * FROM unnest(%s::int[], %s::int[]) AS a(chore_id, membership_id)
+                ),
+                cleared AS (
+                    UPDATE chore_assignment ca
+                    SET is_active = FALSE
+                    FROM proposed p
+                    WHERE ca.chore_id = p.chore_id AND ca.membership_id <> p.membership_id AND ca.is_active = TRUE
+                    RETURNING ca.assignment_id
+                ),
+                assigned AS (
+                    INSERT INTO chore_assignment (chore_id, membership_id, is_active)
+                    SELECT chore_id, membership_id, TRUE FROM proposed
+                    ON CONFLICT (chore_id, membership_id)
+                    DO UPDATE SET is_active = TRUE,
+                                  assigned_at = CASE WHEN chore_assignment.is_active THEN chore_assignment.assigned_at ELSE now() END
+                    RETURNING assignment_id
+                )
+                SELECT (SELECT COUNT(*) FROM cleared), (SELECT COUNT(*) FROM assigned)
+            """
+            unassigned, assigned = run_sql(sql, (chore_ids, membership_ids))[0]
+            invalidate("chore", room_id=room_id, ids=chore_ids)
+        return {"room_id": room_id, "assigned": assigned, "unassigned": unassigned}
+
     def get_chore_assignments(self, chore_id: int):
         sql = """
             SELECT ca.membership_id, u.name
@@ -177,22 +418,33 @@ class ChoreRepository:
         """
         return run_sql(sql, (chore_id,))
 
-    def assign_multiple_members(self, chore_id: int, membership_ids: list):
-        self.unassign_chore(chore_id)
-        
-        for membership_id in membership_ids:
-            self.assign_chore(chore_id, membership_id)
+    def _assign_members(self, chore_id: int, membership_ids: list):
+        """Make ``membership_ids`` the chore's active assignees in one statement"""
+        sql = """
+            WITH cleared AS (
+                UPDATE chore_assignment
+                SET is_active = FALSE
+                WHERE chore_id = %s AND is_active = TRUE AND NOT (membership_id = ANY(%s::int[]))
+                RETURNING assignment_id
+            )
+            INSERT INTO chore_assignment (chore_id, membership_id, is_active)
+            SELECT DISTINCT %s, membership_id, TRUE FROM unnest(%s::int[]) AS membership_id
+            ON CONFLICT (chore_id, membership_id)
+            DO UPDATE SET is_active = TRUE, assigned_at = now()
+        """
+        membership_ids = list(membership_ids)
+        run_sql(sql, (chore_id, membership_ids, chore_id, membership_ids))
 
     def create_completion(self, membership_id: int, completion_request: ChoreCompletionCreateRequest):
         """Mark a chore as completed by a member"""
         
-        chore_sql = "SELECT approval_required, photo_required FROM chore WHERE chore_id = %s"
+        chore_sql = "SELECT approval_required, photo_required, room_id FROM chore WHERE chore_id = %s"
         chore_result = run_sql(chore_sql, (completion_request.chore_id,))
         
         if not chore_result:
             raise ValueError("Chore not found")
             
-        approval_required, photo_required = chore_result[0]
+        approval_required, photo_required, room_id = chore_result[0]
         
         if photo_required and not completion_request.photo_url:
             raise ValueError("Photo proof is required for this chore")
@@ -221,6 +473,7 @@ class ChoreRepository:
             """
             run_sql(update_sql, (completion_request.chore_id,))
         
+        invalidate("chore", room_id=room_id, ids=[completion_request.chore_id])
         return {
             "completion_id": completion_id,
             "status": initial_status,
@@ -243,6 +496,7 @@ class ChoreRepository:
             JOIN chore c ON cc.chore_id = c.chore_id
             JOIN room_membership rm ON cc.membership_id = rm.membership_id
             JOIN "user" u ON rm.user_id = u.user_id
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE c.room_id = %s AND cc.status = 'pending'
             ORDER BY cc.completed_at DESC
         """
@@ -265,6 +519,152 @@ class ChoreRepository:
         
         return completions
 
+    def get_pending_verifications_for_admin(self, user_id: int, after: Optional[Tuple[datetime, int]], limit: int):
+        """
+        Pending completions across every room the user administers, oldest first.
+        ``after`` is the (completed_at, completion_id) of the last row already seen;
+        completed_at is NOT NULL, so every row sorts after some cursor.
+        """
+        sql = """
+            SELECT cc.completion_id, cc.chore_id, cc.membership_id, cc.completed_at,
+                   cc.photo_url, cc.status, cc.created_at,
+                   c.name as chore_name, c.room_id, r.name as room_name, u.name as completed_by_name
+            FROM room_membership admin
+            JOIN room r ON admin.room_id = r.room_id AND r.deleted_at IS NULL
+            JOIN chore c ON c.room_id = admin.room_id
+            JOIN chore_completion cc ON cc.chore_id = c.chore_id AND cc.status = 'pending'
+            JOIN room_membership rm ON cc.membership_id = rm.membership_id
+            JOIN "user" u ON rm.user_id = u.user_id
+            WHERE admin.user_id = %s AND admin.role = 'admin' AND admin.is_active = TRUE
+        """
+        params = [user_id]
+
+        if after is not None:
+            sql += " AND (cc.completed_at, cc.completion_id) > (%s, %s)"
+            params.extend(after)
+
+        sql += " ORDER BY cc.completed_at, cc.completion_id LIMIT %s"
+        params.append(limit)
+
+        results = run_sql(sql, params)
+        columns = ["completion_id", "chore_id", "membership_id", "completed_at", "photo_url", "status",
+                   "created_at", "chore_name", "room_id", "room_name", "completed_by_name"]
+        return [dict(zip(columns, row)) for row in results]
+
+    def get_user_completion_history(self, user_id: int, room_id: Optional[int] = None, **filters):
+        scope_sql = "cc.membership_id IN (SELECT membership_id FROM room_membership WHERE user_id = %s)"
+        scope_params = [user_id]
+        if room_id:
+            scope_sql += " AND c.room_id = %s"
+            scope_params.append(room_id)
+        return self._completion_history(scope_sql, scope_params, **filters)
+
+    def get_room_completion_history(self, room_id: int, **filters):
+        return self._completion_history("c.room_id = %s", [room_id], **filters)
+
+    def get_chore_completion_history(self, chore_id: int, **filters):
+        return self._completion_history("cc.chore_id = %s", [chore_id], **filters)
+
+    def _completion_history(self, scope_sql: str, scope_params: list, after: Optional[Tuple[datetime, int]],
+                            limit: int, status: Optional[str] = None, from_date: Optional[date] = None,
+                            to_date: Optional[date] = None):
+        """
+        Completions matching ``scope_sql``, newest first. ``after`` is the
+        (completed_at, completion_id) of the last row already seen, a total
+        order since completed_at is NOT NULL; the date range is inclusive on
+        both ends.
+        """
+        sql = f"""
+            SELECT cc.completion_id, cc.chore_id, cc.membership_id, cc.completed_at,
+                   cc.photo_url, cc.status, cc.created_at,
+                   c.name as chore_name, c.room_id, u.name as completed_by_name
+            FROM chore_completion cc
+            JOIN chore c ON cc.chore_id = c.chore_id
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
+            JOIN room_membership rm ON cc.membership_id = rm.membership_id
+            JOIN "user" u ON rm.user_id = u.user_id
+            WHERE {scope_sql}
+        """
+        params = list(scope_params)
+
+        if status:
+            sql += " AND cc.status = %s"
+            params.append(status)
+        if from_date:
+            sql += " AND cc.completed_at >= %s"
+            params.append(from_date)
+        if to_date:
+            sql += " AND cc.completed_at < %s"
+            params.append(to_date + timedelta(days=1))
+        if after is not None:
+            sql += " AND (cc.completed_at, cc.completion_id) < (%s, %s)"
+            params.extend(after)
+
+        sql += " ORDER BY cc.completed_at DESC, cc.completion_id DESC LIMIT %s"
+        params.append(limit)
+
+        results = run_sql(sql, params)
+        columns = ["completion_id", "chore_id", "membership_id", "completed_at", "photo_url", "status",
+                   "created_at", "chore_name", "room_id", "completed_by_name"]
+        return [dict(zip(columns, row)) for row in results]
+
+    @cached(tags=lambda room_id, from_date, to_date: [room_tag(room_id)])
+    def get_room_fairness(self, room_id: int, from_date: date, to_date: date):
+        """Per-member completed, assigned, missed and swapped-away counts with effort scores"""
+        window_start = datetime.combine(from_date, datetime.min.time(), tzinfo=timezone.utc)
+        window_end = min(datetime.combine(to_date + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc),
+                         datetime.now(timezone.utc))
+
+        members_sql = """
+            SELECT rm.membership_id, u.user_id, u.name
+            FROM room_membership rm
+            JOIN room r ON rm.room_id = r.room_id AND r.deleted_at IS NULL
+            JOIN "user" u ON rm.user_id = u.user_id
+            WHERE rm.room_id = %s AND rm.is_active = TRUE
+            ORDER BY rm.membership_id
+        """
+        chores_sql = "SELECT chore_id, frequency FROM chore WHERE room_id = %s"
+        completions_sql = """
+            SELECT cc.membership_id, cc.chore_id
+            FROM chore_completion cc
+            JOIN chore c ON cc.chore_id = c.chore_id
+            WHERE c.room_id = %s AND cc.status <> 'rejected'
+              AND cc.completed_at >= %s AND cc.completed_at < %s
+        """
+        assignments_sql = """
+            SELECT ca.membership_id, ca.chore_id,
+                   EXTRACT(EPOCH FROM ca.assigned_at)::float8,
+                   EXTRACT(EPOCH FROM now())::float8,
+                   1.0::float8 / COUNT(*) OVER (PARTITION BY ca.chore_id)
+            FROM chore_assignment ca
+            JOIN chore c ON ca.chore_id = c.chore_id
+            WHERE c.room_id = %s AND c.is_active = TRUE AND ca.is_active = TRUE AND ca.assigned_at < %s
+            UNION ALL
+            SELECT h.membership_id, h.chore_id,
+                   EXTRACT(EPOCH FROM h.assigned_at)::float8,
+                   EXTRACT(EPOCH FROM COALESCE(h.completed_at, now()))::float8,
+                   1.0::float8
+            FROM chore_assignment_history h
+            JOIN chore c ON h.chore_id = c.chore_id
+            WHERE c.room_id = %s AND h.assigned_at < %s
+              AND (h.completed_at IS NULL OR h.completed_at >= %s)
+        """
+        swaps_sql = """
+            SELECT csr.from_membership
+            FROM chore_swap_request csr
+            JOIN chore c ON csr.chore_id = c.chore_id
+            WHERE c.room_id = %s AND csr.status = 'accepted'
+              AND csr.responded_at >= %s AND csr.responded_at < %s
+        """
+        members = run_sql(members_sql, (room_id,))
+        chores = run_sql(chores_sql, (room_id,))
+        completions = run_sql(completions_sql, (room_id, from_date, to_date + timedelta(days=1)))
+        assignments = run_sql(assignments_sql, (room_id, window_end, room_id, window_end, window_start))
+        swaps = run_sql(swaps_sql, (room_id, window_start, window_end))
+
+        result = compute_fairness(members, chores, completions, assignments, swaps, window_start, window_end)
+        return {"room_id": room_id, "from": from_date, "to": to_date, **result}
+
     def get_user_completions(self, user_id: int, room_id: int = None):
         """Get completion history for a user"""
         base_sql = """
@@ -322,8 +722,96 @@ class ChoreRepository:
             """
             run_sql(chore_update_sql, (verification_request.completion_id, verification_request.completion_id))
         
+        room_sql = """
+            SELECT c.room_id
+            FROM chore_completion cc
+            JOIN chore c ON cc.chore_id = c.chore_id
+            WHERE cc.completion_id = %s
+        """
+        room_result = run_sql(room_sql, (verification_request.completion_id,))
+        if room_result:
+            invalidate("chore_completion", room_id=room_result[0][0], ids=[verification_request.completion_id])
+        
         return {"verification_id": verification_id}
 
+    def create_verifications_bulk(self, room_id: int, verified_by_membership_id: int,
+                                  verifications: List[ChoreVerificationBulkItem]):
+        """
+        Verify many pending completions of a room in one statement. Completions
+        that are not pending or belong to another room are skipped. Each approved
+        chore's last_completed moves forward to its latest approved completion.
+        """
+        sql = """
+            WITH input AS (
+                -- A completion listed twice keeps its last entry
+                SELECT DISTINCT ON (completion_id) completion_id, verification_type, comment
+                FROM unnest(%s::int[], %s::text[], %s::text[]) WITH ORDINALITY
+                     AS i(completion_id, verification_type, comment, position)
+                ORDER BY completion_id, position DESC
+            ),
+            targets AS (
+                SELECT cc.completion_id, cc.chore_id, cc.completed_at, i.verification_type, i.comment
+                FROM input i
+                JOIN chore_completion cc ON cc.completion_id = i.completion_id
+                JOIN chore c ON cc.chore_id = c.chore_id
+                WHERE c.room_id = %s AND cc.status = 'pending'
+                FOR UPDATE OF cc
+            ),
+            inserted AS (
+                INSERT INTO chore_verification (completion_id, verified_by, verification_type, comment)
+                SELECT completion_id, %s, verification_type, comment
+                FROM targets
+                RETURNING verification_id, completion_id
+            ),
+            updated AS (
+                UPDATE chore_completion cc
+                SET status = t.verification_type
+                FROM targets t
+                WHERE cc.completion_id = t.completion_id
+                RETURNING cc.completion_id, cc.status
+            ),
+            approved_chores AS (
+                UPDATE chore c
+                SET last_completed = GREATEST(c.last_completed, a.latest_completed_at),
+                    updated_at = CURRENT_TIMESTAMP
+                FROM (
+                    SELECT chore_id, MAX(completed_at) AS latest_completed_at
+                    FROM targets
+                    WHERE verification_type = 'approved'
+                    GROUP BY chore_id
+                ) a
+                WHERE c.chore_id = a.chore_id
+                RETURNING c.chore_id
+            )
+            SELECT i.completion_id, i.verification_id, u.status,
+                   (SELECT COUNT(*) FROM approved_chores)
+            FROM inserted i
+            JOIN updated u ON i.completion_id = u.completion_id
+            ORDER BY i.completion_id
+        """
+        params = (
+            [v.completion_id for v in verifications],
+            [v.verification_type for v in verifications],
+            [v.comment for v in verifications],
+            room_id,
+            verified_by_membership_id,
+        )
+        with transaction():
+            results = run_sql(sql, params)
+            verified_ids = [row[0] for row in results]
+            if verified_ids:
+                invalidate("chore_completion", room_id=room_id, ids=verified_ids)
+
+        skipped = sorted({v.completion_id for v in verifications} - set(verified_ids))
+        return {
+            "verified": [
+                {"completion_id": row[0], "verification_id": row[1], "status": row[2]}
+                for row in results
+            ],
+            "skipped": skipped,
+            "chores_updated": results[0][3] if results else 0
+        }
+
     def get_verification_by_completion_id(self, completion_id: int):
         """Get verification details for a specific completion"""
         sql = """
@@ -352,6 +840,8 @@ class ChoreRepository:
             "verified_at": verification[5]
         }
 
+    @cached(tags=lambda room_id, user_id: [room_tag(room_id)])
+    @coalesce
     def get_chores_with_completion_status(self, room_id: int, user_id: int = None):
         """Get chores with their completion status"""
         sql = """
@@ -379,6 +869,7 @@ class ChoreRepository:
             LEFT JOIN room_membership rm ON ca.membership_id = rm.membership_id
             LEFT JOIN "user" u ON rm.user_id = u.user_id
             LEFT JOIN chore_completion cc ON c.chore_id = cc.chore_id AND cc.status = 'pending'
+            JOIN room r ON c.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE c.room_id = %s AND c.is_active = TRUE
         """
         params = [room_id]
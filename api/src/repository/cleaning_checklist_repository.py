@@ -29,6 +29,7 @@ class CleaningChecklistRepository:
             AND cs.marked_date = %s
         LEFT JOIN room_membership rm ON cs.membership_id = rm.membership_id
         LEFT JOIN "user" u ON rm.user_id = u.user_id
+        JOIN room r ON cl.room_id = r.room_id AND r.deleted_at IS NULL
         WHERE cl.room_id = %s
         GROUP BY cl.checklist_item_id, cl.room_id, cl.title, cl.description, cl.is_default
         ORDER BY cl.is_default DESC, cl.checklist_item_id ASC
@@ -183,6 +184,7 @@ class CleaningCheckStatusRepository:
                cs.marked_date, cs.is_completed, cs.updated_at
         FROM cleaning_check_status cs
         JOIN cleaning_checklist cl ON cs.checklist_item_id = cl.checklist_item_id
+        JOIN room r ON cl.room_id = r.room_id AND r.deleted_at IS NULL
         WHERE cl.room_id = %s AND cs.marked_date BETWEEN %s AND %s
         ORDER BY cs.marked_date DESC, cs.checklist_item_id ASC
         """
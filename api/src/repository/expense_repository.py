@@ -1,6 +1,9 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 from src.services.database.helper import run_sql
+from src.services.singleflight import coalesce
+from src.services.cache import cached, room_tag
+from src.services.invalidation import invalidate
 from src.models.expense import ExpenseCreateRequest, ExpenseUpdateRequest, Expense, ExpenseSplit, ExpenseWithSplits, ExpensePaymentRequest
 from decimal import Decimal
 
@@ -44,8 +47,11 @@ class ExpenseRepository:
             split_params = (expense_id, membership_id, amount_per_person, is_paid, paid_at)
             run_sql(split_sql, split_params)
         
+        invalidate("expense", room_id=expense.room_id, ids=[expense_id])
         return {"expense_id": expense_id, "amount_per_person": float(amount_per_person)}
     
+    @cached(tags=lambda room_id: [room_tag(room_id)])
+    @coalesce
     def get_expenses_by_room(self, room_id: int) -> List[ExpenseWithSplits]:
         sql = """
             SELECT 
@@ -54,27 +60,27 @@ class ExpenseRepository:
             FROM expense e
             JOIN room_membership rm ON e.payer_membership_id = rm.membership_id
             JOIN "user" u ON rm.user_id = u.user_id
+            JOIN room r ON e.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE e.room_id = %s
             ORDER BY e.created_at DESC
         """
         
         expenses_data = run_sql(sql, (room_id,))
-        expenses = []
-        
-        for expense_row in expenses_data:
-            splits_sql = """
-                SELECT es.split_id, es.expense_id, es.membership_id, es.amount_owed, es.is_paid, es.paid_at,
-                       u.name as member_name
-                FROM expense_split es
-                JOIN room_membership rm ON es.membership_id = rm.membership_id
-                JOIN "user" u ON rm.user_id = u.user_id
-                WHERE es.expense_id = %s
-                ORDER BY u.name
-            """
-            
-            splits_data = run_sql(splits_sql, (expense_row[0],))
-            splits = [
-                {
+
+        # Splits for every expense in one statement rather than one per expense
+        splits_sql = """
+            SELECT es.split_id, es.expense_id, es.membership_id, es.amount_owed, es.is_paid, es.paid_at,
+                   u.name as member_name
+            FROM expense_split es
+            JOIN room_membership rm ON es.membership_id = rm.membership_id
+            JOIN "user" u ON rm.user_id = u.user_id
+            WHERE es.expense_id = ANY(%s)
+            ORDER BY es.expense_id, u.name
+        """
+        splits_by_expense = {}
+        if expenses_data:
+            for split in run_sql(splits_sql, ([row[0] for row in expenses_data],)):
+                splits_by_expense.setdefault(split[1], []).append({
                     "split_id": split[0],
                     "expense_id": split[1],
                     "membership_id": split[2],
@@ -82,10 +88,10 @@ class ExpenseRepository:
                     "is_paid": split[4],
                     "paid_at": split[5],
                     "member_name": split[6]
-                }
-                for split in splits_data
-            ]
-            
+                })
+
+        expenses = []
+        for expense_row in expenses_data:
             expense = {
                 "expense_id": expense_row[0],
                 "room_id": expense_row[1],
@@ -97,7 +103,7 @@ class ExpenseRepository:
                 "expense_date": expense_row[7],
                 "receipt_url": expense_row[8],
                 "created_at": expense_row[9],
-                "splits": splits
+                "splits": splits_by_expense.get(expense_row[0], [])
             }
             expenses.append(expense)
         
@@ -161,19 +167,25 @@ class ExpenseRepository:
     def mark_split_as_paid(self, payment: ExpensePaymentRequest):
         """Mark a split as paid"""
         sql = """
-            UPDATE expense_split 
+            UPDATE expense_split es
             SET is_paid = TRUE, paid_at = %s
-            WHERE split_id = %s AND membership_id = %s
+            FROM expense e
+            WHERE es.expense_id = e.expense_id AND es.split_id = %s AND es.membership_id = %s
+            RETURNING e.room_id, es.expense_id
         """
         params = (datetime.now(timezone.utc), payment.split_id, payment.membership_id)
-        run_sql(sql, params)
+        result = run_sql(sql, params)
+        if result:
+            invalidate("expense", room_id=result[0][0], ids=[result[0][1]])
         return {"success": True, "message": "Payment recorded successfully"}
     
+    @cached(tags=lambda membership_id, room_id: [room_tag(room_id)])
     def get_user_expenses_summary(self, membership_id: int, room_id: int):
         owes_sql = """
             SELECT COALESCE(SUM(amount_owed), 0) as total_owed
             FROM expense_split es
             JOIN expense e ON es.expense_id = e.expense_id
+            JOIN room r ON e.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE es.membership_id = %s AND e.room_id = %s AND es.is_paid = FALSE
         """
         owes_result = run_sql(owes_sql, (membership_id, room_id))
@@ -183,6 +195,7 @@ class ExpenseRepository:
             SELECT COALESCE(SUM(es.amount_owed), 0) as total_owed_to_user
             FROM expense_split es
             JOIN expense e ON es.expense_id = e.expense_id
+            JOIN room r ON e.room_id = r.room_id AND r.deleted_at IS NULL
             WHERE e.payer_membership_id = %s AND e.room_id = %s 
             AND es.membership_id != %s AND es.is_paid = FALSE
         """
@@ -237,6 +250,7 @@ class ExpenseRepository:
             split_params = (expense.expense_id, membership_id, amount_per_person, is_paid, paid_at)
             run_sql(split_sql, split_params)
         
+        invalidate("expense", room_id=expense.room_id, ids=[expense.expense_id])
         return {"expense_id": expense.expense_id, "amount_per_person": float(amount_per_person)}
     
     def delete_expense(self, expense_id: int):
@@ -245,10 +259,12 @@ class ExpenseRepository:
         run_sql(delete_splits_sql, (expense_id,))
         
         # Delete the expense
-        delete_expense_sql = "DELETE FROM expense WHERE expense_id = %s"
+        delete_expense_sql = "DELETE FROM expense WHERE expense_id = %s RETURNING room_id"
         result = run_sql(delete_expense_sql, (expense_id,))
         
         if not result:
             raise ValueError(f"Expense with ID {expense_id} not found")
         
+        invalidate("expense", room_id=result[0][0], ids=[expense_id])
+        
         return {"success": True}
@@ -0,0 +1,62 @@
+from psycopg.types.json import Jsonb
+from src.services.database.helper import run_sql
+
+class IdempotencyRepository:
+    def acquire_lock(self, user_scope: str, route: str, idempotency_key: str):
+        """Transaction-scoped advisory lock so concurrent duplicates run one at a time"""
+        sql = "SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))"
+        run_sql(sql, (f"{user_scope}:{route}:{idempotency_key}",))
+
+    def get_response(self, user_scope: str, route: str, idempotency_key: str):
+        sql = """
+            SELECT request_hash, status_code, response_body
+            FROM idempotency_key
+            WHERE user_scope = %s AND route = %s AND idempotency_key = %s
+              AND expires_at > now()
+        """
+        result = run_sql(sql, (user_scope, route, idempotency_key))
+
+        if not result:
+            return None
+
+        request_hash, status_code, response_body = result[0]
+        return {
+            "request_hash": request_hash,
+            "status_code": status_code,
+            "response_body": response_body
+        }
+
+    def save_response(self, user_scope: str, route: str, idempotency_key: str, request_hash: str,
+                      status_code: int, response_body, ttl_seconds: int):
+        sql = """
+            INSERT INTO idempotency_key (
+                idempotency_key, user_scope, route, request_hash,
+                status_code, response_body, expires_at
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, now() + make_interval(secs => %s))
+            ON CONFLICT (user_scope, route, idempotency_key)
+            DO UPDATE SET request_hash = EXCLUDED.request_hash,
+                          status_code = EXCLUDED.status_code,
+                          response_body = EXCLUDED.response_body,
+                          created_at = now(),
+                          expires_at = EXCLUDED.expires_at
+        """
+        params = (
+            idempotency_key,
+            user_scope,
+            route,
+            request_hash,
+            status_code,
+            Jsonb(response_body),
+            ttl_seconds,
+        )
+        run_sql(sql, params)
+
+    def purge_expired(self):
+        sql = """
+            WITH deleted AS (
+                DELETE FROM idempotency_key WHERE expires_at <= now() RETURNING 1
+            )
+            SELECT COUNT(*) FROM deleted
+        """
+        return run_sql(sql)[0][0]
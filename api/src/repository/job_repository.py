@@ -0,0 +1,140 @@
+from datetime import datetime
+from typing import List, Optional
+from psycopg.types.json import Jsonb
+from src.services.database.helper import run_sql
+
+class JobRepository:
+    def enqueue(self, name: str, payload: dict, queue: str, run_at: Optional[datetime], delay_seconds: float,
+                max_attempts: int) -> int:
+        sql = """
+            INSERT INTO job (queue, name, payload, max_attempts, run_at)
+            VALUES (%s, %s, %s, %s, COALESCE(%s, now()) + make_interval(secs => %s))
+            RETURNING job_id
+        """
+        result = run_sql(sql, (queue, name, Jsonb(payload), max_attempts, run_at, delay_seconds))
+        return result[0][0]
+
+    def enqueue_periodic(self, name: str, queue: str, every_seconds: float, max_attempts: int) -> Optional[int]:
+        """
+        Enqueue ``name`` unless a run is already queued or running, or one
+        finished less than ``every_seconds`` ago; the job table is the schedule,
+        so any number of workers can call this.
+        """
+        sql = """
+            INSERT INTO job (queue, name, payload, max_attempts)
+            SELECT %s, %s, '{}', %s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM job
+                WHERE name = %s
+                  AND (status IN ('queued', 'running') OR finished_at > now() - make_interval(secs => %s))
+            )
+            RETURNING job_id
+        """
+        result = run_sql(sql, (queue, name, max_attempts, name, every_seconds))
+        return result[0][0] if result else None
+
+    def claim(self, queue: str, worker_id: str, limit: int = 1) -> List[dict]:
+        """Mark up to ``limit`` due jobs as running; rows locked by other workers are skipped, not waited on"""
+        sql = """
+            UPDATE job
+            SET status = 'running', attempts = attempts + 1, locked_by = %s, locked_at = now()
+            WHERE job_id IN (
+                SELECT job_id FROM job
+                WHERE queue = %s AND status = 'queued' AND run_at <= now()
+                ORDER BY run_at, job_id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING job_id, name, payload, attempts, max_attempts
+        """
+        results = run_sql(sql, (worker_id, queue, limit))
+        return [
+            {
+                "job_id": row[0],
+                "name": row[1],
+                "payload": row[2],
+                "attempts": row[3],
+                "max_attempts": row[4]
+            }
+            for row in results
+        ]
+
+    def mark_succeeded(self, job_id: int):
+        sql = """
+            UPDATE job
+            SET status = 'succeeded', finished_at = now(), locked_by = NULL, locked_at = NULL
+            WHERE job_id = %s
+        """
+        run_sql(sql, (job_id,))
+
+    def mark_failed(self, job_id: int, error: str, retry_in_seconds: Optional[float]):
+        """Requeue after ``retry_in_seconds``, or fail permanently when it is None"""
+        sql = """
+            UPDATE job
+            SET status = CASE WHEN %s::float IS NULL THEN 'failed' ELSE 'queued' END,
+                run_at = CASE WHEN %s::float IS NULL THEN run_at ELSE now() + make_interval(secs => %s) END,
+                finished_at = CASE WHEN %s::float IS NULL THEN now() END,
+                last_error = %s,
+                locked_by = NULL,
+                locked_at = NULL
+            WHERE job_id = %s
+        """
+        run_sql(sql, (retry_in_seconds, retry_in_seconds, retry_in_seconds, retry_in_seconds, error, job_id))
+
+    def set_progress(self, job_id: int, progress: dict):
+        sql = "UPDATE job SET progress = %s, locked_at = now() WHERE job_id = %s"
+        run_sql(sql, (Jsonb(progress), job_id))
+
+    def requeue_stale(self, timeout_seconds: float) -> int:
+        """Return jobs whose worker died mid-run to the queue (or fail them when out of attempts)"""
+        sql = """
+            UPDATE job
+            SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                finished_at = CASE WHEN attempts >= max_attempts THEN now() END,
+                last_error = 'Worker ' || locked_by || ' stopped responding',
+                locked_by = NULL,
+                locked_at = NULL
+            WHERE status = 'running' AND locked_at < now() - make_interval(secs => %s)
+            RETURNING job_id
+        """
+        return len(run_sql(sql, (timeout_seconds,)))
+
+    def delete_finished(self, older_than_seconds: float) -> int:
+        sql = """
+            DELETE FROM job
+            WHERE status = 'succeeded' AND finished_at < now() - make_interval(secs => %s)
+            RETURNING job_id
+        """
+        return len(run_sql(sql, (older_than_seconds,)))
+
+    def get_job(self, job_id: int):
+        sql = """
+            SELECT job_id, queue, name, payload, status, attempts, max_attempts, run_at,
+                   locked_by, locked_at, last_error, progress, created_at, finished_at
+            FROM job
+            WHERE job_id = %s
+        """
+        result = run_sql(sql, (job_id,))
+        if not result:
+            return None
+        columns = ["job_id", "queue", "name", "payload", "status", "attempts", "max_attempts", "run_at",
+                   "locked_by", "locked_at", "last_error", "progress", "created_at", "finished_at"]
+        return dict(zip(columns, result[0]))
+
+    def get_queue_counts(self):
+        sql = """
+            SELECT queue, status, COUNT(*), MIN(run_at) FILTER (WHERE status = 'queued')
+            FROM job
+            GROUP BY queue, status
+            ORDER BY queue, status
+        """
+        results = run_sql(sql)
+        return [
+            {
+                "queue": row[0],
+                "status": row[1],
+                "count": row[2],
+                "oldest_run_at": row[3]
+            }
+            for row in results
+        ]
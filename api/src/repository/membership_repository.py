@@ -1,7 +1,104 @@
-from src.services.database.helper import run_sql
+from src.services.database.helper import run_sql, transaction
+from src.services.singleflight import coalesce
+from src.services.cache import cached, room_tag, user_tag
+from src.services.invalidation import invalidate
+from src.services.job_queue import enqueue
+from src.repository.rooms_repository import RoomRepository
 from src.models.membership import Role, MembershipCreateRequest
 
+room_repo = RoomRepository()
+
+# Data-modifying CTEs share one snapshot, so each one selects disjoint rows
+# (splits on the member's expenses are split into theirs and everyone
+# else's). Announcements, reactions, reads, cleaning statuses and
+# chore assignments go through ON DELETE CASCADE as well, but are deleted
+# explicitly where the count is worth reporting.
+REMOVE_MEMBER_SQL = """
+    WITH target AS (
+        SELECT membership_id FROM room_membership
+        WHERE membership_id = %s AND room_id = %s
+    ),
+    unassigned_chores AS (
+        UPDATE chore SET assigned_to = NULL
+        WHERE assigned_to IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    verifications AS (
+        DELETE FROM chore_verification
+        WHERE verified_by IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    completions AS (
+        DELETE FROM chore_completion
+        WHERE membership_id IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    swap_requests AS (
+        DELETE FROM chore_swap_request
+        WHERE from_membership IN (SELECT membership_id FROM target)
+           OR to_membership IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    assignment_history AS (
+        DELETE FROM chore_assignment_history
+        WHERE membership_id IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    assignments AS (
+        DELETE FROM chore_assignment
+        WHERE membership_id IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    own_splits AS (
+        DELETE FROM expense_split
+        WHERE membership_id IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    paid_expenses AS (
+        DELETE FROM expense
+        WHERE payer_membership_id IN (SELECT membership_id FROM target)
+        RETURNING expense_id
+    ),
+    other_splits AS (
+        DELETE FROM expense_split
+        WHERE expense_id IN (SELECT expense_id FROM paid_expenses)
+          AND membership_id NOT IN (SELECT membership_id FROM target)
+        RETURNING 1
+    ),
+    membership AS (
+        DELETE FROM room_membership
+        WHERE membership_id IN (SELECT membership_id FROM target)
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM membership),
+        (SELECT COUNT(*) FROM unassigned_chores),
+        (SELECT COUNT(*) FROM assignments),
+        (SELECT COUNT(*) FROM assignment_history),
+        (SELECT COUNT(*) FROM completions),
+        (SELECT COUNT(*) FROM verifications),
+        (SELECT COUNT(*) FROM swap_requests),
+        (SELECT COUNT(*) FROM paid_expenses),
+        (SELECT COUNT(*) FROM own_splits) + (SELECT COUNT(*) FROM other_splits),
+        (SELECT COUNT(*) FROM room_membership
+         WHERE room_id = %s AND is_active = TRUE
+           AND membership_id NOT IN (SELECT membership_id FROM target))
+"""
+REMOVE_MEMBER_COUNTS = [
+    "room_membership",
+    "chore_unassigned",
+    "chore_assignment",
+    "chore_assignment_history",
+    "chore_completion",
+    "chore_verification",
+    "chore_swap_request",
+    "expense",
+    "expense_split",
+    "remaining_members",
+]
+
 class MembershipRepository:
+    @cached(tags=lambda user_id, room_id: [room_tag(room_id), user_tag(user_id)])
     def get_membership_by_user_and_room(self, user_id: int, room_id: int):
         sql = """
             SELECT membership_id, role
@@ -16,6 +113,7 @@ class MembershipRepository:
         membership_id, role = result[0]
         return {"membership_id": membership_id, "role": role}
     
+    @cached(tags=lambda user_id, room_id: [room_tag(room_id), user_tag(user_id)])
     def is_admin(self, user_id: int, room_id: int):
         sql = """
             SELECT role
@@ -30,6 +128,7 @@ class MembershipRepository:
         role = result[0][0]
         return role == Role.ADMIN.value
     
+    @cached(tags=lambda user_id, room_id: [room_tag(room_id), user_tag(user_id)])
     def get_user_role(self, user_id: int, room_id: int) -> str:
         sql = """
             SELECT role
@@ -44,6 +143,9 @@ class MembershipRepository:
         return result[0][0]
     
     def create_membership(self, membership: MembershipCreateRequest):
+        """
+        Add a user to a room, or return None if the room does not exist or was deleted
+        """
         sql = """
             INSERT INTO room_membership (user_id, room_id, role, joined_at)
             VALUES (%s, %s, %s, NOW())
@@ -55,43 +157,50 @@ class MembershipRepository:
             membership.role.value,
         )
         
-        result = run_sql(sql, params)
+        with transaction():
+            if not self._lock_room(membership.room_id, shared=True):
+                return None
+            result = run_sql(sql, params)
+        invalidate("user", room_id=membership.room_id, ids=[membership.user_id])
         return {"membership_id": result[0][0], "role": membership.role.value}
     
     def join_room_by_code(self, user_id: int, room_code: str):
+        # Share-lock the room so a last member leaving cannot delete it under the join
         room_sql = """
             SELECT room_id
             FROM room
-            WHERE room_code = %s
+            WHERE room_code = %s AND deleted_at IS NULL
+            FOR SHARE
         """
-        room_result = run_sql(room_sql, (room_code,))
-        if not room_result:
-            return {"error": "Room not found with the provided code"}
-        room_id = room_result[0][0]
-        
         existing_sql = """
             SELECT membership_id, role
             FROM room_membership
             WHERE user_id = %s AND room_id = %s AND is_active = TRUE
         """
-        existing_result = run_sql(existing_sql, (user_id, room_id))
-        
-        if existing_result:
-            membership_id, role = existing_result[0]
-            return {
-                "membership_id": membership_id, 
-                "role": role,
-                "room_id": room_id,
-                "message": "Already a member of this room"
-            }
-        
         membership_sql = """
             INSERT INTO room_membership (user_id, room_id, role, joined_at)
             VALUES (%s, %s, %s, NOW())
             RETURNING membership_id
         """
-        membership_params = (user_id, room_id, Role.MEMBER.value)
-        membership_result = run_sql(membership_sql, membership_params)
+        with transaction():
+            room_result = run_sql(room_sql, (room_code,))
+            if not room_result:
+                return {"error": "Room not found with the provided code"}
+            room_id = room_result[0][0]
+
+            existing_result = run_sql(existing_sql, (user_id, room_id))
+            if existing_result:
+                membership_id, role = existing_result[0]
+                return {
+                    "membership_id": membership_id, 
+                    "role": role,
+                    "room_id": room_id,
+                    "message": "Already a member of this room"
+                }
+
+            membership_params = (user_id, room_id, Role.MEMBER.value)
+            membership_result = run_sql(membership_sql, membership_params)
+        invalidate("user", room_id=room_id, ids=[user_id])
         
         return {
             "membership_id": membership_result[0][0], 
@@ -108,8 +217,11 @@ class MembershipRepository:
         """
         params = (new_role.value, user_id, room_id)
         run_sql(sql, params)
+        invalidate("user", room_id=room_id, ids=[user_id])
         return {"user_id": user_id, "room_id": room_id, "new_role": new_role.value}
     
+    @cached(tags=lambda room_id: [room_tag(room_id)])
+    @coalesce
     def get_members_by_room_id(self, room_id: int):
         sql = """
             SELECT u.user_id, u.name, rm.membership_id, rm.role
@@ -132,110 +244,101 @@ class MembershipRepository:
         """
         Handle leaving a room and auto-delete room if last member
         """
-        run_sql("UPDATE chore SET assigned_to = NULL WHERE assigned_to = %s", (membership_id,))
-        run_sql("DELETE FROM chore_verification WHERE verified_by = %s", (membership_id,))
-        run_sql("DELETE FROM expense_split WHERE membership_id = %s", (membership_id,))
-        run_sql("DELETE FROM chore_completion WHERE membership_id = %s", (membership_id,))
-        run_sql("DELETE FROM chore_swap_request WHERE from_membership = %s OR to_membership = %s", (membership_id, membership_id,))
-        run_sql("DELETE FROM chore_assignment_history WHERE membership_id = %s", (membership_id,))
-        run_sql("DELETE FROM expense WHERE payer_membership_id = %s", (membership_id,))
-        
-        run_sql("DELETE FROM room_membership WHERE membership_id = %s", (membership_id,))
-        
-        remaining_members_sql = """
-            SELECT COUNT(*) FROM room_membership 
-            WHERE room_id = %s AND is_active = TRUE
-        """
-        remaining_count = run_sql(remaining_members_sql, (room_id,))[0][0]
-        
-        if remaining_count == 0:
-            self._delete_room_completely(room_id)
-            return {
-                "left_room": True,
-                "room_deleted": True,
-                "membership_id": membership_id,
-                "message": "Left room successfully. Room was deleted as you were the last member."
-            }
-        else:
-            return {
-                "left_room": True,
-                "room_deleted": False,
-                "membership_id": membership_id,
-                "message": "Left room successfully."
-            }
+        with transaction():
+            if not self._lock_room(room_id):
+                return {"left_room": False, "message": "Room not found"}
+
+            removed = self._remove_member(membership_id, room_id)
+            if removed is None:
+                return {"left_room": False, "message": "Membership not found in room"}
+
+            if removed["remaining_members"] == 0:
+                job_id = self._delete_room(room_id)
+                return {
+                    "left_room": True,
+                    "room_deleted": True,
+                    "deletion_job_id": job_id,
+                    "membership_id": membership_id,
+                    "removed": removed["rows"],
+                    "message": "Left room successfully. Room was deleted as you were the last member."
+                }
+            else:
+                return {
+                    "left_room": True,
+                    "room_deleted": False,
+                    "membership_id": membership_id,
+                    "removed": removed["rows"],
+                    "message": "Left room successfully."
+                }
     
     def remove_user(self, admin_membership_id: int, target_membership_id: int, room_id: int):
         """
         Admin removes a user from a room
         """
-        admin_check_sql = """
-            SELECT role FROM room_membership 
-            WHERE membership_id = %s AND room_id = %s AND is_active = TRUE
-        """
-        admin_result = run_sql(admin_check_sql, (admin_membership_id, room_id))
-        if not admin_result or admin_result[0][0] != Role.ADMIN.value:
-            return {
-                "success": False,
-                "message": "Only admins can remove users from rooms"
-            }
-        
-        target_check_sql = """
-            SELECT u.name, rm.role FROM room_membership rm
-            JOIN "user" u ON rm.user_id = u.user_id
-            WHERE rm.membership_id = %s AND rm.room_id = %s AND rm.is_active = TRUE
-        """
-        target_result = run_sql(target_check_sql, (target_membership_id, room_id))
-        if not target_result:
-            return {
-                "success": False,
-                "message": "User not found in room"
-            }
-        
-        target_name, target_role = target_result[0]
-        
-        if target_role == Role.ADMIN.value:
-            admin_count_sql = """
-                SELECT COUNT(*) FROM room_membership 
-                WHERE room_id = %s AND role = %s AND is_active = TRUE
+        with transaction():
+            if not self._lock_room(room_id):
+                return {
+                    "success": False,
+                    "message": "Room not found"
+                }
+
+            admin_check_sql = """
+                SELECT role FROM room_membership 
+                WHERE membership_id = %s AND room_id = %s AND is_active = TRUE
             """
-            admin_count = run_sql(admin_count_sql, (room_id, Role.ADMIN.value))[0][0]
-            if admin_count <= 1:
+            admin_result = run_sql(admin_check_sql, (admin_membership_id, room_id))
+            if not admin_result or admin_result[0][0] != Role.ADMIN.value:
                 return {
                     "success": False,
-                    "message": "Cannot remove the last admin from the room"
+                    "message": "Only admins can remove users from rooms"
+                }
+            
+            target_check_sql = """
+                SELECT u.name, rm.role FROM room_membership rm
+                JOIN "user" u ON rm.user_id = u.user_id
+                WHERE rm.membership_id = %s AND rm.room_id = %s AND rm.is_active = TRUE
+            """
+            target_result = run_sql(target_check_sql, (target_membership_id, room_id))
+            if not target_result:
+                return {
+                    "success": False,
+                    "message": "User not found in room"
+                }
+            
+            target_name, target_role = target_result[0]
+            
+            if target_role == Role.ADMIN.value:
+                admin_count_sql = """
+                    SELECT COUNT(*) FROM room_membership 
+                    WHERE room_id = %s AND role = %s AND is_active = TRUE
+                """
+                admin_count = run_sql(admin_count_sql, (room_id, Role.ADMIN.value))[0][0]
+                if admin_count <= 1:
+                    return {
+                        "success": False,
+                        "message": "Cannot remove the last admin from the room"
+                    }
+            
+            removed = self._remove_member(target_membership_id, room_id)
+            
+            if removed["remaining_members"] == 0:
+                job_id = self._delete_room(room_id)
+                return {
+                    "success": True,
+                    "room_deleted": True,
+                    "deletion_job_id": job_id,
+                    "target_name": target_name,
+                    "removed": removed["rows"],
+                    "message": f"User {target_name} was removed from the room. Room was deleted as they were the last member."
+                }
+            else:
+                return {
+                    "success": True,
+                    "room_deleted": False,
+                    "target_name": target_name,
+                    "removed": removed["rows"],
+                    "message": f"User {target_name} was successfully removed from the room."
                 }
-        
-        run_sql("UPDATE chore SET assigned_to = NULL WHERE assigned_to = %s", (target_membership_id,))
-        run_sql("DELETE FROM chore_verification WHERE verified_by = %s", (target_membership_id,))
-        run_sql("DELETE FROM expense_split WHERE membership_id = %s", (target_membership_id,))
-        run_sql("DELETE FROM chore_completion WHERE membership_id = %s", (target_membership_id,))
-        run_sql("DELETE FROM chore_swap_request WHERE from_membership = %s OR to_membership = %s", (target_membership_id, target_membership_id,))
-        run_sql("DELETE FROM chore_assignment_history WHERE membership_id = %s", (target_membership_id,))
-        run_sql("DELETE FROM expense WHERE payer_membership_id = %s", (target_membership_id,))
-        
-        run_sql("DELETE FROM room_membership WHERE membership_id = %s", (target_membership_id,))
-        
-        remaining_members_sql = """
-            SELECT COUNT(*) FROM room_membership 
-            WHERE room_id = %s AND is_active = TRUE
-        """
-        remaining_count = run_sql(remaining_members_sql, (room_id,))[0][0]
-        
-        if remaining_count == 0:
-            self._delete_room_completely(room_id)
-            return {
-                "success": True,
-                "room_deleted": True,
-                "target_name": target_name,
-                "message": f"User {target_name} was removed from the room. Room was deleted as they were the last member."
-            }
-        else:
-            return {
-                "success": True,
-                "room_deleted": False,
-                "target_name": target_name,
-                "message": f"User {target_name} was successfully removed from the room."
-            }
     
     def get_membership_by_id(self, membership_id: int):
         sql = """
@@ -256,26 +359,37 @@ class MembershipRepository:
             "role": role
         }
     
-    def _delete_room_completely(self, room_id: int):
+    def _lock_room(self, room_id: int, shared: bool = False) -> bool:
         """
-        Delete room and all related data completely
+        Lock the room row until the transaction ends, so removals from the same
+        room run one at a time and agree on how many members remain. Joins take
+        the lock ``shared``: they run alongside each other, but a removal waits
+        for them and then counts the members they added.
         """
-        delete_queries = [
-            """DELETE FROM chore_verification 
-               WHERE completion_id IN (
-                   SELECT completion_id FROM chore_completion 
-                   WHERE chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s)
-               );""",
-            "DELETE FROM chore_completion WHERE chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s);",
-            "DELETE FROM chore_swap_request WHERE chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s);",
-            "DELETE FROM chore_assignment_history WHERE chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s);",
-            "DELETE FROM expense_split WHERE expense_id IN (SELECT expense_id FROM expense WHERE room_id = %s);",
-            "DELETE FROM expense WHERE room_id = %s;",
-            "DELETE FROM chore WHERE room_id = %s;",
-            "DELETE FROM room_membership WHERE room_id = %s;",
-            "DELETE FROM room WHERE room_id = %s;"
-        ]
+        mode = "SHARE" if shared else "UPDATE"
+        sql = f"SELECT room_id FROM room WHERE room_id = %s AND deleted_at IS NULL FOR {mode}"
+        return bool(run_sql(sql, (room_id,)))
+
+    def _remove_member(self, membership_id: int, room_id: int):
+        """
+        Delete a membership and everything that references it in one statement.
+        Must run inside transaction() after _lock_room. Returns the rows touched
+        per table and the members left in the room, or None if the membership
+        is not in the room.
+        """
+        result = run_sql(REMOVE_MEMBER_SQL, (membership_id, room_id, room_id))
+        counts = dict(zip(REMOVE_MEMBER_COUNTS, result[0]))
+        remaining_members = counts.pop("remaining_members")
+        if counts["room_membership"] == 0:
+            return None
+
+        invalidate("membership", room_id=room_id, ids=[membership_id])
+        return {"rows": counts, "remaining_members": remaining_members}
 
-        for query in delete_queries:
-            room_id_count = query.count("%s")
-            run_sql(query, tuple([room_id] * room_id_count))
\ No newline at end of file
+    def _delete_room(self, room_id: int) -> int:
+        """
+        Mark the room deleted and schedule the purge of its data, returning the job id
+        """
+        with transaction():
+            room_repo.mark_room_deleted(room_id)
+            return enqueue("room.purge", {"room_id": room_id})
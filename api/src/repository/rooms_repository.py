@@ -4,10 +4,38 @@ from src.models.room import Room
 from src.models.room import RoomCreateRequest, RoomUpdateRequest
 from src.models.membership import Role
 from src.services.database.helper import run_sql
+from src.services.invalidation import invalidate
+
+# Tables holding a deleted room's rows, children before parents, with the
+# condition selecting the room's rows (the room id is bound to every %s)
+PURGE_STEPS = [
+    ("chore_verification", """completion_id IN (
+        SELECT cc.completion_id FROM chore_completion cc
+        JOIN chore c ON cc.chore_id = c.chore_id WHERE c.room_id = %s)"""),
+    ("chore_completion", "chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s)"),
+    ("chore_swap_request", "chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s)"),
+    ("chore_assignment_history", "chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s)"),
+    ("chore_assignment", "chore_id IN (SELECT chore_id FROM chore WHERE room_id = %s)"),
+    ("chore", "room_id = %s"),
+    ("expense_split", "expense_id IN (SELECT expense_id FROM expense WHERE room_id = %s)"),
+    ("expense", "room_id = %s"),
+    ("announcement_reply_reaction", """reply_id IN (
+        SELECT ar.reply_id FROM announcement_reply ar
+        JOIN announcement a ON ar.announcement_id = a.announcement_id WHERE a.room_id = %s)"""),
+    ("announcement_reply", "announcement_id IN (SELECT announcement_id FROM announcement WHERE room_id = %s)"),
+    ("announcement_reaction", "announcement_id IN (SELECT announcement_id FROM announcement WHERE room_id = %s)"),
+    ("announcement_read", "announcement_id IN (SELECT announcement_id FROM announcement WHERE room_id = %s)"),
+    ("announcement", "room_id = %s"),
+    ("cleaning_check_status", "checklist_item_id IN (SELECT checklist_item_id FROM cleaning_checklist WHERE room_id = %s)"),
+    ("cleaning_checklist", "room_id = %s"),
+    ("room_invitation", "room_id = %s"),
+    ("room_membership", "room_id = %s"),
+    ("room", "room_id = %s AND deleted_at IS NOT NULL"),
+]
 
 class RoomRepository:
     def get_all_rooms(self):
-        query = "SELECT * FROM room"
+        query = "SELECT * FROM room WHERE deleted_at IS NULL"
         return run_sql(query, output_class=Room)
     
     def get_rooms_by_user_id(self, user_id: int):
@@ -15,12 +43,12 @@ class RoomRepository:
             SELECT r.*
             FROM room r
             JOIN room_membership rm ON r.room_id = rm.room_id
-            WHERE rm.user_id = %s AND rm.is_active = TRUE
+            WHERE rm.user_id = %s AND rm.is_active = TRUE AND r.deleted_at IS NULL
         """
         return run_sql(sql, (user_id,), output_class=Room)
     
     def get_room_by_id(self, room_id: int):
-        sql = "SELECT * FROM room WHERE room_id = %s"
+        sql = "SELECT * FROM room WHERE room_id = %s AND deleted_at IS NULL"
         result = run_sql(sql, (room_id,), output_class=Room)
         return result[0] if result else None
     
@@ -61,6 +89,7 @@ class RoomRepository:
         
         membership_result = run_sql(membership_sql, membership_params)
         membership_id = membership_result[0][0]
+        invalidate("user", room_id=room_id, ids=[room.created_by])
         
         return {
             "room_id": room_id, 
@@ -74,7 +103,7 @@ class RoomRepository:
             UPDATE room
             SET name = %s,
                 updated_at = %s
-            WHERE room_id = %s
+            WHERE room_id = %s AND deleted_at IS NULL
         """
         params = (
             room.name,
@@ -82,4 +111,32 @@ class RoomRepository:
             room.room_id,
         )
         run_sql(sql, params)
-        return {"room_id": room.room_id}
\ No newline at end of file
+        return {"room_id": room.room_id}
+    def mark_room_deleted(self, room_id: int):
+        """Hide the room from every read; its rows are removed later by the room.purge job"""
+        sql = """
+            UPDATE room
+            SET deleted_at = now()
+            WHERE room_id = %s AND deleted_at IS NULL
+        """
+        run_sql(sql, (room_id,))
+        invalidate("room", room_id=room_id, ids=[room_id])
+
+    def is_room_deleted(self, room_id: int) -> bool:
+        sql = "SELECT deleted_at IS NOT NULL FROM room WHERE room_id = %s"
+        result = run_sql(sql, (room_id,))
+        return bool(result and result[0][0])
+
+    def purge_batch(self, table: str, condition: str, room_id: int, batch_size: int) -> int:
+        """Delete up to ``batch_size`` of the room's rows from ``table`` and return how many went"""
+        sql = f"""
+            DELETE FROM {table}
+            WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM {table}
+                WHERE {condition}
+                LIMIT %s
+            ))
+            RETURNING 1
+        """
+        params = [room_id] * condition.count("%s") + [batch_size]
+        return len(run_sql(sql, params))
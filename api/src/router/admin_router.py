@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from src.services.query_stats import query_stats
+from src.repository.job_repository import JobRepository
+from src.utils.permissions import require_admin_token
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_token)],
+    responses={404: {"description": "Admin endpoint not found"}},
+)
+
+job_repo = JobRepository()
+
+@router.get("/query-stats")
+def get_query_stats(limit: int = 50):
+    """Per-fingerprint statement statistics for this worker, by total time"""
+    return query_stats.snapshot()[:limit]
+
+
+@router.post("/query-stats/reset")
+def reset_query_stats():
+    query_stats.reset()
+    return {"message": "Query statistics reset"}
+
+
+@router.get("/jobs")
+def get_job_queues():
+    """Job counts per queue and status, with the oldest due time still queued"""
+    return job_repo.get_queue_counts()
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: int):
+    """A single job with its attempts, last error and reported progress"""
+    job = job_repo.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    return job
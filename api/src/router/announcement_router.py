@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, Header, HTTPException, status, Query
 from src.repository.announcement_repository import AnnouncementRepository
 from src.repository.membership_repository import MembershipRepository
 from src.models.announcement import AnnouncementCreateRequest, AnnouncementResponse
 from src.errors import error_handler
+from src.services.serialization import CamelJSONResponse
+from src.services.idempotency import idempotent, IDEMPOTENCY_HEADER
 from typing import List
 
 router = APIRouter(
@@ -15,17 +17,19 @@ repo = AnnouncementRepository()
 membership_repo = MembershipRepository()
 
 
-@router.get("/room/{room_id}", response_model=List[AnnouncementResponse])
+@router.get("/room/{room_id}", response_model=List[AnnouncementResponse], response_class=CamelJSONResponse)
 @error_handler("Error fetching room announcements")
 def get_room_announcements(room_id: int):
-    return repo.get_announcements_by_room(room_id)
+    return CamelJSONResponse(repo.get_announcements_by_room(room_id))
 
 
 @router.post("/create", response_model=AnnouncementResponse)
+@idempotent("POST /announcements/create", user_param="user_id")
 @error_handler("Error creating announcement")
 def create_announcement(
     announcement: AnnouncementCreateRequest,
-    user_id: int = Query(..., description="User ID from authentication")
+    user_id: int = Query(..., description="User ID from authentication"),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
     membership = membership_repo.get_membership_by_user_and_room(user_id, announcement.room_id)
     
@@ -0,0 +1,72 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Request, status
+import httpx
+from src.models.batch import BatchRequest, BatchRequestItem, BatchResponseItem
+from src.services.idempotency import IDEMPOTENCY_HEADER
+from src.services.profiler import PROFILE_HEADER
+from src.utils.permissions import ADMIN_TOKEN_HEADER
+from typing import List
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["Batch"],
+    responses={404: {"description": "Batch endpoint not found"}},
+)
+
+MAX_BATCH_SIZE = 20
+MAX_CONCURRENCY = 8
+# Caller headers each item is sent with, so a batched GET behaves like the
+# direct one. Conditional and encoding headers stay out: items always need a
+# full, uncompressed body.
+FORWARDED_HEADERS = (ADMIN_TOKEN_HEADER, PROFILE_HEADER, IDEMPOTENCY_HEADER, "authorization", "accept-language")
+
+
+def _validate_path(path: str):
+    if not path.startswith("/api/") or path.startswith("/api/batch"):
+        raise ValueError("Only internal /api GET paths can be batched")
+
+
+def _forwarded_headers(request: Request) -> dict:
+    return {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+
+
+async def _dispatch(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, item: BatchRequestItem) -> BatchResponseItem:
+    try:
+        _validate_path(item.path)
+        async with semaphore:
+            response = await client.get(item.path, params=item.params)
+    except ValueError as e:
+        return BatchResponseItem(path=item.path, status=status.HTTP_400_BAD_REQUEST, body={"detail": str(e)})
+    except Exception as e:
+        print(f"Batch item {item.path} failed: {e}")
+        return BatchResponseItem(path=item.path, status=status.HTTP_500_INTERNAL_SERVER_ERROR, body={"detail": "Error executing batch item"})
+
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+    else:
+        body = response.text
+    return BatchResponseItem(path=item.path, status=response.status_code, body=body)
+
+
+@router.post("", response_model=List[BatchResponseItem])
+async def run_batch(batch: BatchRequest, request: Request):
+    """Run several GETs in-process and return their status/body pairs in order.
+
+    Items are dispatched concurrently through the app itself, so each one goes
+    through the normal routing and error handling; a failing item only affects
+    its own entry. The caller's ``FORWARDED_HEADERS`` are passed on to every item.
+    """
+    if len(batch.requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch size is limited to {MAX_BATCH_SIZE} requests"
+        )
+
+    transport = httpx.ASGITransport(app=request.app, raise_app_exceptions=False)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://batch",
+        headers={**_forwarded_headers(request), "accept-encoding": "identity"},
+    ) as client:
+        return await asyncio.gather(*(_dispatch(client, semaphore, item) for item in batch.requests))
@@ -1,8 +1,13 @@
-from src.models.chore import ChoreCreateRequest, ChoreAssignRequest, ChoreUnassignRequest, ChoreCompletionCreateRequest, ChoreVerificationCreateRequest
-from fastapi import APIRouter, Query, HTTPException
+from src.models.chore import ChoreCreateRequest, ChoreAssignRequest, ChoreUnassignRequest, ChoreCompletionCreateRequest, ChoreVerificationCreateRequest, ChoreVerificationBulkRequest, ChoreAutoAssignRequest, ChoreAutoAssignApplyRequest
+from datetime import date, datetime, timedelta
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, Request
 from src.repository.chores_repository import ChoreRepository
 from src.repository.membership_repository import MembershipRepository
 from src.errors import error_handler
+from src.services.serialization import CamelJSONResponse, etagged
+from src.services.idempotency import idempotent, IDEMPOTENCY_HEADER
+from src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_cursor, keyset_page
 
 router = APIRouter(
     prefix="/chores",
@@ -13,31 +18,99 @@ router = APIRouter(
 repo = ChoreRepository()
 membership_repo = MembershipRepository()
 
+MAX_BULK_VERIFICATIONS = 200
+DETAIL_RECENT_COMPLETIONS = 20
+MAX_DETAIL_COMPLETIONS = 100
+DETAIL_SWAP_REQUESTS = 20
+DEFAULT_FAIRNESS_DAYS = 30
+MAX_FAIRNESS_DAYS = 366
+
+def history_filters(after=Depends(keyset_cursor(datetime, int)),
+                    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                    status: Optional[Literal["pending", "approved", "rejected"]] = Query(None),
+                    from_date: Optional[date] = Query(None, alias="from", description="Completed on or after"),
+                    to_date: Optional[date] = Query(None, alias="to", description="Completed on or before")):
+    return {"after": after, "limit": limit, "status": status, "from_date": from_date, "to_date": to_date}
+
+def fairness_window(from_date: Optional[date] = Query(None, alias="from", description="First day, defaults to 30 days before to"),
+                    to_date: Optional[date] = Query(None, alias="to", description="Last day, defaults to today")):
+    to_date = to_date or date.today()
+    from_date = from_date or to_date - timedelta(days=DEFAULT_FAIRNESS_DAYS - 1)
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    if (to_date - from_date).days + 1 > MAX_FAIRNESS_DAYS:
+        raise HTTPException(status_code=400, detail=f"Window can span at most {MAX_FAIRNESS_DAYS} days")
+    return from_date, to_date
+
+def require_room_admin(membership_id: int, room_id: int, detail: str):
+    membership = membership_repo.get_membership_by_id(membership_id)
+    if not membership or membership.get('role') != 'admin' or membership.get('room_id') != room_id:
+        raise HTTPException(status_code=403, detail=detail)
+
+def bulk_verifications(room_id: int, bulk_request: ChoreVerificationBulkRequest,
+                       verified_by_membership_id: int = Query(..., description="ID of the member verifying the completions")):
+    require_room_admin(verified_by_membership_id, room_id, "Only room admins can verify chore completions")
+    if not bulk_request.verifications:
+        raise HTTPException(status_code=400, detail="No verifications given")
+    if len(bulk_request.verifications) > MAX_BULK_VERIFICATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_VERIFICATIONS} verifications per request")
+    completion_ids = [item.completion_id for item in bulk_request.verifications]
+    if len(set(completion_ids)) != len(completion_ids):
+        raise HTTPException(status_code=400, detail="Each completion can be verified only once per request")
+    return verified_by_membership_id, bulk_request.verifications
+
+def auto_assignments(room_id: int, request: ChoreAutoAssignApplyRequest,
+                     assigned_by_membership_id: int = Query(..., description="ID of the admin applying the assignments")):
+    require_room_admin(assigned_by_membership_id, room_id, "Only room admins can assign chores")
+    if not request.assignments:
+        raise HTTPException(status_code=400, detail="No assignments given")
+    # One member per chore; a repeated chore keeps its last pair
+    return list({pair.chore_id: pair.membership_id for pair in request.assignments}.items())
+
+def history_page(fetch, filters: dict):
+    # One extra row tells keyset_page whether there is a next page
+    rows = fetch(**{**filters, "limit": filters["limit"] + 1})
+    return CamelJSONResponse(keyset_page(rows, filters["limit"],
+                                         key=lambda row: (row["completed_at"], row["completion_id"])))
+
 @router.get("/all")
 @error_handler("Error fetching all chores")
 def get_chores():
     return repo.get_all_chores()
 
-@router.get("/by-user/{user_id}")
+@router.get("/by-user/{user_id}", response_class=CamelJSONResponse)
 @error_handler("Error fetching chores by user")
 def get_chores_by_user(user_id: int):
-    return repo.get_chores_by_user_id(user_id)
+    return CamelJSONResponse(repo.get_chores_by_user_id(user_id))
 
-@router.get("/assigned-to-user/{user_id}")
+@router.get("/assigned-to-user/{user_id}", response_class=CamelJSONResponse)
 @error_handler("Error fetching chores assigned to user")
 def get_chores_assigned_to_user(user_id: int):
-    return repo.get_chores_assigned_to_user(user_id)
+    return CamelJSONResponse(repo.get_chores_assigned_to_user(user_id))
+
+@router.get("/user/{user_id}/assigned", response_class=CamelJSONResponse)
+@error_handler("Error fetching user's chores")
+def get_user_chores_across_rooms(user_id: int):
+    return CamelJSONResponse(repo.get_user_chores_across_rooms(user_id))
 
-@router.get("/by-room/{room_id}")
+@router.get("/by-room/{room_id}", response_class=CamelJSONResponse)
 @error_handler("Error fetching chores by room")
-def get_chores_by_room(room_id: int):
-    return repo.get_chores_by_room_id(room_id)
+def get_chores_by_room(room_id: int, request: Request):
+    return etagged(request, repo.get_chores_by_room_id(room_id))
 
 @router.get("/{chore_id}")
 @error_handler("Error fetching chore by ID")
 def get_chore(chore_id: int):
     return repo.get_chore_by_id(chore_id)
 
+@router.get("/{chore_id}/detail", response_class=CamelJSONResponse)
+@error_handler("Error fetching chore detail")
+def get_chore_detail(chore_id: int, completions: int = Query(DETAIL_RECENT_COMPLETIONS, ge=1, le=MAX_DETAIL_COMPLETIONS, description="Number of recent completions to include")):
+    detail = repo.get_chore_detail(chore_id, completions, DETAIL_SWAP_REQUESTS)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Chore not found")
+    return CamelJSONResponse(detail)
+
 @router.post("/add")
 @error_handler("Error adding chore")
 def add_chore(chore: ChoreCreateRequest):
@@ -65,6 +138,21 @@ def unassign_chore(chore_id: int, request: ChoreUnassignRequest):
     repo.unassign_chore(chore_id, request.membership_id)
     return {"message": "Chore unassigned successfully"}
 
+@router.post("/room/{room_id}/auto-assign", response_class=CamelJSONResponse)
+@error_handler("Error proposing chore assignments")
+def propose_auto_assignment(room_id: int, request: ChoreAutoAssignRequest):
+    preferences = [(pair.membership_id, pair.chore_id) for pair in request.preferences]
+    blackouts = [(pair.membership_id, pair.chore_id) for pair in request.blackouts]
+    return CamelJSONResponse(repo.propose_auto_assignment(room_id, preferences, blackouts))
+
+@router.post("/room/{room_id}/auto-assign/apply")
+@error_handler("Error applying chore assignments")
+def apply_auto_assignment(room_id: int, assignments: list = Depends(auto_assignments)):
+    result = repo.apply_auto_assignment(room_id, assignments)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Chore or member not found in room")
+    return result
+
 @router.get("/{chore_id}/assignments")
 @error_handler("Error fetching chore assignments")
 def get_chore_assignments(chore_id: int):
@@ -72,8 +160,10 @@ def get_chore_assignments(chore_id: int):
 
 # Chore Completion Endpoints
 @router.post("/{chore_id}/complete")
+@idempotent("POST /chores/{chore_id}/complete", user_param="membership_id")
 @error_handler("Error completing chore")
-def complete_chore(chore_id: int, completion_request: ChoreCompletionCreateRequest, membership_id: int = Query(..., description="ID of the member completing the chore")):
+def complete_chore(chore_id: int, completion_request: ChoreCompletionCreateRequest, membership_id: int = Query(..., description="ID of the member completing the chore"),
+                   idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER)):
     return repo.create_completion(membership_id, completion_request)
 
 @router.get("/completions/{completion_id}")
@@ -91,11 +181,32 @@ def get_pending_completions(room_id: int):
 def get_user_completions(user_id: int, room_id: int = Query(None, description="Filter by room ID")):
     return repo.get_user_completions(user_id, room_id)
 
+@router.get("/user/{user_id}/completions/history", response_class=CamelJSONResponse)
+@error_handler("Error fetching user completion history")
+def get_user_completion_history(user_id: int, room_id: int = Query(None, description="Filter by room ID"),
+                                filters: dict = Depends(history_filters)):
+    return history_page(lambda **kwargs: repo.get_user_completion_history(user_id, room_id, **kwargs), filters)
+
+@router.get("/room/{room_id}/completions/history", response_class=CamelJSONResponse)
+@error_handler("Error fetching room completion history")
+def get_room_completion_history(room_id: int, filters: dict = Depends(history_filters)):
+    return history_page(lambda **kwargs: repo.get_room_completion_history(room_id, **kwargs), filters)
+
+@router.get("/{chore_id}/completions/history", response_class=CamelJSONResponse)
+@error_handler("Error fetching chore completion history")
+def get_chore_completion_history(chore_id: int, filters: dict = Depends(history_filters)):
+    return history_page(lambda **kwargs: repo.get_chore_completion_history(chore_id, **kwargs), filters)
+
 @router.get("/room/{room_id}/with-completion-status")
 @error_handler("Error fetching chores with completion status")
 def get_chores_with_completion_status(room_id: int, user_id: int = Query(None, description="Filter by user ID")):
     return repo.get_chores_with_completion_status(room_id, user_id)
 
+@router.get("/room/{room_id}/fairness", response_class=CamelJSONResponse)
+@error_handler("Error fetching chore fairness")
+def get_room_fairness(room_id: int, window: tuple = Depends(fairness_window)):
+    return CamelJSONResponse(repo.get_room_fairness(room_id, *window))
+
 @router.post("/completions/{completion_id}/verify")
 @error_handler("Error verifying completion")
 def verify_completion(completion_id: int, verification_request: ChoreVerificationCreateRequest, verified_by_membership_id: int = Query(..., description="ID of the member verifying the completion")):
@@ -105,6 +216,12 @@ def verify_completion(completion_id: int, verification_request: ChoreVerificatio
     
     return repo.create_verification(verified_by_membership_id, verification_request)
 
+@router.post("/room/{room_id}/verifications/bulk")
+@error_handler("Error verifying completions")
+def verify_completions_bulk(room_id: int, bulk: tuple = Depends(bulk_verifications)):
+    verified_by_membership_id, verifications = bulk
+    return repo.create_verifications_bulk(room_id, verified_by_membership_id, verifications)
+
 @router.get("/completions/{completion_id}/verification")
 @error_handler("Error fetching verification details")
 def get_verification_details(completion_id: int):
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Request, status
 from src.repository.expense_repository import ExpenseRepository
 from src.models.expense import ExpenseCreateRequest, ExpenseUpdateRequest, ExpensePaymentRequest
 from src.errors import error_handler
+from src.services.serialization import CamelJSONResponse, etagged
+from src.services.idempotency import idempotent, IDEMPOTENCY_HEADER
 
 router = APIRouter(
     prefix="/expenses",
@@ -12,14 +14,16 @@ router = APIRouter(
 repo = ExpenseRepository()
 
 @router.post("/create")
+@idempotent("POST /expenses/create", user_param="expense.payer_membership_id")
 @error_handler("Error creating expense")
-def create_expense(expense: ExpenseCreateRequest):
+def create_expense(expense: ExpenseCreateRequest,
+                   idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER)):
     return repo.create_expense(expense)
 
-@router.get("/room/{room_id}")
+@router.get("/room/{room_id}", response_class=CamelJSONResponse)
 @error_handler("Error fetching room expenses")
-def get_room_expenses(room_id: int):
-    return repo.get_expenses_by_room(room_id)
+def get_room_expenses(room_id: int, request: Request):
+    return etagged(request, repo.get_expenses_by_room(room_id))
 
 @router.get("/{expense_id}")
 @error_handler("Error fetching expense")
@@ -37,7 +37,13 @@ def check_admin_status(user_id: int, room_id: int):
 @router.post("/create")
 @error_handler("Error creating membership")
 def create_membership(membership: MembershipCreateRequest):
-    return repo.create_membership(membership)
+    result = repo.create_membership(membership)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Room {membership.room_id} not found"
+        )
+    return result
 
 @router.post("/join-by-code")
 @error_handler("Error joining room by code")
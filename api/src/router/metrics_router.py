@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.services.metrics import render_metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    responses={404: {"description": "Metrics endpoint not found"}},
+)
+
+@router.get("", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text exposition for this worker"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
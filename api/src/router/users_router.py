@@ -1,7 +1,11 @@
 from src.features.settings import IS_DEV
 from src.errors import error_handler
 from src.repository.users_repository import UserRepository
-from fastapi import APIRouter, HTTPException
+from src.repository.chores_repository import ChoreRepository
+from src.services.serialization import CamelJSONResponse
+from src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_cursor, keyset_page
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 
 router = APIRouter(
@@ -20,6 +24,7 @@ class CreateUserRequest(BaseModel):
     avatar_url: str = None
 
 repo = UserRepository()
+chore_repo = ChoreRepository()
 
 @router.get("/all")
 @error_handler("Error fetching all users")
@@ -60,4 +65,12 @@ def create_user(user_data: CreateUserRequest):
         email=user_data.email,
         name=user_data.name,
         avatar_url=user_data.avatar_url
-    )
\ No newline at end of file
+    )
+
+@router.get("/{user_id}/pending-verifications", response_class=CamelJSONResponse)
+@error_handler("Error fetching pending verifications")
+def get_pending_verifications(user_id: int,
+                              after=Depends(keyset_cursor(datetime, int)),
+                              limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    rows = chore_repo.get_pending_verifications_for_admin(user_id, after, limit + 1)
+    return CamelJSONResponse(keyset_page(rows, limit, key=lambda row: (row["completed_at"], row["completion_id"])))
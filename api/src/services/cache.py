@@ -0,0 +1,424 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, time as time_of_day
+from decimal import Decimal
+from functools import wraps
+import inspect
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+from urllib.parse import urlparse
+
+import orjson
+from pydantic import BaseModel
+
+from src.services.database.helper import in_transaction
+
+CACHE_URL = os.getenv("CACHE_URL", "memory://")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+# Shared-cache generation counters must outlive every entry written before
+# they were bumped, so this is far above any entry TTL
+GENERATION_TTL_SECONDS = 7 * 24 * 3600
+
+MISS = object()
+
+
+class CacheBackend(ABC):
+    """Key/value cache with per-entry TTL and tag-based invalidation."""
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the cached value, or MISS."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = ()):
+        ...
+
+    @abstractmethod
+    def delete_tags(self, *tags: str):
+        """Evict every entry stored with any of the given tags and bump their generations."""
+
+    @abstractmethod
+    def generations(self, tags: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        """How many times each tag has been invalidated, or None if that is unknown."""
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+
+class MemoryCache(CacheBackend):
+    """Per-process LRU cache."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = ()):
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete_tags(self, *tags: str):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def generations(self, tags: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def clear(self):
+        # Generations survive, so a read that started before the clear still
+        # cannot store what it read if an invalidation happened since
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RespError(Exception):
+    pass
+
+
+class RespConnection:
+    """Minimal RESP2 client, enough for Redis and protocol-compatible servers."""
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None, timeout: float = 2.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", self.db)
+
+    def close(self):
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    def execute(self, *args):
+        if self._sock is None:
+            self._connect()
+        try:
+            return self._command(*args)
+        except (OSError, EOFError):
+            # Reconnect once on a dropped connection
+            self.close()
+            self._connect()
+            return self._command(*args)
+
+    def _command(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise EOFError("Connection closed by cache server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RespError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RespError(f"Unexpected reply: {line!r}")
+
+
+# Values in a shared cache are JSON, never pickle: anyone able to write to
+# the cache server must not be able to run code in the API. Types JSON
+# cannot express are wrapped as {"__type__": ..., "value": ...}; pydantic
+# models are rebuilt only from classes defined under src.models.
+_TYPE = "__type__"
+
+
+def _model_classes() -> Dict[str, Type[BaseModel]]:
+    classes = {}
+    pending = list(BaseModel.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if cls.__module__.startswith("src.models."):
+            classes[f"{cls.__module__}.{cls.__qualname__}"] = cls
+    return classes
+
+
+def _pack(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        return {_TYPE: "model", "class": f"{cls.__module__}.{cls.__qualname__}", "value": value.model_dump(mode="json")}
+    if isinstance(value, dict):
+        return {key: _pack(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_pack(item) for item in value]
+    if isinstance(value, tuple):
+        return {_TYPE: "tuple", "value": [_pack(item) for item in value]}
+    if isinstance(value, datetime):
+        return {_TYPE: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {_TYPE: "date", "value": value.isoformat()}
+    if isinstance(value, time_of_day):
+        return {_TYPE: "time", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {_TYPE: "decimal", "value": str(value)}
+    return value
+
+
+def _unpack(value: Any, models: Dict[str, Type[BaseModel]]) -> Any:
+    if isinstance(value, list):
+        return [_unpack(item, models) for item in value]
+    if not isinstance(value, dict):
+        return value
+    kind = value.get(_TYPE)
+    if kind is None:
+        return {key: _unpack(item, models) for key, item in value.items()}
+    if kind == "model":
+        cls = models.get(value["class"])
+        if cls is None:
+            raise ValueError(f"Unknown cached model {value['class']!r}")
+        return cls.model_validate(value["value"])
+    if kind == "tuple":
+        return tuple(_unpack(item, models) for item in value["value"])
+    if kind == "datetime":
+        return datetime.fromisoformat(value["value"])
+    if kind == "date":
+        return date.fromisoformat(value["value"])
+    if kind == "time":
+        return time_of_day.fromisoformat(value["value"])
+    if kind == "decimal":
+        return Decimal(value["value"])
+    raise ValueError(f"Unknown cached type {kind!r}")
+
+
+def encode_value(value: Any) -> bytes:
+    return orjson.dumps(_pack(value))
+
+
+def decode_value(data: bytes) -> Any:
+    return _unpack(orjson.loads(data), _model_classes())
+
+
+class RedisCache(CacheBackend):
+    """
+    Shared cache over the Redis protocol. Tags are stored as sets of keys,
+    so any worker can evict entries written by another, and generations as
+    counters that outlive every entry (GENERATION_TTL_SECONDS).
+    """
+
+    def __init__(self, connection: RespConnection, prefix: str = "dormduty:"):
+        self.connection = connection
+        self.prefix = prefix
+        self._lock = threading.Lock()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _generation(self, tag: str) -> str:
+        return f"{self.prefix}gen:{tag}"
+
+    def get(self, key: str) -> Any:
+        try:
+            with self._lock:
+                data = self.connection.execute("GET", self._key(key))
+        except (OSError, EOFError, RespError) as e:
+            # A cache outage degrades to a miss rather than failing the request
+            print(f"Cache get failed: {e}")
+            self.connection.close()
+            return MISS
+        if data is None:
+            return MISS
+        try:
+            return decode_value(data)
+        except ValueError as e:
+            # orjson.JSONDecodeError is a ValueError too
+            print(f"Cache entry {key} could not be decoded: {e}")
+            return MISS
+
+    def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = ()):
+        ttl_ms = int(ttl * 1000)
+        try:
+            with self._lock:
+                self.connection.execute("SET", self._key(key), encode_value(value), "PX", ttl_ms)
+                for tag in tags:
+                    self.connection.execute("SADD", self._tag(tag), self._key(key))
+                    self.connection.execute("PEXPIRE", self._tag(tag), ttl_ms)
+        except (OSError, EOFError, RespError) as e:
+            print(f"Cache set failed: {e}")
+            self.connection.close()
+
+    def delete_tags(self, *tags: str):
+        try:
+            with self._lock:
+                for tag in tags:
+                    self.connection.execute("INCR", self._generation(tag))
+                    self.connection.execute("PEXPIRE", self._generation(tag), GENERATION_TTL_SECONDS * 1000)
+                    keys = self.connection.execute("SMEMBERS", self._tag(tag)) or []
+                    self.connection.execute("DEL", self._tag(tag), *keys)
+        except (OSError, EOFError, RespError) as e:
+            print(f"Cache invalidation failed for {tags}: {e}")
+            self.connection.close()
+
+    def generations(self, tags: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        tags = list(tags)
+        if not tags:
+            return ()
+        try:
+            with self._lock:
+                values = self.connection.execute("MGET", *[self._generation(tag) for tag in tags])
+        except (OSError, EOFError, RespError) as e:
+            print(f"Cache generations unavailable: {e}")
+            self.connection.close()
+            return None
+        return tuple(int(value) if value is not None else 0 for value in values)
+
+    def clear(self):
+        generations = f"{self.prefix}gen:".encode()
+        with self._lock:
+            cursor = "0"
+            while True:
+                cursor, keys = self.connection.execute("SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", 500)
+                # Generations survive a clear, as in MemoryCache
+                keys = [key for key in keys if not key.startswith(generations)]
+                if keys:
+                    self.connection.execute("DEL", *keys)
+                cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+                if cursor == "0":
+                    break
+
+
+def create_cache(url: str) -> CacheBackend:
+    """memory:// for an in-process LRU, redis://[:password@]host:port/db for a shared cache."""
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryCache()
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip("/") or 0)
+        connection = RespConnection(parsed.hostname or "localhost", parsed.port or 6379, db, parsed.password)
+        return RedisCache(connection)
+    raise ValueError(f"Unsupported CACHE_URL scheme: {parsed.scheme}")
+
+
+cache = create_cache(CACHE_URL)
+
+
+def room_tag(room_id: int) -> str:
+    return f"room:{room_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def entity_tags(entity: str, room_id: Optional[int] = None, ids: Iterable[int] = ()) -> List[str]:
+    """Tags covering a write to ``entity`` rows ``ids`` in ``room_id``."""
+    tags = [f"{entity}:{entity_id}" for entity_id in ids]
+    if room_id is not None:
+        tags.append(room_tag(room_id))
+    return tags
+
+
+def cached(tags: Callable[..., Iterable[str]], ttl: int = CACHE_TTL_SECONDS):
+    """
+    Cache a repository read method. ``tags`` receives the method's arguments
+    by name and returns the tags write paths use to evict the entry. Calls
+    inside a transaction() bypass the cache.
+
+    Entries carry the generations of their tags as read before the database
+    query, and a hit is only served while those still match. So a value read
+    before an invalidation, but stored after it, is never returned.
+    """
+    def decorator(func):
+        name = func.__qualname__
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if in_transaction():
+                return func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self")
+            key = f"{name}:{sorted(arguments.items())!r}"
+
+            entry_tags = list(tags(**arguments))
+            generations = cache.generations(entry_tags)
+            if generations is None:
+                return func(self, *args, **kwargs)
+
+            entry = cache.get(key)
+            if isinstance(entry, tuple) and len(entry) == 2 and entry[1] == generations:
+                return entry[0]
+            value = func(self, *args, **kwargs)
+            cache.set(key, (value, generations), ttl, entry_tags)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,197 @@
+import gzip
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best encoding we support from an Accept-Encoding header."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[token] = weight
+
+    for encoding in supported_encodings():
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress = self._compressor.compress
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compress(data) + self._flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compress(data) + self._finish()
+
+
+class CompressedBodyCache:
+    """Small LRU of compressed bodies keyed by (path and ETag, encoding)."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, key: str, encoding: str, body: bytes) -> bytes:
+        cache_key = (key, encoding)
+        compressed = self._entries.get(cache_key)
+        if compressed is not None:
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return compressed
+
+        self.misses += 1
+        compressed = compress_body(body, encoding)
+        if len(compressed) <= self.max_bytes:
+            self._entries[cache_key] = compressed
+            self._size += len(compressed)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return compressed
+
+
+class CompressionMiddleware:
+    """gzip/brotli negotiation with a size threshold.
+
+    Single-message bodies that carry an ETag (room-level lists, see
+    serialization.etagged) are compressed once per representation: the
+    compressed bytes are cached under the request path and ETag, so hot
+    cacheable responses skip the compressor. Their ETag is sent weak, since
+    the encoded bytes differ from the identity body. Bodies without
+    an ETag (per-user, dynamic) are compressed every time and never enter the
+    cache. Chunked responses are compressed incrementally as they stream.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, cache: Optional[CompressedBodyCache] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache or CompressedBodyCache()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self, encoding, scope, send).run(scope, receive)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, scope, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.path = scope.get("path", "")
+        self.send = send
+        self.start_message = None
+        self.passthrough = False
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def run(self, scope, receive):
+        await self.middleware.app(scope, receive, self.wrapped_send)
+
+    async def wrapped_send(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            data = self.compressor.chunk(body) if more_body else self.compressor.finish(body)
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+
+        if not more_body:
+            if len(body) < self.middleware.minimum_size:
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            etag = headers.get("etag")
+            if etag is not None:
+                body = self.middleware.cache.get_or_compress(f"{self.path}:{etag}", self.encoding, body)
+                # The encoded bytes differ from the ones the strong ETag names
+                if not etag.startswith("W/"):
+                    headers["etag"] = f"W/{etag}"
+            else:
+                body = compress_body(body, self.encoding)
+            headers["content-encoding"] = self.encoding
+            headers["content-length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        self.compressor = _StreamCompressor(self.encoding)
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "content-length" in headers:
+            del headers["content-length"]
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": self.compressor.chunk(body), "more_body": True})
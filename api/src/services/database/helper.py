@@ -1,7 +1,11 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import sys
+import time
 from psycopg_pool import ConnectionPool
 from psycopg.rows import class_row
 import os
-from typing import List, Optional, TypeVar, Type
+from typing import Callable, List, Optional, TypeVar, Type
 
 T = TypeVar("T")
 
@@ -9,29 +13,97 @@ T = TypeVar("T")
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 if DATABASE_URL:
-    pool = ConnectionPool(DATABASE_URL, open=True)
+    conninfo = DATABASE_URL
+    pool = ConnectionPool(conninfo, open=True)
 else:
     pg_user = os.getenv("POSTGRES_USER")
     pg_password = os.getenv("POSTGRES_PASSWORD")
     pg_host = os.getenv("POSTGRES_HOST")
     pg_db = os.getenv("POSTGRES_DB")
 
-    conn_str = f"user={pg_user} password={pg_password} host={pg_host} dbname={pg_db}"
-    pool = ConnectionPool(conn_str, open=True, check=ConnectionPool.check_connection)
+    conninfo = f"user={pg_user} password={pg_password} host={pg_host} dbname={pg_db}"
+    pool = ConnectionPool(conninfo, open=True, check=ConnectionPool.check_connection)
 
 pool.wait(timeout=6.0)
 
+# Connection bound by transaction(); run_sql uses it instead of the pool
+_transaction_connection: ContextVar = ContextVar("transaction_connection", default=None)
+_after_commit_callbacks: ContextVar = ContextVar("after_commit_callbacks", default=None)
+
+@contextmanager
+def transaction():
+    """
+    Run every run_sql call inside the block on a single connection and
+    commit them together (or roll back if the block raises). Nested calls
+    join the outer transaction.
+    """
+    connection = _transaction_connection.get()
+    if connection is not None:
+        yield connection
+        return
+
+    callbacks = []
+    with pool.connection() as connection:
+        token = _transaction_connection.set(connection)
+        callbacks_token = _after_commit_callbacks.set(callbacks)
+        try:
+            with connection.transaction():
+                yield connection
+        finally:
+            _transaction_connection.reset(token)
+            _after_commit_callbacks.reset(callbacks_token)
+
+    for callback in callbacks:
+        callback()
+
+def in_transaction() -> bool:
+    return _transaction_connection.get() is not None
+
+def after_commit(callback):
+    """Run callback once the current transaction commits, or now if there is none."""
+    callbacks = _after_commit_callbacks.get()
+    if callbacks is None:
+        callback()
+    else:
+        callbacks.append(callback)
+
+def _execute(connection, sql, params, output_class):
+    with (
+        connection.cursor(row_factory=class_row(output_class))
+        if output_class is not None
+        else connection.cursor()
+    ) as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall() if cursor.description is not None else []
+
+# Called after every statement with (sql, params, caller, duration, rows, error)
+_query_hooks: List[Callable] = []
+
+def add_query_hook(hook: Callable):
+    _query_hooks.append(hook)
+
 def run_sql(sql, params=None, output_class: Optional[Type[T]] = None) -> List[T]:
+    start = time.perf_counter()
+    result = None
+    error = None
     try:
-        with pool.connection() as connection:
-            with (
-                connection.cursor(row_factory=class_row(output_class))
-                if output_class is not None
-                else connection.cursor()
-            ) as cursor:
-                cursor.execute(sql, params)
-                return cursor.fetchall() if cursor.description is not None else []
+        connection = _transaction_connection.get()
+        if connection is not None:
+            result = _execute(connection, sql, params, output_class)
+        else:
+            with pool.connection() as connection:
+                result = _execute(connection, sql, params, output_class)
+        return result
     except Exception as e:
+        error = e
         print(sql)
         print(params)
         raise
+    finally:
+        if _query_hooks:
+            duration = time.perf_counter() - start
+            # The calling repository method, e.g. "ChoreRepository.get_chore_by_id"
+            caller = sys._getframe(1).f_code.co_qualname
+            rows = len(result) if result is not None else 0
+            for hook in _query_hooks:
+                hook(sql, params, caller, duration, rows, error)
@@ -0,0 +1,217 @@
+"""
+Versioned schema migrations.
+
+Migrations are the files in api/migrations named ``NNNN_description.sql``
+and are applied in version order. Each applied migration is recorded in
+``schema_migrations`` with the sha256 of its file, so editing a migration
+after it ran is reported instead of silently diverging. A session-level
+advisory lock makes concurrent runners (several app instances starting at
+once) wait for each other rather than apply the same migration twice.
+
+A migration runs in a single transaction unless its first line is
+
+    -- migrate: no-transaction
+
+in which case each statement runs on its own in autocommit mode, as
+``CREATE INDEX CONCURRENTLY`` requires. A failed concurrent build leaves an
+INVALID index behind that ``IF NOT EXISTS`` would skip, so drop it before
+running the migration again.
+
+    python -m src.services.database.migrations           # apply pending
+    python -m src.services.database.migrations status    # list state
+"""
+import hashlib
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import psycopg
+
+from src.features.settings import MIGRATION_LOCK_TIMEOUT
+from src.services.database.helper import conninfo
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "migrations"
+NO_TRANSACTION_HEADER = "-- migrate: no-transaction"
+_FILENAME = re.compile(r"^(\d{4})_(\w+)\.sql$")
+# Arbitrary application-wide key for pg_advisory_lock
+_LOCK_KEY = 4_031_770_518
+
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        execution_ms INTEGER NOT NULL
+    )
+"""
+
+
+class MigrationError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+    checksum: str
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_HEADER)
+
+    def statements(self) -> List[str]:
+        return split_statements(self.sql)
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME.match(path.name)
+        if not match:
+            raise MigrationError(f"Migration file {path.name} does not match NNNN_description.sql")
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version}: {path.name}")
+        sql = path.read_text()
+        migrations[version] = Migration(version, match.group(2), sql, hashlib.sha256(sql.encode()).hexdigest())
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split on top-level semicolons, skipping comments, quoted strings and $$ bodies."""
+    statements, current, i = [], [], 0
+    while i < len(sql):
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = len(sql) if end == -1 else end
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = len(sql) if end == -1 else end + 2
+            continue
+        if char in ("'", '"'):
+            end = i + 1
+            while end < len(sql):
+                if sql[end] == char and sql[end + 1:end + 2] == char:
+                    end += 2
+                elif sql[end] == char:
+                    break
+                else:
+                    end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+            continue
+        dollar = re.match(r"\$\w*\$", sql[i:])
+        if dollar:
+            tag = dollar.group(0)
+            end = sql.find(tag, i + len(tag))
+            end = len(sql) if end == -1 else end + len(tag)
+            current.append(sql[i:end])
+            i = end
+            continue
+        if char == ";":
+            statements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    statements.append("".join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def _applied(connection) -> Dict[int, str]:
+    rows = connection.execute("SELECT version, checksum FROM schema_migrations").fetchall()
+    return {version: checksum for version, checksum in rows}
+
+
+def _verify(migrations: List[Migration], applied: Dict[int, str]):
+    for migration in migrations:
+        checksum = applied.get(migration.version)
+        if checksum is not None and checksum != migration.checksum:
+            raise MigrationError(
+                f"Migration {migration.version:04d}_{migration.name} was modified after it was applied; "
+                f"add a new migration instead"
+            )
+    unknown = set(applied) - {migration.version for migration in migrations}
+    if unknown:
+        print(f"Database has migrations not found on disk: {sorted(unknown)}")
+
+
+def _apply(connection, migration: Migration):
+    start = time.perf_counter()
+    if migration.transactional:
+        with connection.transaction():
+            connection.execute("SELECT set_config('lock_timeout', %s, true)", (MIGRATION_LOCK_TIMEOUT,))
+            connection.execute(migration.sql)
+            _record(connection, migration, start)
+    else:
+        for statement in migration.statements():
+            connection.execute(statement)
+        _record(connection, migration, start)
+
+
+def _record(connection, migration: Migration, start: float):
+    connection.execute(
+        "INSERT INTO schema_migrations (version, name, checksum, execution_ms) VALUES (%s, %s, %s, %s)",
+        (migration.version, migration.name, migration.checksum, int((time.perf_counter() - start) * 1000)),
+    )
+
+
+def migrate(url: str = conninfo, directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Apply every pending migration and return the ones that ran."""
+    migrations = load_migrations(directory)
+    with psycopg.connect(url, autocommit=True) as connection:
+        connection.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+        try:
+            connection.execute(_CREATE_TABLE_SQL)
+            applied = _applied(connection)
+            _verify(migrations, applied)
+
+            ran = []
+            for migration in migrations:
+                if migration.version in applied:
+                    continue
+                print(f"Applying migration {migration.version:04d}_{migration.name}")
+                try:
+                    _apply(connection, migration)
+                except Exception as e:
+                    raise MigrationError(f"Migration {migration.version:04d}_{migration.name} failed: {e}") from e
+                ran.append(migration)
+            return ran
+        finally:
+            connection.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+
+
+def status(url: str = conninfo, directory: Path = MIGRATIONS_DIR):
+    migrations = load_migrations(directory)
+    with psycopg.connect(url, autocommit=True) as connection:
+        connection.execute(_CREATE_TABLE_SQL)
+        applied = _applied(connection)
+    for migration in migrations:
+        checksum = applied.get(migration.version)
+        if checksum is None:
+            state = "pending"
+        elif checksum != migration.checksum:
+            state = "modified"
+        else:
+            state = "applied"
+        mode = "" if migration.transactional else " (no-transaction)"
+        print(f"{migration.version:04d}_{migration.name:<50} {state}{mode}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "up"
+    if command == "up":
+        ran = migrate()
+        print(f"Applied {len(ran)} migration(s)")
+    elif command == "status":
+        status()
+    else:
+        raise SystemExit(f"Unknown command {command!r}, expected 'up' or 'status'")
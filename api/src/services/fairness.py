@@ -0,0 +1,114 @@
+"""
+Per-member workload for a room over a date window.
+
+The repository pulls the raw rows once; everything here is a vectorized
+pass over those columns (bincount over member and member x chore indexes),
+so the cost is a few array operations regardless of how many completions
+a room has.
+"""
+from datetime import datetime
+from typing import List, Sequence
+
+import numpy as np
+
+from src.utils.chore_frequency import effort_weight, period_days
+
+SECONDS_PER_DAY = 86400.0
+
+
+def _indexer(ids: Sequence[int]):
+    """Map ids to their position in ``ids`` (-1 when absent), vectorized."""
+    ids = np.asarray(ids, dtype=np.int64)
+    order = np.argsort(ids)
+    sorted_ids = ids[order]
+
+    def index_of(values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.int64)
+        if not len(sorted_ids):
+            return np.full(len(values), -1, dtype=np.int64)
+        positions = np.clip(np.searchsorted(sorted_ids, values), 0, len(sorted_ids) - 1)
+        return np.where(sorted_ids[positions] == values, order[positions], -1)
+
+    return index_of
+
+
+def _columns(rows: List[tuple], count: int) -> List[np.ndarray]:
+    if not rows:
+        return [np.empty(0) for _ in range(count)]
+    return [np.asarray(column) for column in zip(*rows)]
+
+
+def compute_fairness(members: List[tuple], chores: List[tuple], completions: List[tuple],
+                     assignments: List[tuple], swaps: List[tuple],
+                     window_start: datetime, window_end: datetime) -> dict:
+    """
+    ``members``: (membership_id, user_id, name); ``chores``: (chore_id, frequency);
+    ``completions``: (membership_id, chore_id) of non-rejected completions in
+    the window; ``assignments``: (membership_id, chore_id, start_epoch,
+    end_epoch, share) with share = 1 / number of co-assignees; ``swaps``:
+    (from_membership,) of swaps accepted in the window.
+    """
+    n_members, n_chores = len(members), len(chores)
+    member_index = _indexer([member[0] for member in members])
+    chore_index = _indexer([chore[0] for chore in chores])
+    periods = np.array([period_days(chore[1]) or np.nan for chore in chores], dtype=float)
+    weights = np.array([effort_weight(chore[1]) for chore in chores], dtype=float)
+
+    # Completions and effort per member, and per (member, chore) pair
+    done_members, done_chores = _columns(completions, 2)
+    done_m, done_c = member_index(done_members), chore_index(done_chores)
+    valid = (done_m >= 0) & (done_c >= 0)
+    done_m, done_c = done_m[valid], done_c[valid]
+    completed = np.bincount(done_m, minlength=n_members)
+    effort = np.bincount(done_m, weights=weights[done_c], minlength=n_members)
+    done_pairs = np.bincount(done_m * n_chores + done_c, minlength=n_members * n_chores)
+
+    # Expected completions from the part of each assignment inside the window
+    assigned_members, assigned_chores, starts, ends, shares = _columns(assignments, 5)
+    assigned_m, assigned_c = member_index(assigned_members), chore_index(assigned_chores)
+    valid = (assigned_m >= 0) & (assigned_c >= 0)
+    assigned_m, assigned_c = assigned_m[valid], assigned_c[valid]
+    overlap = (np.minimum(ends[valid].astype(float), window_end.timestamp())
+               - np.maximum(starts[valid].astype(float), window_start.timestamp())) / SECONDS_PER_DAY
+    overlap = np.clip(overlap, 0, None)
+    expected = np.nan_to_num(overlap / periods[assigned_c]) * shares[valid].astype(float)
+
+    pairs = assigned_m * n_chores + assigned_c
+    expected_pairs = np.zeros(n_members * n_chores)
+    # The same assignment can appear in the history and as the active row
+    np.maximum.at(expected_pairs, pairs, expected)
+    assigned_pairs = np.zeros(n_members * n_chores, dtype=bool)
+    assigned_pairs[pairs[overlap > 0]] = True
+    missed_pairs = np.floor(np.clip(expected_pairs - done_pairs, 0, None))
+
+    assigned = assigned_pairs.reshape(n_members, n_chores).sum(axis=1)
+    missed = missed_pairs.reshape(n_members, n_chores).sum(axis=1)
+
+    swapped_m = member_index(_columns(swaps, 1)[0])
+    swapped_away = np.bincount(swapped_m[swapped_m >= 0], minlength=n_members)
+
+    total_effort = effort.sum()
+    shares_of_effort = effort / total_effort if total_effort else np.zeros(n_members)
+    # Jain's index: 1 when effort is split evenly, 1/n when one member does everything
+    squares = (effort ** 2).sum()
+    fairness_index = float(total_effort ** 2 / (n_members * squares)) if squares else None
+
+    results = [
+        {
+            "membership_id": member[0],
+            "user_id": member[1],
+            "name": member[2],
+            "completed": int(completed[i]),
+            "assigned": int(assigned[i]),
+            "missed": int(missed[i]),
+            "swapped_away": int(swapped_away[i]),
+            "effort_score": round(float(effort[i]), 2),
+            "effort_share": round(float(shares_of_effort[i]), 4),
+        }
+        for i, member in enumerate(members)
+    ]
+    results.sort(key=lambda result: result["effort_score"], reverse=True)
+    return {
+        "fairness_index": round(fairness_index, 4) if fairness_index is not None else None,
+        "members": results,
+    }
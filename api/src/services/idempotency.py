@@ -0,0 +1,83 @@
+from functools import wraps
+import hashlib
+import json
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.features.settings import IDEMPOTENCY_TTL_SECONDS
+from src.repository.idempotency_repository import IdempotencyRepository
+from src.services.database.helper import transaction
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+repo = IdempotencyRepository()
+
+
+def _resolve(kwargs: dict, path: str):
+    """Look up ``name`` or ``name.attr`` among the route's keyword arguments."""
+    name, *attrs = path.split(".")
+    value = kwargs[name]
+    for attr in attrs:
+        value = getattr(value, attr)
+    return value
+
+
+def _request_hash(kwargs: dict) -> str:
+    payload = jsonable_encoder({k: v for k, v in kwargs.items() if k != "idempotency_key"})
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def idempotent(route: str, user_param: str):
+    """
+    Replay the stored response when a request repeats an Idempotency-Key.
+
+    The decorated route must accept an ``idempotency_key`` header parameter.
+    Keys are scoped per caller (``user_param`` names the argument identifying
+    them, dotted paths reach into request bodies) and per ``route``. The
+    handler runs in one transaction holding an advisory lock on the key, so a
+    concurrent duplicate waits and then replays instead of writing twice.
+    Place it above ``error_handler`` so its own HTTP errors pass through.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            idempotency_key = kwargs.get("idempotency_key")
+            if not idempotency_key:
+                return func(*args, **kwargs)
+
+            user_scope = str(_resolve(kwargs, user_param))
+            request_hash = _request_hash(kwargs)
+
+            with transaction():
+                repo.acquire_lock(user_scope, route, idempotency_key)
+                stored = repo.get_response(user_scope, route, idempotency_key)
+                if stored:
+                    if stored["request_hash"] != request_hash:
+                        raise HTTPException(
+                            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=f"{IDEMPOTENCY_HEADER} was already used with a different request"
+                        )
+                    return JSONResponse(
+                        content=stored["response_body"],
+                        status_code=stored["status_code"],
+                        headers={REPLAYED_HEADER: "true"}
+                    )
+
+                result = func(*args, **kwargs)
+                repo.save_response(
+                    user_scope,
+                    route,
+                    idempotency_key,
+                    request_hash,
+                    status.HTTP_200_OK,
+                    jsonable_encoder(result),
+                    IDEMPOTENCY_TTL_SECONDS,
+                )
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,119 @@
+import json
+import os
+import socket
+import threading
+import uuid
+from typing import Iterable, Optional
+
+import psycopg
+
+from src.services.cache import cache, entity_tags
+from src.services.database.helper import after_commit, conninfo, run_sql
+
+CHANNEL = "cache_invalidation"
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7500
+
+
+def invalidate(entity: str, room_id: Optional[int] = None, ids: Iterable[int] = ()):
+    """
+    Evict cache entries affected by a write to ``entity`` rows ``ids`` in
+    ``room_id``. The local cache is evicted once the write commits and the
+    message is published with pg_notify (which Postgres also delivers on
+    commit) so every other worker evicts the same tags. When the ids would
+    not fit in a notification, other workers get a room-level message (every
+    cached read is tagged with its room), or a full flush without a room.
+    """
+    ids = list(ids)
+    tags = entity_tags(entity, room_id, ids)
+    if not tags:
+        return
+
+    message = {"origin": WORKER_ID, "entity": entity, "room_id": room_id, "ids": ids}
+    payload = json.dumps(message)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        payload = json.dumps({**message, "ids": [], "flush": room_id is None})
+    run_sql("SELECT pg_notify(%s, %s)", (CHANNEL, payload))
+    after_commit(lambda: cache.delete_tags(*tags))
+
+
+class InvalidationListener:
+    """
+    Background thread that LISTENs on a dedicated connection (outside the
+    pool) and evicts local entries named by other workers' messages. After
+    the connection drops it reconnects with backoff and flushes the whole
+    cache, since messages sent while it was away are lost.
+    """
+
+    def __init__(self, poll_timeout: float = 5.0, max_backoff: float = 30.0):
+        self.poll_timeout = poll_timeout
+        self.max_backoff = max_backoff
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.received = 0
+        self.reconnects = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout + 1)
+            self._thread = None
+
+    def _run(self):
+        backoff = 0.5
+        first_connect = True
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {CHANNEL}")
+                    if not first_connect:
+                        self.reconnects += 1
+                        cache.clear()
+                    first_connect = False
+                    backoff = 0.5
+                    while not self._stop.is_set():
+                        for notify in connection.notifies(timeout=self.poll_timeout):
+                            try:
+                                self._handle(notify.payload)
+                            except Exception as e:
+                                # One bad message must not end the thread and with it all later evictions
+                                print(f"Failed to handle invalidation message {notify.payload!r}: {e}")
+            except psycopg.Error as e:
+                print(f"Cache invalidation listener disconnected: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def _handle(self, payload: str):
+        self.received += 1
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            message = None
+        if not _well_formed(message):
+            print(f"Ignoring malformed invalidation message: {payload!r}")
+            return
+        if message.get("origin") == WORKER_ID:
+            return
+        if message.get("flush"):
+            cache.clear()
+            return
+        tags = entity_tags(message["entity"], message.get("room_id"), message.get("ids") or ())
+        if tags:
+            cache.delete_tags(*tags)
+
+
+def _well_formed(message) -> bool:
+    if not isinstance(message, dict) or not isinstance(message.get("entity"), str):
+        return False
+    room_id, ids = message.get("room_id"), message.get("ids") or []
+    return ((room_id is None or isinstance(room_id, int))
+            and isinstance(ids, list) and all(isinstance(entity_id, int) for entity_id in ids))
+
+listener = InvalidationListener()
@@ -0,0 +1,204 @@
+"""
+Durable background jobs stored in the ``job`` table.
+
+Handlers are registered by name with ``@job`` and scheduled with
+``enqueue``, which writes through run_sql: inside ``transaction()`` the job
+only becomes visible if the surrounding writes commit. Workers (see
+src/worker.py) claim due jobs with ``FOR UPDATE SKIP LOCKED`` so any
+number of processes can share a queue without handing out a job twice.
+A failing job is retried with exponential backoff until ``max_attempts``,
+then kept as 'failed' with its last error for inspection. Handlers
+registered with ``every`` are also enqueued periodically by the workers'
+maintenance loop.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable, Dict, Optional
+
+import psycopg
+
+from src.features.settings import (
+    JOB_POLL_INTERVAL, JOB_RETRY_BASE_SECONDS, JOB_RETRY_MAX_SECONDS, JOB_TIMEOUT_SECONDS, JOB_RETENTION_SECONDS,
+)
+from src.repository.job_repository import JobRepository
+from src.services.database.helper import conninfo, run_sql
+
+CHANNEL = "job_queue"
+DEFAULT_QUEUE = "default"
+
+repo = JobRepository()
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    name: str
+    func: Callable
+    queue: str
+    max_attempts: int
+    every: Optional[float]
+
+
+registry: Dict[str, JobHandler] = {}
+
+# Id of the job the current worker thread is running
+_current_job_id: ContextVar[Optional[int]] = ContextVar("current_job_id", default=None)
+
+
+def job(name: str, queue: str = DEFAULT_QUEUE, max_attempts: int = 5, every: Optional[float] = None):
+    """
+    Register ``func(**payload)`` as the handler for jobs called ``name``. With
+    ``every`` (seconds) the job also runs periodically with an empty payload.
+    """
+    def decorator(func):
+        if name in registry:
+            raise ValueError(f"Job {name!r} is already registered")
+        registry[name] = JobHandler(name, func, queue, max_attempts, every)
+        return func
+    return decorator
+
+
+def enqueue(name: str, payload: Optional[dict] = None, run_at: Optional[datetime] = None,
+            delay_seconds: float = 0, queue: Optional[str] = None, max_attempts: Optional[int] = None) -> int:
+    """Schedule a registered job and return its id. Runs at ``run_at`` (default now) plus ``delay_seconds``."""
+    handler = registry.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown job {name!r}")
+    queue = queue or handler.queue
+    job_id = repo.enqueue(name, payload or {}, queue, run_at, delay_seconds, max_attempts or handler.max_attempts)
+    # Delivered on commit, so workers never wake up for a job they cannot see yet
+    run_sql("SELECT pg_notify(%s, %s)", (CHANNEL, queue))
+    return job_id
+
+
+def set_progress(**progress):
+    """
+    Record progress of the running job in its ``progress`` column. This also
+    refreshes ``locked_at``, so long jobs that report progress are not
+    mistaken for ones whose worker died.
+    """
+    job_id = _current_job_id.get()
+    if job_id is not None:
+        repo.set_progress(job_id, progress)
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter, capped at JOB_RETRY_MAX_SECONDS."""
+    ceiling = min(JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), JOB_RETRY_MAX_SECONDS)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class Worker:
+    """
+    Runs jobs from ``queues`` (queue name -> number of concurrent jobs) on
+    one thread per slot. Idle slots sleep until a NOTIFY for their queue
+    arrives or JOB_POLL_INTERVAL passes, which also picks up delayed jobs.
+    Concurrency limits are per worker process.
+    """
+
+    def __init__(self, queues: Dict[str, int], poll_interval: float = JOB_POLL_INTERVAL):
+        self.queues = queues
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._wakeups = {queue: threading.Condition() for queue in queues}
+        self._threads = []
+
+    def run(self):
+        """Block until ``stop`` is called, then let running jobs finish."""
+        print(f"Worker {self.worker_id} running queues {self.queues} with jobs {sorted(registry)}")
+        for queue, concurrency in self.queues.items():
+            for slot in range(concurrency):
+                thread = threading.Thread(target=self._run_slot, args=(queue,), name=f"job-{queue}-{slot}")
+                thread.start()
+                self._threads.append(thread)
+        maintenance = threading.Thread(target=self._run_maintenance, name="job-maintenance", daemon=True)
+        maintenance.start()
+
+        self._listen()
+        for thread in self._threads:
+            thread.join()
+
+    def stop(self):
+        self._stop.set()
+        for condition in self._wakeups.values():
+            with condition:
+                condition.notify_all()
+
+    def _listen(self):
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {CHANNEL}")
+                    backoff = 0.5
+                    while not self._stop.is_set():
+                        for notify in connection.notifies(timeout=self.poll_interval):
+                            self._wake(notify.payload)
+            except psycopg.Error as e:
+                print(f"Job queue listener disconnected: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _wake(self, queue: str):
+        condition = self._wakeups.get(queue)
+        if condition is not None:
+            with condition:
+                condition.notify()
+
+    def _run_slot(self, queue: str):
+        while not self._stop.is_set():
+            try:
+                claimed = repo.claim(queue, self.worker_id)
+            except Exception as e:
+                print(f"Error claiming jobs from {queue}: {e}")
+                claimed = []
+            if claimed:
+                self._execute(claimed[0])
+                continue
+            condition = self._wakeups[queue]
+            with condition:
+                condition.wait(self.poll_interval)
+
+    def _execute(self, claimed: dict):
+        handler = registry.get(claimed["name"])
+        start = time.perf_counter()
+        token = _current_job_id.set(claimed["job_id"])
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job {claimed['name']!r}")
+            handler.func(**claimed["payload"])
+        except Exception as e:
+            retry_in = retry_delay(claimed["attempts"]) if claimed["attempts"] < claimed["max_attempts"] else None
+            print(f"Job {claimed['job_id']} ({claimed['name']}) failed on attempt {claimed['attempts']}: {e}")
+            repo.mark_failed(claimed["job_id"], traceback.format_exc(limit=20), retry_in)
+            return
+        finally:
+            _current_job_id.reset(token)
+        repo.mark_succeeded(claimed["job_id"])
+        print(f"Job {claimed['job_id']} ({claimed['name']}) finished in {time.perf_counter() - start:.2f}s")
+
+    def _run_maintenance(self):
+        while not self._stop.wait(60):
+            try:
+                stale = repo.requeue_stale(JOB_TIMEOUT_SECONDS)
+                if stale:
+                    print(f"Requeued {stale} stale job(s)")
+                repo.delete_finished(JOB_RETENTION_SECONDS)
+                self._schedule_periodic()
+            except Exception as e:
+                print(f"Error during job maintenance: {e}")
+
+    def _schedule_periodic(self):
+        for handler in registry.values():
+            if handler.every is None or handler.queue not in self.queues:
+                continue
+            if repo.enqueue_periodic(handler.name, handler.queue, handler.every, handler.max_attempts):
+                run_sql("SELECT pg_notify(%s, %s)", (CHANNEL, handler.queue))
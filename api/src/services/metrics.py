@@ -0,0 +1,202 @@
+from bisect import bisect_left
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from src.services.database.helper import add_query_hook, pool
+from src.services.singleflight import singleflight
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+registry: List = []
+
+
+class _Metric:
+    """
+    Base for metrics sharded per thread: each thread updates its own dict
+    without locking, and a scrape sums the shards. The lock is only taken
+    the first time a thread touches the metric.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _labels(self, values: Tuple) -> str:
+        pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values))
+        return "{" + pairs + "}" if pairs else ""
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> Dict[Tuple, float]:
+        totals: Dict[Tuple, float] = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{self._labels(labels)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: Tuple, value: float):
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # per-bucket counts (+Inf last), then sum
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> Dict[Tuple, list]:
+        totals: Dict[Tuple, list] = {}
+        for shard in list(self._shards):
+            for labels, series in list(shard.items()):
+                total = totals.setdefault(labels, [0] * len(series))
+                for i, value in enumerate(series):
+                    total[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, series in sorted(self.collect().items()):
+            base = self._labels(labels)[1:-1]
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            label_str = "{" + base + "}" if base else ""
+            lines.append(f"{self.name}_sum{label_str} {series[-1]}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class GaugeFunction:
+    """Gauges read from a callback at scrape time."""
+
+    def __init__(self, name: str, help: str, read: Callable[[], float], kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.read = read
+        self.kind = kind
+        registry.append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", f"{self.name} {self.read()}"]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_latency = Histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+db_query_latency = Histogram("db_query_duration_seconds", "SQL statement latency by repository method.", ("caller",))
+db_query_errors = Counter("db_query_errors_total", "Failed SQL statements by repository method.", ("caller",))
+
+
+def _pool_stat(key: str) -> Callable[[], float]:
+    return lambda: pool.get_stats().get(key, 0)
+
+
+GaugeFunction("db_pool_size", "Connections currently managed by the pool.", _pool_stat("pool_size"))
+GaugeFunction("db_pool_idle", "Idle connections available in the pool.", _pool_stat("pool_available"))
+GaugeFunction("db_pool_waiting", "Requests currently waiting for a connection.", _pool_stat("requests_waiting"))
+GaugeFunction("db_pool_checkouts_total", "Connection requests served by the pool.", _pool_stat("requests_num"), kind="counter")
+GaugeFunction("db_pool_checkout_wait_ms_total", "Total time spent waiting for a connection.", _pool_stat("requests_wait_ms"), kind="counter")
+GaugeFunction("db_pool_checkout_errors_total", "Connection requests that failed or timed out.", _pool_stat("requests_errors"), kind="counter")
+
+
+def _singleflight_lines() -> List[str]:
+    stats = singleflight.stats()
+    lines = [
+        "# HELP singleflight_calls_total Repository reads by whether they ran or joined an in-flight call.",
+        "# TYPE singleflight_calls_total counter",
+    ]
+    for name, counts in sorted(stats.items()):
+        lines.append(f'singleflight_calls_total{{method="{name}",outcome="executed"}} {counts["executions"]}')
+        lines.append(f'singleflight_calls_total{{method="{name}",outcome="coalesced"}} {counts["coalesced"]}')
+    return lines
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in registry:
+        lines.extend(metric.render())
+    lines.extend(_singleflight_lines())
+    return "\n".join(lines) + "\n"
+
+
+def _record_query(sql, params, caller: str, duration: float, rows: int, error):
+    db_query_latency.observe((caller,), duration)
+    if error is not None:
+        db_query_errors.inc((caller,))
+
+
+add_query_hook(_record_query)
+
+
+class MetricsMiddleware:
+    """Per-route request counts, status codes and latency."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_latency.observe((method, route_path), time.perf_counter() - start)
+            http_requests.inc((method, route_path, status_code))
@@ -0,0 +1,165 @@
+from collections import Counter
+from contextvars import ContextVar
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from src.features.settings import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_SAMPLE_RATE
+from src.utils.permissions import is_admin_token
+
+try:
+    from anyio._backends._asyncio import WorkerThread
+    # Sync endpoints run inside this frame with the request's copied context
+    _WORKER_RUN_CODE = WorkerThread.run.__code__
+except (ImportError, AttributeError):
+    _WORKER_RUN_CODE = None
+
+PROFILE_HEADER = "x-profile"
+PROFILE_FILE_HEADER = "x-profile-file"
+
+_PROFILE_HEADER_RAW = PROFILE_HEADER.encode()
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+class ProfileSession:
+    def __init__(self, name: str, root_frame):
+        self.name = name
+        self.root_frame = root_frame
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def write(self, directory: str) -> str:
+        """Write Brendan Gregg's collapsed format: one "root;...;leaf count" line per stack."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.name)
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+_active_session: ContextVar[Optional[ProfileSession]] = ContextVar("active_profile_session", default=None)
+
+_labels: Dict = {}
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+class StackSampler:
+    """
+    Samples every thread with sys._current_frames() while at least one
+    session is active, and attributes a stack to a session when it runs
+    inside that request: on the event loop the request's middleware frame
+    is on the stack, in the threadpool the worker runs the request's copied
+    context. The thread only exists while something is being profiled.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._sessions: Dict[int, ProfileSession] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, session: ProfileSession):
+        with self._lock:
+            self._sessions[id(session.root_frame)] = session
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, session: ProfileSession):
+        with self._lock:
+            self._sessions.pop(id(session.root_frame), None)
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._sessions:
+                    self._thread = None
+                    return
+                sessions = dict(self._sessions)
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    self._sample(frame, sessions)
+            time.sleep(self.interval)
+
+    def _sample(self, frame, sessions: Dict[int, ProfileSession]):
+        stack: List[str] = []
+        while frame is not None:
+            stack.append(_label(frame.f_code))
+            session = sessions.get(id(frame))
+            if session is None and frame.f_code is _WORKER_RUN_CODE:
+                context = frame.f_locals.get("context")
+                session = context.get(_active_session) if context is not None else None
+            if session is not None and session.root_frame is not None:
+                stack.reverse()
+                session.stacks[";".join(stack)] += 1
+                session.samples += 1
+                return
+            frame = frame.f_back
+
+
+sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+
+
+class ProfilerMiddleware:
+    """
+    Statistical profile of a sampled fraction of requests (PROFILE_SAMPLE_RATE)
+    and of requests sending an X-Profile header with the admin token. The
+    collapsed-stack file is written to PROFILE_DIR and named in the
+    X-Profile-File response header; feed it to flamegraph.pl or speedscope.
+    Requests that are not profiled only pay for one header scan.
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE, directory: str = PROFILE_DIR):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.directory = directory
+
+    def _should_profile(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        for name, value in scope["headers"]:
+            if name == _PROFILE_HEADER_RAW:
+                return is_admin_token(value.decode("latin-1"))
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        slug = _UNSAFE_CHARS_RE.sub("_", scope["path"]).strip("_")
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-{uuid.uuid4().hex[:8]}.collapsed"
+        session = ProfileSession(name, sys._getframe())
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_FILE_HEADER.encode(), name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _active_session.set(session)
+        sampler.add(session)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.remove(session)
+            _active_session.reset(token)
+            session.root_frame = None
+            try:
+                session.write(self.directory)
+            except OSError as e:
+                print(f"Failed to write profile {name}: {e}")
@@ -0,0 +1,103 @@
+from collections import deque
+import json
+import logging
+import threading
+from typing import Deque, Dict, List, Tuple
+
+from src.features.settings import SLOW_QUERY_MS
+from src.services.database.helper import add_query_hook
+from src.services.query_trace import fingerprint
+
+slow_query_logger = logging.getLogger("dormduty.slow_query")
+
+SAMPLE_SIZE = 512
+
+
+class _FingerprintStats:
+    __slots__ = ("calls", "errors", "rows", "total", "max", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        # recent durations only, so percentiles follow the current workload
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class QueryStats:
+    """
+    Rolling per-(fingerprint, caller) aggregate, like pg_stat_statements
+    but attributed to the repository method that issued the statement.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], _FingerprintStats] = {}
+
+    def record(self, fp: str, caller: str, duration: float, rows: int, failed: bool):
+        with self._lock:
+            stats = self._stats.get((fp, caller))
+            if stats is None:
+                stats = self._stats[(fp, caller)] = _FingerprintStats()
+            stats.calls += 1
+            stats.rows += rows
+            stats.total += duration
+            stats.samples.append(duration)
+            if duration > stats.max:
+                stats.max = duration
+            if failed:
+                stats.errors += 1
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            items = [(key, stats.calls, stats.errors, stats.rows, stats.total, stats.max, sorted(stats.samples))
+                     for key, stats in self._stats.items()]
+        results = []
+        for (fp, caller), calls, errors, rows, total, max_duration, ordered in items:
+            results.append({
+                "fingerprint": fp,
+                "caller": caller,
+                "calls": calls,
+                "errors": errors,
+                "rows": rows,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total / calls * 1000, 3),
+                "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+                "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+                "max_ms": round(max_duration * 1000, 3),
+            })
+        results.sort(key=lambda row: row["total_ms"], reverse=True)
+        return results
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+query_stats = QueryStats()
+
+
+def _record_query(sql, params, caller: str, duration: float, rows: int, error):
+    fp = fingerprint(sql)
+    query_stats.record(fp, caller, duration, rows, error is not None)
+    duration_ms = duration * 1000
+    if duration_ms >= SLOW_QUERY_MS:
+        slow_query_logger.warning(json.dumps({
+            "event": "slow_query",
+            "fingerprint": fp,
+            "caller": caller,
+            "duration_ms": round(duration_ms, 3),
+            "rows": rows,
+            "error": str(error) if error is not None else None,
+        }))
+
+
+add_query_hook(_record_query)
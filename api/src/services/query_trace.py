@@ -0,0 +1,132 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+import logging
+import re
+from typing import Dict, List, Optional
+
+from src.features.settings import N_PLUS_ONE_THRESHOLD
+from src.services.database.helper import add_query_hook
+
+logger = logging.getLogger("dormduty.query_trace")
+
+TRACE_HEADER = "x-query-trace"
+N_PLUS_ONE_HEADER = "x-n-plus-one"
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so executions differing only in values match."""
+    text = _STRING_RE.sub("?", sql)
+    text = _PLACEHOLDER_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("(?+)", text)
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+@dataclass
+class TracedQuery:
+    fingerprint: str
+    caller: str
+    duration: float
+    rows: int
+
+
+@dataclass
+class QueryTrace:
+    route: str = ""
+    queries: List[TracedQuery] = field(default_factory=list)
+
+    @property
+    def total_time(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Fingerprints executed more than ``threshold`` times."""
+        counts = Counter(query.fingerprint for query in self.queries)
+        return {fp: count for fp, count in counts.items() if count > threshold}
+
+    def callers(self, fp: str) -> List[str]:
+        return sorted({query.caller for query in self.queries if query.fingerprint == fp})
+
+    def summary(self) -> str:
+        max_repeat = max(Counter(q.fingerprint for q in self.queries).values(), default=0)
+        return f"count={len(self.queries)}; total_ms={self.total_time * 1000:.1f}; max_repeat={max_repeat}"
+
+    def assert_no_n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        repeated = self.repeated(threshold)
+        if repeated:
+            raise NPlusOneError(self, repeated)
+
+
+class NPlusOneError(AssertionError):
+    def __init__(self, trace: QueryTrace, repeated: Dict[str, int]):
+        details = "; ".join(
+            f"{count}x by {', '.join(trace.callers(fp))}: {fp[:120]}" for fp, count in repeated.items()
+        )
+        super().__init__(f"N+1 query pattern in {trace.route or 'traced block'}: {details}")
+        self.repeated = repeated
+
+
+_current_trace: ContextVar[Optional[QueryTrace]] = ContextVar("current_query_trace", default=None)
+
+
+def _record_query(sql, params, caller: str, duration: float, rows: int, error):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.queries.append(TracedQuery(fingerprint(sql), caller, duration, rows))
+
+
+add_query_hook(_record_query)
+
+
+@contextmanager
+def trace_queries(route: str = ""):
+    """Collect every statement run inside the block, e.g. to assert on N+1 in tests."""
+    trace = QueryTrace(route=route)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+class QueryTraceMiddleware:
+    """
+    Traces the statements each request runs, reports them in the
+    x-query-trace response header and logs a warning naming the route when a
+    fingerprint repeats more than N_PLUS_ONE_THRESHOLD times.
+    """
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with trace_queries() as trace:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    route = scope.get("route")
+                    trace.route = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+                    headers = list(message.get("headers", []))
+                    headers.append((TRACE_HEADER.encode(), trace.summary().encode()))
+                    repeated = trace.repeated(self.threshold)
+                    if repeated:
+                        headers.append((N_PLUS_ONE_HEADER.encode(), str(max(repeated.values())).encode()))
+                        logger.warning(str(NPlusOneError(trace, repeated)))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,39 @@
+"""
+Background removal of soft-deleted rooms.
+
+Leaving or emptying a room only sets ``room.deleted_at``; this module
+deletes the rows afterwards, one table at a time in dependency order and
+in batches of ROOM_PURGE_BATCH_SIZE rows. Every batch commits on its own,
+so no statement holds locks for long, and the pause between batches
+spreads the WAL and vacuum load. Progress is recorded on the job row and
+a rerun after a crash simply continues with whatever rows are left.
+"""
+import time
+
+from src.features.settings import ROOM_PURGE_BATCH_SIZE, ROOM_PURGE_BATCH_DELAY
+from src.repository.rooms_repository import PURGE_STEPS, RoomRepository
+from src.services.job_queue import set_progress
+
+repo = RoomRepository()
+
+
+def purge_room(room_id: int, batch_size: int = ROOM_PURGE_BATCH_SIZE, delay: float = ROOM_PURGE_BATCH_DELAY):
+    if not repo.is_room_deleted(room_id):
+        print(f"Room {room_id} is not marked deleted, skipping purge")
+        return {}
+
+    deleted = {}
+    for step, (table, condition) in enumerate(PURGE_STEPS, start=1):
+        deleted[table] = 0
+        while True:
+            count = repo.purge_batch(table, condition, room_id, batch_size)
+            deleted[table] += count
+            if count < batch_size:
+                break
+            set_progress(room_id=room_id, table=table, step=step, steps=len(PURGE_STEPS), deleted=dict(deleted))
+            time.sleep(delay)
+        if deleted[table]:
+            set_progress(room_id=room_id, table=table, step=step, steps=len(PURGE_STEPS), deleted=dict(deleted))
+
+    print(f"Purged room {room_id}: {sum(deleted.values())} rows ({deleted})")
+    return deleted
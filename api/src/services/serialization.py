@@ -0,0 +1,88 @@
+import hashlib
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Type
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+KEY_CASE_HEADER = "x-key-case"
+
+_CAMEL_RE = re.compile(r"[-_]([a-zA-Z])")
+
+
+@lru_cache(maxsize=4096)
+def to_camel(key: str) -> str:
+    """snake_case -> camelCase, matching ``toCamel`` in client/utils/apiMapper.ts."""
+    return _CAMEL_RE.sub(lambda match: match.group(1).upper(), key)
+
+
+@lru_cache(maxsize=None)
+def camel_alias_map(model: Type[BaseModel]) -> Dict[str, str]:
+    """Field name -> camelCase alias for a model, computed once per class."""
+    return {name: to_camel(name) for name in model.model_fields}
+
+
+def camelize(value: Any) -> Any:
+    """Rewrite keys of dicts and pydantic models to camelCase.
+
+    Models are read straight from ``__dict__`` without re-validation; scalars
+    (datetime, time, Decimal, ...) are left for orjson to encode.
+    """
+    if isinstance(value, BaseModel):
+        aliases = camel_alias_map(type(value))
+        return {aliases[name]: camelize(item) for name, item in value.__dict__.items()}
+    if isinstance(value, dict):
+        return {to_camel(key) if isinstance(key, str) else key: camelize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [camelize(item) for item in value]
+    return value
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class CamelJSONResponse(JSONResponse):
+    """orjson-backed response that emits camelCase keys.
+
+    Routes opt in by returning ``CamelJSONResponse(data)`` directly, which
+    skips FastAPI's ``jsonable_encoder`` pass. The ``x-key-case`` header lets
+    the client skip its own ``snakeToCamel`` mapping.
+    """
+
+    def init_headers(self, headers=None):
+        super().init_headers({**(headers or {}), KEY_CASE_HEADER: "camel"})
+
+    def render(self, content: Any) -> bytes:
+        return dumps(camelize(content))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison: the compression middleware marks encoded variants W/
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def etagged(request: Request, content: Any) -> Response:
+    """``CamelJSONResponse(content)`` with a strong ETag over the body.
+
+    For cacheable room-level lists: a client sending a matching If-None-Match
+    gets an empty 304, and the compression middleware compresses each
+    distinct body once instead of on every request.
+    """
+    response = CamelJSONResponse(content)
+    etag = f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"etag": etag})
+    response.headers["etag"] = etag
+    return response
@@ -0,0 +1,85 @@
+from functools import wraps
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from src.services.database.helper import in_transaction
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive the same result (or exception).
+    Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._counters: Dict[str, list] = {}
+
+    def do(self, name: str, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            counters = self._counters.setdefault(name, [0, 0])
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                counters[0] += 1
+            else:
+                counters[1] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                name: {"executions": executions, "coalesced": coalesced}
+                for name, (executions, coalesced) in self._counters.items()
+            }
+
+
+singleflight = SingleFlight()
+
+
+def coalesce(func):
+    """
+    Share one in-flight database query between concurrent identical calls
+    to a repository read method. Calls inside a transaction() are never
+    coalesced since they may see uncommitted writes.
+    """
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if in_transaction():
+            return func(self, *args, **kwargs)
+        key = (name, args, tuple(sorted(kwargs.items())))
+        return singleflight.do(name, key, lambda: func(self, *args, **kwargs))
+
+    return wrapper
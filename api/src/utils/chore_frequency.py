@@ -0,0 +1,76 @@
+import math
+import re
+from typing import Optional
+
+# Frequency labels are the strings the client offers (client/constants/choreConstants.ts)
+DAYS_PER_MONTH = 30.44
+
+_FIXED_PERIODS = {
+    "daily": 1.0,
+    "every other day": 2.0,
+    "weekly": 7.0,
+    "every other week": 14.0,
+    "monthly": DAYS_PER_MONTH,
+    "yearly": 365.0,
+    # A chosen weekday repeats weekly
+    "choose a day": 7.0,
+}
+_UNSCHEDULED = {"as needed", "one time"}
+_EVERY_N = re.compile(r"^every ([1-9]\d*) (day|week|month)s?$")
+_UNIT_DAYS = {"day": 1.0, "week": 7.0, "month": DAYS_PER_MONTH}
+
+# Effort weight of a completion when the chore has no schedule
+UNSCHEDULED_WEIGHT = 2.0
+# Assumed rate of "As Needed" / "One Time" chores when balancing load
+UNSCHEDULED_OCCURRENCES_PER_WEEK = 0.25
+
+
+def period_days(frequency: Optional[str]) -> Optional[float]:
+    """Days between occurrences of a chore, or None for unscheduled chores"""
+    if not frequency:
+        return None
+    label = frequency.strip().lower()
+    if label in _FIXED_PERIODS:
+        return _FIXED_PERIODS[label]
+    if label in _UNSCHEDULED:
+        return None
+    match = _EVERY_N.match(label)
+    if match:
+        return int(match.group(1)) * _UNIT_DAYS[match.group(2)]
+    return None
+
+
+def effort_weight(frequency: Optional[str]) -> float:
+    """
+    Relative effort of one completion. Rarer chores tend to be bigger jobs, so
+    the weight grows with the log of the period: daily 1, weekly ~3.8,
+    monthly ~5.9, yearly ~9.5.
+    """
+    days = period_days(frequency)
+    if days is None:
+        return UNSCHEDULED_WEIGHT
+    return 1.0 + math.log2(days)
+
+
+def occurrences_per_week(frequency: Optional[str]) -> float:
+    """Expected number of times a chore comes up in a week"""
+    days = period_days(frequency)
+    if days is None:
+        return UNSCHEDULED_OCCURRENCES_PER_WEEK
+    return 7.0 / days
+
+
+def period_interval_sql(column: str) -> str:
+    """
+    SQL expression equivalent to period_days(column) as an interval (NULL for
+    unscheduled chores), so queries can work out due dates in the database
+    from the same table of labels.
+    """
+    label = f"lower(btrim({column}))"
+    fixed = " ".join(f"WHEN '{name}' THEN interval '{days} days'" for name, days in _FIXED_PERIODS.items())
+    units = " ".join(f"WHEN '{unit}' THEN interval '{days} days'" for unit, days in _UNIT_DAYS.items())
+    return (
+        f"(CASE {label} {fixed} "
+        f"ELSE substring({label} from '^every ([1-9]\\d*) (?:day|week|month)s?$')::int "
+        f"* CASE substring({label} from '^every [1-9]\\d* (day|week|month)s?$') {units} END END)"
+    )
@@ -0,0 +1,65 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, status
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _encode_value(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value: Any, value_type: type):
+    if value is None:
+        return None
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    if value_type is date:
+        return date.fromisoformat(value)
+    return value_type(value)
+
+
+def encode_cursor(*values) -> str:
+    """Opaque cursor holding the sort key of the last row of a page"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Cursor does not match this endpoint")
+    return tuple(_decode_value(value, value_type) for value, value_type in zip(values, types))
+
+
+def keyset_cursor(*types: type) -> Callable:
+    """
+    Dependency parsing the ``cursor`` query parameter into a tuple of
+    ``types`` (None on the first page). Malformed cursors are rejected with
+    400 before the route runs.
+    """
+    def dependency(cursor: Optional[str] = Query(None, description="next_cursor from the previous page")):
+        if cursor is None:
+            return None
+        try:
+            return decode_cursor(cursor, *types)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return dependency
+
+
+def keyset_page(rows: Sequence, limit: int, key: Callable[[Any], Sequence]) -> dict:
+    """
+    Build a page from up to ``limit + 1`` rows fetched in sort order; the
+    extra row only tells whether another page exists.
+    """
+    items: List = list(rows[:limit])
+    next_cursor = encode_cursor(*key(items[-1])) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,6 +1,10 @@
-from fastapi import HTTPException, status
+import hmac
+from fastapi import Header, HTTPException, status
+from src.features.settings import ADMIN_TOKEN, ADMIN_DEV_BYPASS
 from src.repository.membership_repository import MembershipRepository
 
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
 class PermissionValidator:
     def __init__(self):
         self.membership_repo = MembershipRepository()
@@ -30,3 +34,23 @@ class PermissionValidator:
             )
 
 permission_validator = PermissionValidator()
+
+
+def is_admin_token(token: str | None) -> bool:
+    """
+    Without ADMIN_TOKEN every token is refused, unless IS_DEV=true is set
+    explicitly in the environment (the IS_DEV default does not count).
+    """
+    if ADMIN_TOKEN is None:
+        return ADMIN_DEV_BYPASS
+    return token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def require_admin_token(x_admin_token: str | None = Header(None, alias=ADMIN_TOKEN_HEADER)):
+    """Gate operator endpoints on the X-Admin-Token header."""
+    if is_admin_token(x_admin_token):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Admin token required for this action"
+    )
@@ -0,0 +1,43 @@
+"""
+Background job worker, run next to uvicorn:
+
+    python -m src.worker                          # queues from JOB_QUEUES
+    python -m src.worker default=4 maintenance=1  # queue=concurrency pairs
+"""
+import os
+import signal
+import sys
+from dotenv import load_dotenv
+
+env = os.getenv("ENVIRONMENT", "development")
+
+if env == "development":
+    load_dotenv(".env.dev")
+elif env == "preview":
+    load_dotenv(".env.prev")
+elif env == "production":
+    load_dotenv(".env.prod")
+
+from src.features.settings import JOB_QUEUES
+from src.services.job_queue import Worker
+import src.jobs  # noqa: F401 (registers the handlers)
+
+
+def parse_queues(specs):
+    queues = {}
+    for spec in specs:
+        name, _, concurrency = spec.partition("=")
+        queues[name.strip()] = int(concurrency or 1)
+    return queues
+
+
+def main():
+    specs = sys.argv[1:] or JOB_QUEUES.split(",")
+    worker = Worker(parse_queues(specs))
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
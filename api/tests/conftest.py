@@ -0,0 +1,100 @@
+"""
+Shared fixtures. src.services.database.helper opens its connection pool at
+import time, so the pool class is replaced with FakePool before anything
+under src is imported. Tests script what each statement returns through the
+``db`` fixture; statements still go through run_sql and its query hooks.
+"""
+from contextlib import contextmanager, nullcontext
+import sys
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import psycopg_pool
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.executed: List[Tuple[str, object]] = []
+        self._handlers: List[Tuple[str, Callable]] = []
+
+    def on(self, fragment: str, rows):
+        """Answer statements containing ``fragment`` with ``rows`` (or ``rows(params)``)."""
+        self._handlers.append((fragment, rows if callable(rows) else (lambda params: rows)))
+
+    def respond(self, sql: str, params) -> list:
+        self.executed.append((sql, params))
+        for fragment, rows in self._handlers:
+            if fragment in sql:
+                return list(rows(params))
+        return []
+
+
+class FakeCursor:
+    def __init__(self, database: FakeDatabase):
+        self.database = database
+        self.description = None
+        self._rows: list = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self._rows = self.database.respond(sql, params)
+        self.description = () if sql.lstrip().upper().startswith(("SELECT", "WITH")) or "RETURNING" in sql.upper() else None
+        return self
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, database: FakeDatabase):
+        self.database = database
+
+    def cursor(self, row_factory=None):
+        return FakeCursor(self.database)
+
+    def execute(self, sql, params=None):
+        return FakeCursor(self.database).execute(sql, params)
+
+    def transaction(self):
+        return nullcontext()
+
+
+class FakePool:
+    database = FakeDatabase()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def wait(self, timeout=None):
+        pass
+
+    @contextmanager
+    def connection(self):
+        yield FakeConnection(FakePool.database)
+
+    def get_stats(self):
+        return {"pool_size": 1, "pool_available": 1, "requests_waiting": 0}
+
+    check_connection = staticmethod(lambda connection: None)
+
+
+psycopg_pool.ConnectionPool = FakePool
+
+
+@pytest.fixture
+def db():
+    """A fresh scripted database, with the process-wide cache emptied."""
+    from src.services.cache import cache
+
+    FakePool.database = FakeDatabase()
+    cache.clear()
+    yield FakePool.database
+    cache.clear()
@@ -0,0 +1,139 @@
+"""
+In-process stand-in for a Redis server, speaking just enough RESP2 for
+RedisCache: GET, MGET, SET (with PX), INCR, DEL, SADD, SMEMBERS, PEXPIRE,
+SCAN, AUTH, SELECT and PING. Expiry is checked lazily on access, like Redis does.
+"""
+import fnmatch
+import socketserver
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values: Dict[bytes, object] = {}
+        self.deadlines: Dict[bytes, float] = {}
+
+    def live(self, key: bytes) -> Optional[object]:
+        deadline = self.deadlines.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.values.pop(key, None)
+            self.deadlines.pop(key, None)
+        return self.values.get(key)
+
+    def delete(self, key: bytes) -> int:
+        self.deadlines.pop(key, None)
+        return 0 if self.values.pop(key, None) is None else 1
+
+
+def _encode(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-ERR " + str(reply).encode() + b"\r\n"
+    if isinstance(reply, bool) or isinstance(reply, int):
+        return b":%d\r\n" % int(reply)
+    if isinstance(reply, str):
+        return b"+" + reply.encode() + b"\r\n"
+    if isinstance(reply, bytes):
+        return b"$%d\r\n" % len(reply) + reply + b"\r\n"
+    return b"*%d\r\n" % len(reply) + b"".join(_encode(item) for item in reply)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            with self.server.store.lock:
+                reply = self._run(args[0].upper().decode(), args[1:])
+            self.wfile.write(_encode(reply))
+
+    def _run(self, command: str, args):
+        store: _Store = self.server.store
+        if command in ("AUTH", "SELECT"):
+            return "OK"
+        if command == "PING":
+            return "PONG"
+        if command == "GET":
+            value = store.live(args[0])
+            return value if value is None or isinstance(value, bytes) else ValueError("WRONGTYPE")
+        if command == "MGET":
+            return [value if isinstance(value, bytes) else None for value in map(store.live, args)]
+        if command == "INCR":
+            value = int(store.live(args[0]) or 0) + 1
+            store.values[args[0]] = str(value).encode()
+            return value
+        if command == "SET":
+            store.delete(args[0])
+            store.values[args[0]] = args[1]
+            if len(args) >= 4 and args[2].upper() == b"PX":
+                store.deadlines[args[0]] = time.monotonic() + int(args[3]) / 1000
+            return "OK"
+        if command == "DEL":
+            return sum(store.delete(key) for key in args)
+        if command == "SADD":
+            members = store.live(args[0])
+            if members is None:
+                members = store.values[args[0]] = set()
+            added = len(set(args[1:]) - members)
+            members.update(args[1:])
+            return added
+        if command == "SMEMBERS":
+            return sorted(store.live(args[0]) or ())
+        if command == "PEXPIRE":
+            if store.live(args[0]) is None:
+                return 0
+            store.deadlines[args[0]] = time.monotonic() + int(args[1]) / 1000
+            return 1
+        if command == "SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            keys = [key for key in list(store.values) if store.live(key) is not None
+                    and fnmatch.fnmatchcase(key.decode(), pattern)]
+            return [b"0", keys]
+        return ValueError(f"unknown command '{command}'")
+
+
+class RespServer:
+    """Serve on a free localhost port until ``stop``; usable as a context manager."""
+
+    def __init__(self):
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.store = _Store()
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"redis://{host}:{port}/0"
+
+    def raw_set(self, key: bytes, value: bytes):
+        with self._server.store.lock:
+            self._server.store.values[key] = value
+
+    def start(self) -> "RespServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
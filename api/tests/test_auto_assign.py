@@ -0,0 +1,30 @@
+import pytest
+
+from src.services.auto_assign import propose_assignment
+
+FREQUENCIES = ["Daily", "Weekly", "Every 3 Days", "Monthly", "Every Other Week", "As Needed", "Yearly"]
+CHORES = [(i + 1, f"Chore {i + 1}", FREQUENCIES[i % len(FREQUENCIES)]) for i in range(100)]
+MEMBERS = [(j + 1, 100 + j, f"Member {j + 1}") for j in range(20)]
+
+
+def test_mixed_frequencies_are_balanced_within_one_weekly_occurrence():
+    proposal = propose_assignment(CHORES, MEMBERS)
+
+    assert proposal["target_load"] == pytest.approx(8.333, abs=1e-3)
+    # The greedy rounds alone left members 4.44 apart here
+    assert proposal["imbalance"] < 0.5
+    assert not proposal["unassigned"]
+
+
+def test_refinement_never_uses_blacked_out_pairs():
+    preferences = [(j % 20 + 1, chore_id) for j, chore_id in enumerate(range(1, 101, 3))]
+    blackouts = [((chore_id * 7) % 20 + 1, chore_id) for chore_id in range(1, 101, 2)]
+
+    proposal = propose_assignment(CHORES, MEMBERS, preferences, blackouts)
+
+    assigned = {(item["membership_id"], item["chore_id"]) for item in proposal["assignments"]}
+    assert not assigned & set(blackouts)
+    assert len(assigned) == len(CHORES)
+    assert proposal["imbalance"] < 2
+    loads = {member["membership_id"]: member["weekly_load"] for member in proposal["members"]}
+    assert sum(loads.values()) == pytest.approx(20 * proposal["target_load"], abs=0.05)
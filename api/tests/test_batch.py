@@ -0,0 +1,23 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.router import admin_router, batch_router
+from src.utils import permissions
+
+
+def test_batched_get_matches_the_direct_get(monkeypatch):
+    monkeypatch.setattr(permissions, "ADMIN_TOKEN", "secret")
+    api = APIRouter(prefix="/api")
+    api.include_router(admin_router.router)
+    api.include_router(batch_router.router)
+    app = FastAPI()
+    app.include_router(api)
+    client = TestClient(app)
+
+    for headers in ({"X-Admin-Token": "secret"}, {"X-Admin-Token": "wrong"}):
+        direct = client.get("/api/admin/query-stats", headers=headers)
+        batched = client.post("/api/batch", headers=headers,
+                              json={"requests": [{"path": "/api/admin/query-stats"}]})
+        [item] = batched.json()
+        assert (item["status"], item["body"]) == (direct.status_code, direct.json())
+    assert direct.status_code == 403
@@ -0,0 +1,126 @@
+import pickle
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.models.chore import ChoreWithAssignments
+from src.services import cache as cache_module
+from src.services.cache import MISS, MemoryCache, cached, create_cache, room_tag, user_tag
+from tests.resp_server import RespServer
+
+
+@pytest.fixture
+def resp_server():
+    with RespServer() as server:
+        yield server
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryCache()
+    return create_cache(request.getfixturevalue("resp_server").url)
+
+
+def test_get_returns_what_set_stored(backend):
+    chore = ChoreWithAssignments(
+        chore_id=1, room_id=2, name="Dishes", frequency="Daily", is_active=True,
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc), updated_at=datetime(2026, 1, 2, tzinfo=timezone.utc),
+    )
+    value = {
+        "chores": [chore],
+        "row": (1, "admin"),
+        "total": Decimal("12.50"),
+        "from": date(2026, 3, 1),
+        "at": datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc),
+    }
+    backend.set("room-summary", value, ttl=60)
+
+    assert backend.get("room-summary") == value
+    assert backend.get("missing") is MISS
+
+
+def test_entries_expire_after_ttl(backend):
+    backend.set("short", [1, 2, 3], ttl=0.05)
+    assert backend.get("short") == [1, 2, 3]
+    time.sleep(0.1)
+    assert backend.get("short") is MISS
+
+
+def test_delete_tags_evicts_only_tagged_entries(backend):
+    backend.set("room-1-chores", ["a"], ttl=60, tags=["room:1"])
+    backend.set("room-1-member", {"role": "admin"}, ttl=60, tags=["room:1", "user:7"])
+    backend.set("room-2-chores", ["b"], ttl=60, tags=["room:2"])
+
+    backend.delete_tags("room:1")
+
+    assert backend.get("room-1-chores") is MISS
+    assert backend.get("room-1-member") is MISS
+    assert backend.get("room-2-chores") == ["b"]
+
+
+def test_redis_backend_ignores_pickled_entries(resp_server):
+    cache = create_cache(resp_server.url)
+    resp_server.raw_set(b"dormduty:planted", pickle.dumps({"not": "json"}))
+
+    assert cache.get("planted") is MISS
+
+
+def test_redis_outage_degrades_to_miss():
+    server = RespServer().start()
+    host, port = server.address
+    server.stop()
+    cache = create_cache(f"redis://{host}:{port}/0")
+
+    cache.set("key", "value", ttl=60)
+    assert cache.get("key") is MISS
+
+
+class _Lookups:
+    """Stands in for a repository whose row changes while a read is in flight."""
+
+    def __init__(self):
+        self.role = "admin"
+        self.reads = 0
+        self.during_read = None
+
+    @cached(tags=lambda user_id, room_id: [room_tag(room_id), user_tag(user_id)])
+    def get_user_role(self, user_id: int, room_id: int):
+        self.reads += 1
+        role = self.role
+        if self.during_read:
+            self.during_read()
+        return role
+
+
+@pytest.fixture
+def shared(backend, monkeypatch):
+    monkeypatch.setattr(cache_module, "cache", backend)
+    return backend
+
+
+def test_cached_reads_are_served_until_invalidated(shared):
+    lookups = _Lookups()
+    assert lookups.get_user_role(7, 5) == "admin"
+    assert lookups.get_user_role(7, 5) == "admin"
+    assert lookups.reads == 1
+
+    lookups.role = "member"
+    shared.delete_tags(user_tag(7))
+    assert lookups.get_user_role(7, 5) == "member"
+
+
+def test_value_read_before_an_invalidation_is_not_served_after_it(shared):
+    lookups = _Lookups()
+
+    def demote():
+        # The demotion commits after the read saw "admin" but before it is stored
+        lookups.role = "member"
+        shared.delete_tags(user_tag(7))
+        lookups.during_read = None
+
+    lookups.during_read = demote
+    assert lookups.get_user_role(7, 5) == "admin"
+    assert lookups.get_user_role(7, 5) == "member"
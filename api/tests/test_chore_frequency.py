@@ -0,0 +1,21 @@
+import pytest
+
+from src.utils.chore_frequency import (UNSCHEDULED_OCCURRENCES_PER_WEEK, UNSCHEDULED_WEIGHT, effort_weight,
+                                       occurrences_per_week, period_days)
+
+
+@pytest.mark.parametrize("frequency, days", [
+    ("Daily", 1.0),
+    ("Every 3 Days", 3.0),
+    ("every 2 weeks", 14.0),
+    ("Every 1 Month", 30.44),
+])
+def test_period_days_reads_labels(frequency, days):
+    assert period_days(frequency) == days
+
+
+@pytest.mark.parametrize("frequency", ["Every 0 Days", "every 00 weeks", "every -1 days", "As Needed", "Fortnightly"])
+def test_zero_and_unknown_periods_count_as_unscheduled(frequency):
+    assert period_days(frequency) is None
+    assert effort_weight(frequency) == UNSCHEDULED_WEIGHT
+    assert occurrences_per_week(frequency) == UNSCHEDULED_OCCURRENCES_PER_WEEK
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.router.chores_router import router
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(router)
+    # membership 1 is the admin of room 5, membership 2 a plain member
+    db.on("FROM room_membership", lambda params: {
+        1: [(1, 10, 5, "admin")],
+        2: [(2, 11, 5, "member")],
+    }.get(params[0], []))
+    return TestClient(app)
+
+
+def _bulk(client, membership_id, count, room_id=5):
+    return client.post(
+        f"/chores/room/{room_id}/verifications/bulk",
+        params={"verified_by_membership_id": membership_id},
+        json={"verifications": [{"completion_id": i, "verification_type": "approved"} for i in range(count)]},
+    )
+
+
+def test_bulk_verification_rejects_non_admins_with_403(client):
+    assert _bulk(client, 2, 1).status_code == 403
+    assert _bulk(client, 1, 1, room_id=6).status_code == 403
+
+
+def test_bulk_verification_rejects_bad_sizes_with_400(client):
+    assert _bulk(client, 1, 0).status_code == 400
+    assert _bulk(client, 1, 201).status_code == 400
+
+
+def test_room_history_pages_cover_every_completion(client, db):
+    completed = [datetime(2026, 3, 1, 9), datetime(2026, 3, 1, 9), datetime(2026, 3, 2, 18), datetime(2026, 3, 4, 7)]
+    rows = sorted(
+        ((completion_id, 3, 1, completed_at, None, "approved", completed_at, "Dishes", 5, "Ana")
+         for completion_id, completed_at in enumerate(completed * 3, start=1)),
+        key=lambda row: (row[3], row[0]), reverse=True,
+    )
+
+    def history(params):
+        after, limit = (tuple(params[1:3]), params[3]) if len(params) == 4 else (None, params[1])
+        return [row for row in rows if after is None or (row[3], row[0]) < after][:limit]
+
+    db.on("WHERE c.room_id = %s", history)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/chores/room/5/completions/history", params=params).json()
+        seen += [item["completionId"] for item in page["items"]]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert seen == [row[0] for row in rows]
+
+
+def test_apply_auto_assignment_rejects_non_admins_and_empty_plans(client):
+    def apply(membership_id, assignments):
+        return client.post("/chores/room/5/auto-assign/apply", params={"assigned_by_membership_id": membership_id},
+                           json={"assignments": assignments})
+
+    assert apply(2, [{"membership_id": 2, "chore_id": 3}]).status_code == 403
+    assert apply(1, []).status_code == 400
+
+
+def test_bulk_verification_rejects_repeated_completions_with_400(client):
+    response = client.post(
+        "/chores/room/5/verifications/bulk", params={"verified_by_membership_id": 1},
+        json={"verifications": [{"completion_id": 7, "verification_type": "approved"},
+                                {"completion_id": 7, "verification_type": "rejected"}]},
+    )
+    assert response.status_code == 400
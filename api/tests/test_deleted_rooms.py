@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.repository.chores_repository import ChoreRepository
+
+CREATED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+# Room 5 has been soft-deleted and waits for room.purge
+CHORE = dict(chore_id=3, room_id=5, name="Dishes", frequency="Daily", frequency_value=None, day_of_week=None,
+             timing=None, description=None, start_date=None, last_completed=None, assigned_to=None,
+             approval_required=False, photo_required=False, is_active=True, created_at=CREATED_AT,
+             updated_at=CREATED_AT, assigned_member_ids=None, assigned_member_names=None)
+
+
+@pytest.fixture
+def deleted_room(db):
+    # Statements that filter on the room's deleted_at see nothing; anything else sees the chore
+    db.on("r.deleted_at IS NULL", [])
+    db.on("FROM chore", lambda params: [tuple(CHORE.values())])
+    return db
+
+
+@pytest.mark.parametrize("read", [
+    lambda repo: repo.get_all_chores(),
+    lambda repo: repo.get_chore_by_id(3),
+    lambda repo: repo.get_chores_by_user_id(10),
+    lambda repo: repo.get_chores_assigned_to_user(10),
+])
+def test_chores_of_deleted_rooms_are_hidden(deleted_room, read):
+    assert not read(ChoreRepository())
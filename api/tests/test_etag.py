@@ -0,0 +1,29 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.router.chores_router import router
+from src.services.compression import CompressedBodyCache, CompressionMiddleware
+
+
+def test_room_lists_carry_etags_that_reuse_compressed_bodies(db):
+    db.on("FROM chore c", [(chore_id, 5, f"Chore {chore_id}", "Weekly") for chore_id in range(200)])
+    bodies = CompressedBodyCache()
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(CompressionMiddleware, minimum_size=100, cache=bodies)
+    client = TestClient(app)
+
+    first = client.get("/chores/by-room/5", headers={"accept-encoding": "gzip"})
+    second = client.get("/chores/by-room/5", headers={"accept-encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"].startswith('W/"')
+    assert second.headers["etag"] == first.headers["etag"]
+    assert (bodies.misses, bodies.hits) == (1, 1)
+
+    identity = client.get("/chores/by-room/5", headers={"accept-encoding": "identity"})
+    assert identity.headers["etag"] == first.headers["etag"].removeprefix("W/")
+
+    revalidated = client.get("/chores/by-room/5", headers={"if-none-match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
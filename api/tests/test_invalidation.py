@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from src.services.cache import MISS, cache, room_tag
+from src.services.invalidation import MAX_PAYLOAD_BYTES, InvalidationListener, invalidate
+
+
+@pytest.mark.parametrize("payload", [
+    "not json", "[1, 2]", "42", "null", '{"room_id": 5}', '{"entity": "chore", "room_id": "5"}',
+    '{"entity": "chore", "ids": "1,2"}', '{"entity": "chore", "ids": [{"id": 1}]}',
+])
+def test_malformed_messages_are_ignored(db, payload):
+    cache.set("kept", 1, ttl=60, tags=[room_tag(5)])
+
+    InvalidationListener()._handle(payload)
+
+    assert cache.get("kept") == 1
+
+
+def test_messages_evict_their_tags(db):
+    cache.set("room-5", 1, ttl=60, tags=[room_tag(5)])
+
+    InvalidationListener()._handle(json.dumps({"origin": "other", "entity": "chore", "room_id": 5, "ids": [1]}))
+
+    assert cache.get("room-5") is MISS
+
+
+def _notified(db):
+    [(_, (channel, payload))] = [(sql, params) for sql, params in db.executed if "pg_notify" in sql]
+    return json.loads(payload), payload
+
+
+def test_large_invalidations_fall_back_to_a_room_message(db):
+    invalidate("chore_completion", room_id=5, ids=range(100_000, 103_000))
+
+    message, payload = _notified(db)
+    assert len(payload.encode()) <= MAX_PAYLOAD_BYTES
+    assert message["room_id"] == 5 and message["ids"] == [] and not message["flush"]
+
+
+def test_large_invalidations_without_a_room_flush_other_workers(db):
+    invalidate("user", ids=range(100_000, 103_000))
+
+    message, _ = _notified(db)
+    assert message["flush"]
+    cache.set("anything", 1, ttl=60)
+    InvalidationListener()._handle(json.dumps({**message, "origin": "other"}))
+    assert cache.get("anything") is MISS
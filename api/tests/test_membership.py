@@ -0,0 +1,30 @@
+from src.models.membership import MembershipCreateRequest, Role
+from src.repository.membership_repository import MembershipRepository
+
+
+def _statements(db, fragment):
+    return [index for index, (sql, _) in enumerate(db.executed) if fragment in sql]
+
+
+def test_join_by_code_share_locks_room_before_inserting(db):
+    db.on("WHERE room_code", [(5,)])
+    db.on("INSERT INTO room_membership", [(41,)])
+
+    result = MembershipRepository().join_room_by_code(user_id=7, room_code="ABC123")
+
+    assert result["membership_id"] == 41
+    [lock] = _statements(db, "FOR SHARE")
+    [insert] = _statements(db, "INSERT INTO room_membership")
+    assert lock < insert
+
+
+def test_create_membership_share_locks_room_and_skips_deleted_rooms(db):
+    request = MembershipCreateRequest(user_id=7, room_id=5, role=Role.MEMBER)
+
+    assert MembershipRepository().create_membership(request) is None
+    assert _statements(db, "FOR SHARE")
+    assert not _statements(db, "INSERT INTO room_membership")
+
+    db.on("FROM room WHERE", [(5,)])
+    db.on("INSERT INTO room_membership", [(41,)])
+    assert MembershipRepository().create_membership(request)["membership_id"] == 41
@@ -0,0 +1,23 @@
+import pytest
+
+from src.utils import permissions
+
+
+@pytest.mark.parametrize("bypass, token, expected", [
+    (False, None, False),
+    (False, "anything", False),
+    (True, None, True),
+])
+def test_without_admin_token_only_explicit_dev_is_open(monkeypatch, bypass, token, expected):
+    monkeypatch.setattr(permissions, "ADMIN_TOKEN", None)
+    monkeypatch.setattr(permissions, "ADMIN_DEV_BYPASS", bypass)
+    assert permissions.is_admin_token(token) is expected
+
+
+@pytest.mark.parametrize("bypass", [False, True])
+def test_configured_admin_token_must_match(monkeypatch, bypass):
+    monkeypatch.setattr(permissions, "ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(permissions, "ADMIN_DEV_BYPASS", bypass)
+    assert permissions.is_admin_token("s3cret")
+    assert not permissions.is_admin_token("wrong")
+    assert not permissions.is_admin_token(None)
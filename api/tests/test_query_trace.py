@@ -0,0 +1,53 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.repository.chores_repository import ChoreRepository
+from src.repository.expense_repository import ExpenseRepository
+from src.services.database.helper import run_sql
+from src.services.query_trace import NPlusOneError, trace_queries
+
+CREATED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_detector_flags_repeated_statements(db):
+    with trace_queries("GET /loop") as trace:
+        for chore_id in range(10):
+            run_sql("SELECT name FROM chore WHERE chore_id = %s", (chore_id,))
+
+    with pytest.raises(NPlusOneError, match="GET /loop.*10x by test_detector_flags_repeated_statements"):
+        trace.assert_no_n_plus_one()
+
+
+def test_expenses_by_room_loads_splits_in_one_statement(db):
+    expense_ids = list(range(1, 21))
+    db.on("FROM expense e", [
+        (expense_id, 5, 1, "Ana", Decimal("30.00"), f"Expense {expense_id}", "Groceries",
+         date(2026, 1, 1), None, CREATED_AT)
+        for expense_id in expense_ids
+    ])
+    db.on("FROM expense_split es", lambda params: [
+        (expense_id * 10 + member, expense_id, member, Decimal("10.00"), False, None, f"Member {member}")
+        for expense_id in params[0] for member in (1, 2, 3)
+    ])
+
+    with trace_queries("GET /api/expenses/room/{room_id}") as trace:
+        expenses = ExpenseRepository().get_expenses_by_room(5)
+
+    trace.assert_no_n_plus_one()
+    assert len(trace.queries) == 2
+    assert [expense["expense_id"] for expense in expenses] == expense_ids
+    assert all(len(expense["splits"]) == 3 for expense in expenses)
+    assert {split["expense_id"] for split in expenses[4]["splits"]} == {5}
+
+
+def test_assign_multiple_members_writes_in_one_statement(db):
+    db.on("SELECT room_id FROM chore", [(5,)])
+
+    with trace_queries("POST /api/chores/{chore_id}/assign") as trace:
+        ChoreRepository().assign_multiple_members(3, list(range(1, 21)))
+
+    trace.assert_no_n_plus_one()
+    assignment_writes = [sql for sql, _ in db.executed if "chore_assignment" in sql]
+    assert len(assignment_writes) == 1
@@ -8,6 +8,10 @@ const axiosClient = axios.create();
 axiosClient.defaults.baseURL = getApiUrl();
 
 axiosClient.interceptors.response.use((originalResponse) => {
+  // Routes served with CamelJSONResponse already emit camelCase keys
+  if (originalResponse.headers["x-key-case"] === "camel") {
+    return originalResponse;
+  }
   originalResponse.data = snakeToCamel(originalResponse.data);
   return originalResponse;
 });